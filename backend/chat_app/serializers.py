@@ -1,22 +1,24 @@
 from rest_framework import serializers
 from .models import ChatRoom, Message
-from users.serializers import LightUserSerializer # This import should now work correctly
+from users.cards import UserCardField
 from django.contrib.auth import get_user_model # Import get_user_model
 from django.db.models import Count # Import Count for annotation
+from minara_backend.fieldsets import SparseFieldsetsMixin
+from minara_backend.fields import BulkPrimaryKeyRelatedField
 
 User = get_user_model() # Use get_user_model() to get the actual User model class
 
-class MessageSerializer(serializers.ModelSerializer):
-    sender = LightUserSerializer(read_only=True)
+class MessageSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    sender = UserCardField()
 
     class Meta:
         model = Message
         fields = ["id", "room", "sender", "content", "timestamp"]
         read_only_fields = ["id", "sender", "timestamp", "room"]
 
-class ChatRoomSerializer(serializers.ModelSerializer):
-    participants = LightUserSerializer(many=True, read_only=True)
-    participant_ids = serializers.PrimaryKeyRelatedField(
+class ChatRoomSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    participants = UserCardField(many=True)
+    participant_ids = BulkPrimaryKeyRelatedField(
         many=True, queryset=User.objects.all(), source="participants", write_only=True # Now User.objects.all() will work
     )
 
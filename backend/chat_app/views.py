@@ -5,12 +5,13 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count
 from .models import ChatRoom, Message
 from .serializers import ChatRoomSerializer, MessageSerializer
+from minara_backend.prefetch import PrefetchPlannerMixin, plan_queryset
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-class ChatRoomViewSet(viewsets.ModelViewSet):
+class ChatRoomViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     serializer_class = ChatRoomSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -26,13 +27,14 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
         if not room.participants.filter(pk=request.user.pk).exists():
             return Response({"detail": "Not authorized to access this chat room."}, status=status.HTTP_403_FORBIDDEN)
         
-        messages = room.messages.all().order_by("timestamp")
+        serializer_context = self.get_serializer_context()
+        messages = plan_queryset(room.messages.all().order_by("timestamp"), MessageSerializer(context=serializer_context))
         page = self.paginate_queryset(messages)
         if page is not None:
-            serializer = MessageSerializer(page, many=True)
+            serializer = MessageSerializer(page, many=True, context=serializer_context)
             return self.get_paginated_response(serializer.data)
 
-        serializer = MessageSerializer(messages, many=True)
+        serializer = MessageSerializer(messages, many=True, context=serializer_context)
         return Response(serializer.data)
 
 class GetOrCreateDirectChatView(generics.GenericAPIView):
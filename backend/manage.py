@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'minara_backend.settings')
+    # The test suite gets its own settings (an in-memory cache); --settings still overrides
+    default_settings = 'minara_backend.test_settings' if sys.argv[1:2] == ['test'] else 'minara_backend.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,54 @@
+"""
+Related fields that validate a whole list of primary keys with one query.
+
+DRF's PrimaryKeyRelatedField(many=True) runs queryset.get(pk=...) once per
+submitted id. BulkPrimaryKeyRelatedField is a drop-in replacement: with
+many=True the list is resolved with a single in_bulk() query and every
+missing or malformed id is reported in the same error.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+class BulkManyRelatedField(ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_model_field = queryset.model._meta.pk
+        pks, errors = [], []
+        for item in data:
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                if child.pk_field is not None:
+                    item = child.pk_field.to_internal_value(item)
+                pks.append(pk_model_field.to_python(item))
+            except (TypeError, ValueError, DjangoValidationError, serializers.ValidationError):
+                errors.append(child.error_messages["incorrect_type"].format(data_type=type(item).__name__))
+        if errors:
+            raise serializers.ValidationError(errors, code="incorrect_type")
+
+        objects = queryset.in_bulk(set(pks))
+        missing = [pk for pk in dict.fromkeys(pks) if pk not in objects]
+        if missing:
+            raise serializers.ValidationError(
+                [child.error_messages["does_not_exist"].format(pk_value=pk) for pk in missing],
+                code="does_not_exist",
+            )
+        return [objects[pk] for pk in pks]
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField whose many=True form validates all ids with one in_bulk() query."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
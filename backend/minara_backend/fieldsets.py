@@ -0,0 +1,98 @@
+"""
+Sparse fieldsets and opt-in expansion for API serializers.
+
+On safe requests, ``?fields=`` limits a response to the named fields and
+``?expand=`` opts nested relations back in:
+
+* ``?fields=id,title,company_name`` renders only those fields;
+* a relation named in ``fields`` without being expanded renders as its
+  primary key(s), e.g. ``?fields=id,posted_by_business`` gives the business id;
+* ``?expand=posted_by_business`` renders it as the full nested object;
+* dotted names pick fields inside a relation, e.g.
+  ``?fields=id,posted_by_business.company_name``.
+
+Without ``fields`` the response is unchanged. Pruning happens in get_fields(),
+before PrefetchPlannerMixin plans the queryset, so relations that are not
+rendered are not joined or prefetched either.
+"""
+from rest_framework import permissions, serializers
+
+EXPAND_ALL = None # Marker for "render this relation in full"
+
+def parse_field_paths(value):
+    """Turn "a,b.c,b.d" into {"a": EXPAND_ALL, "b": {"c": EXPAND_ALL, "d": EXPAND_ALL}}."""
+    tree = {}
+    for path in (value or "").split(","):
+        parts = [part for part in path.strip().split(".") if part]
+        node = tree
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                if part not in node:
+                    node[part] = EXPAND_ALL
+            else:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = {}
+                node = child
+    return tree
+
+def _nested_child(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+def _primary_key_field(field):
+    many = isinstance(field, serializers.ListSerializer)
+    return serializers.PrimaryKeyRelatedField(read_only=True, many=many, source=field.source)
+
+class SparseFieldsetsMixin:
+    """Serializer mixin implementing ?fields= and ?expand= (see module docstring)."""
+
+    def _is_request_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def _sparse_spec(self):
+        # (fields tree or None, expand tree); nested serializers receive theirs from the parent
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields, self._sparse_expand
+        request = self.context.get("request")
+        if request is None or request.method not in permissions.SAFE_METHODS or not self._is_request_root():
+            return None, {}
+        params = getattr(request, "query_params", request.GET)
+        if "fields" not in params:
+            return None, {}
+        return parse_field_paths(params.get("fields")), parse_field_paths(params.get("expand"))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        wanted, expand = self._sparse_spec()
+        if wanted is None:
+            return fields
+        for name in list(fields):
+            field = fields[name]
+            if field.write_only:
+                continue
+            if name not in wanted and name not in expand:
+                del fields[name]
+                continue
+            child = _nested_child(field)
+            if child is None:
+                continue
+            if name in expand:
+                # Expanded relations render in full unless dotted fields narrow them down
+                child_fields = wanted.get(name) if isinstance(wanted.get(name), dict) else None
+                child_expand = expand[name] if isinstance(expand[name], dict) else {}
+            elif isinstance(wanted[name], dict):
+                child_fields, child_expand = wanted[name], {}
+            else:
+                fields[name] = _primary_key_field(field)
+                continue
+            if isinstance(child, SparseFieldsetsMixin):
+                child._sparse_fields = child_fields
+                child._sparse_expand = child_expand
+        return fields
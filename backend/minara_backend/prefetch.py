@@ -0,0 +1,104 @@
+"""
+Automatic select_related/prefetch_related planning from a serializer's fields.
+
+plan_queryset() walks the (possibly nested) fields a serializer will read and
+joins or prefetches every relation they touch, so a list page costs a fixed
+number of queries instead of one or more per row:
+
+* nested serializers and dotted sources over forward FK / one-to-one
+  relations become select_related paths;
+* many=True nested serializers and many related fields over M2M or reverse
+  FK relations become prefetch_related lookups, with their own planned
+  querysets;
+* PrimaryKeyRelatedFields without many=True read the FK column directly and
+  need nothing.
+
+SerializerMethodFields cannot be inspected; serializers can list the
+relations they use in Meta.select_related / Meta.prefetch_related.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+def _serializer_fields(serializer):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    return serializer, serializer.fields
+
+def _nested_child(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+def collect_relations(model, serializer, prefix=""):
+    """Return (select_related paths, prefetch_related lookups) needed to render serializer over model."""
+    serializer, fields = _serializer_fields(serializer)
+    select, prefetch = set(), []
+    meta = getattr(serializer, "Meta", None)
+    select.update(prefix + path for path in getattr(meta, "select_related", []))
+    prefetch.extend(prefix + lookup for lookup in getattr(meta, "prefetch_related", []))
+
+    for field in fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        # A plain PrimaryKeyRelatedField renders the FK column without loading the object
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and len(field.source_attrs) == 1:
+            continue
+
+        current_model, path = model, []
+        source_attrs = field.source_attrs
+        for index, attr in enumerate(source_attrs):
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation or model_field.related_model is None:
+                break
+            path.append(attr)
+            lookup = prefix + "__".join(path)
+            is_last = index == len(source_attrs) - 1
+            if model_field.many_to_one or model_field.one_to_one:
+                select.add(lookup)
+                current_model = model_field.related_model
+                child = _nested_child(field) if is_last else None
+                if child is not None:
+                    child_select, child_prefetch = collect_relations(current_model, child, lookup + "__")
+                    select.update(child_select)
+                    prefetch.extend(child_prefetch)
+                continue
+            # Many-valued relation: prefetch it with a queryset planned for the nested serializer
+            child = _nested_child(field) if is_last else None
+            related_queryset = model_field.related_model._default_manager.all()
+            if child is not None:
+                related_queryset = plan_queryset(related_queryset, child)
+            prefetch.append(Prefetch(lookup, queryset=related_queryset))
+            break
+    return select, prefetch
+
+def plan_queryset(queryset, serializer):
+    """Apply the select_related/prefetch_related calls serializer needs to render queryset."""
+    select, prefetch = collect_relations(queryset.model, serializer)
+    # Paths already covered by a longer path would be redundant
+    select = {path for path in select if not any(other.startswith(path + "__") for other in select)}
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    lookups = {}
+    for lookup in prefetch:
+        name = lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        lookups.setdefault(name, lookup)
+    if lookups:
+        queryset = queryset.prefetch_related(*lookups.values())
+    return queryset
+
+class PrefetchPlannerMixin:
+    """
+    ViewSet mixin that plans the queryset for the view's serializer.
+
+    Applied in filter_queryset so it covers list, retrieve and every action
+    that goes through get_object(), whatever get_queryset() does.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return plan_queryset(queryset, self.get_serializer())
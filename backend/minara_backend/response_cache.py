@@ -0,0 +1,144 @@
+"""
+Versioned cache of GET responses for read-mostly viewsets.
+
+ResponseCacheMixin caches the data of successful list/retrieve responses
+under a key built from the host, the full path with its query string, the
+authentication scope (anonymous, or the authenticator class and user id) and
+the current versions of every model the response depends on. Each model has
+a version counter in the cache; save/delete receivers bump it, which moves
+every dependent response to new keys without scanning or deleting old ones
+(those expire after TIMEOUT).
+
+Versions are bumped immediately and again when the transaction commits: a
+response another request computes in between, from data it cannot see yet,
+is left behind under the old version. On a miss, one request per key
+recomputes while the others wait for its result (single flight), instead of
+all rendering the same page at once. Waiting sleeps the request's worker
+thread, so WAIT_TIMEOUT is kept short: past it, a waiter renders the page
+itself rather than tie up the worker behind a slow recompute.
+
+CACHE_ALIAS picks the backend from CACHES: local memory works for a single
+process; use a file-based or Redis cache to share responses and versions
+between processes.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 300, # Seconds; also bounds staleness for changes made without signals
+    "LOCK_TIMEOUT": 10, # Seconds a recompute may hold its key's single-flight lock
+    "WAIT_TIMEOUT": 1, # Seconds a request's thread sleeps waiting for another's recompute before rendering anyway
+    "POLL_INTERVAL": 0.05,
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "RESPONSE_CACHE", {}))
+    return config
+
+def get_cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+def _version_key(model):
+    return f"response-cache:version:{model._meta.label_lower}"
+
+def _bump(models):
+    cache = get_cache()
+    for model in models:
+        try:
+            cache.incr(_version_key(model))
+        except ValueError:
+            # Missing or evicted: start from the clock so no earlier version comes back
+            cache.add(_version_key(model), time.time_ns(), None)
+
+def bump_versions(*models):
+    """Invalidate cached responses that depend on any of models."""
+    _bump(models)
+    transaction.on_commit(lambda: _bump(models))
+
+def get_versions(models):
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+def auth_scope(request):
+    if not request.user or not request.user.is_authenticated:
+        return "anonymous"
+    return f"{type(request.successful_authenticator).__name__}:{request.user.pk}"
+
+def cache_key(request, models):
+    request_hash = hashlib.sha256(
+        "\n".join([request.get_host(), request.get_full_path(), auth_scope(request)]).encode()
+    ).hexdigest()[:32]
+    versions = ".".join(str(version) for version in get_versions(models))
+    return f"response-cache:{request_hash}:{versions}"
+
+def get_or_compute(key, compute):
+    """Return the cached value for key, or compute() it with at most one computation per key at a time."""
+    config = get_config()
+    cache = get_cache()
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = f"{key}:lock"
+    holds_lock = cache.add(lock_key, 1, config["LOCK_TIMEOUT"])
+    if not holds_lock:
+        deadline = time.monotonic() + config["WAIT_TIMEOUT"]
+        while time.monotonic() < deadline:
+            time.sleep(config["POLL_INTERVAL"])
+            value = cache.get(key)
+            if value is not None:
+                return value
+            if cache.get(lock_key) is None:
+                break # The other request finished without a cacheable result
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, config["TIMEOUT"])
+        return value
+    finally:
+        if holds_lock:
+            cache.delete(lock_key)
+
+class ResponseCacheMixin:
+    """
+    ViewSet mixin caching list and retrieve responses (see module docstring).
+
+    response_cache_models lists the models, besides the queryset's, whose changes
+    alter the response (nested serializers, counts); each needs a receiver calling
+    bump_versions() on save and delete.
+    """
+    response_cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        if not get_config()["ENABLED"] or request.method != "GET":
+            return handler(request, *args, **kwargs)
+        key = cache_key(request, [self.queryset.model, *self.response_cache_models])
+        rendered = []
+
+        def compute():
+            response = handler(request, *args, **kwargs)
+            rendered.append(response)
+            return response.data if response.status_code == 200 else None
+
+        data = get_or_compute(key, compute)
+        return rendered[0] if rendered else Response(data)
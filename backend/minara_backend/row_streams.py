@@ -0,0 +1,133 @@
+"""
+Incremental reading of uploaded NDJSON and CSV files, one row at a time.
+
+Shared by the bulk upload paths (professional_app/bulk_import.py,
+users/provisioning.py) so that an upload of any size is parsed as a stream
+and handed over in chunks, along with how their views and commands pick the
+stream and format and how results are reported.
+"""
+import csv
+import json
+
+from rest_framework.exceptions import ParseError
+
+FORMATS = ("ndjson", "csv")
+
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+}
+
+def detect_format(content_type=None, filename=None):
+    """Guess the input format from a content type or file extension; None if unknown."""
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in CONTENT_TYPES:
+        return CONTENT_TYPES[content_type]
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    return None
+
+def request_stream(request, what):
+    """
+    Return (stream, format) for an upload view: the raw body (Content-Type
+    application/x-ndjson or text/csv) or a multipart upload in "file", read as a
+    stream. ?input_format= overrides detection. Raises ParseError (400) otherwise.
+    """
+    input_format = request.query_params.get("input_format")
+    if request.content_type.startswith("multipart/form-data"):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ParseError(f"Upload the {what} file in the \"file\" field.")
+        stream = upload
+        input_format = input_format or detect_format(upload.content_type, upload.name)
+    else:
+        stream = request.stream or []
+        input_format = input_format or detect_format(request.content_type)
+    if input_format not in FORMATS:
+        raise ParseError("Send NDJSON or CSV, or pass input_format=ndjson|csv.")
+    return stream, input_format
+
+class ImportResult:
+    """Counts, created ids and per-line errors of one upload; errors past max_errors are only counted."""
+
+    def __init__(self, max_errors=None):
+        self.created = 0
+        self.failed = 0
+        self.ids = []
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+def _text_lines(stream):
+    # Decode line by line so the whole upload is never held in memory
+    for index, line in enumerate(stream):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8-sig" if index == 0 else "utf-8")
+        yield line
+
+def iter_rows(stream, input_format):
+    """Yield (line number, row dict or None, error or None) from an NDJSON or CSV stream."""
+    lines = _text_lines(stream)
+    if input_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "Row has more cells than the header."
+                continue
+            # Empty cells count as missing so model defaults apply
+            yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}, None
+        return
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object."
+            continue
+        yield line_number, {key: value for key, value in row.items() if value is not None}, None
+
+def iter_chunks(stream, input_format, chunk_size):
+    """
+    Yield lists of at most chunk_size iter_rows() entries. A decoding error ends
+    the stream with an error entry, keeping the rows read before it.
+    """
+    if input_format not in FORMATS:
+        raise ValueError(f"Unsupported import format: {input_format!r}")
+    chunk = []
+    rows = iter_rows(stream, input_format)
+    while True:
+        try:
+            entry = next(rows, None)
+        except UnicodeDecodeError:
+            entry = None
+            chunk.append((None, None, "The file must be UTF-8 encoded; the rest of it was not read."))
+        if entry is None or len(chunk) >= chunk_size:
+            if chunk:
+                yield chunk
+            chunk = []
+        if entry is None:
+            return
+        chunk.append(entry)
@@ -62,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.hashing.HashingPoolSaturatedMiddleware', # 503 + Retry-After when password hashing is saturated
 ]
 
 ROOT_URLCONF = 'minara_backend.urls'
@@ -124,6 +125,31 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Version counters (skill matrices, rankings, vocabularies, cached responses and
+# profiles) live here and must be shared by every worker process. Set REDIS_URL
+# (needs the redis package) whenever more than one process serves requests:
+# Redis increments those counters atomically. Without it a file-based cache on
+# local disk is shared by the processes of a single host.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / 'cache'),
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+# Tests run with minara_backend/test_settings.py, which swaps in an in-memory cache
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -175,7 +201,7 @@ AUTH_USER_MODEL = 'users.User'
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication', # JWTAuthentication with a per-process user cache, invalidated through the shared cache
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly', # Or IsAuthenticated for stricter access
@@ -217,6 +243,105 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Near-duplicate post detection (personal_app/dedup.py)
+NEAR_DUPLICATE_DETECTION = {
+    'ENABLED': True,
+    'THRESHOLD': 0.8, # Estimated Jaccard similarity above which a post is a near-duplicate
+    'ACTION': 'flag', # 'flag' records the match; 'hold' also hides the post until reviewed
+}
+
+# Applicant ranking for business managers (professional_app/ranking.py)
+APPLICANT_RANKING = {
+    'WEIGHTS': {
+        'skill_overlap': 0.6,
+        'completeness': 0.25,
+        'can_give_referrals': 0.1,
+        'looking_for_referrals': 0.05,
+    },
+    'CACHE_TIMEOUT': 600, # Seconds; new applications invalidate immediately
+}
+
+# Bulk job listing imports (professional_app/bulk_import.py)
+JOB_LISTING_IMPORT = {
+    'CHUNK_SIZE': 500, # Rows validated and written per batch
+    'MAX_ERRORS': 100, # Row errors listed in an API response; the rest are only counted
+}
+
+# Profile PDF rendering (professional_app/pdf.py)
+PROFILE_PDF = {
+    'MAX_WORKERS': 2, # Renderer processes
+    'RETRY_AFTER': 2, # Seconds, sent with 202 responses while a PDF renders
+    'DIRECTORY': 'profile_pdfs', # Cache directory under MEDIA_ROOT
+    'MAX_PENDING': 32, # Renders queued or running before requests get 503 + Retry-After; profiles are readable anonymously
+    'MAX_FAILURES': 256, # Failed renders remembered until a request reports them
+}
+
+# Password hashing process pool (users/hashing.py)
+PASSWORD_HASHING = {
+    'ENABLED': True, # False hashes inline on the request thread
+    'MAX_WORKERS': 2, # Hashing processes
+    'MAX_PENDING': 32, # Queued or running jobs before requests get 503 + Retry-After
+    'TIMEOUT': 10, # Seconds to wait for a hash
+    'RETRY_AFTER': 1,
+}
+
+# Per-process cache of authenticated users (users/authentication.py)
+AUTH_USER_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 30, # Seconds; only bounds staleness for QuerySet.update(), saves invalidate every process at once
+    'CACHE_ALIAS': 'default', # Per-user versions checked on every request; must be shared (see Cache above)
+}
+
+# Bloom filter in front of the refresh-token blacklist (users/token_blacklist.py)
+TOKEN_BLACKLIST_FILTER = {
+    'ENABLED': True,
+    'CAPACITY': 100000,
+    'ERROR_RATE': 0.01,
+    'SYNC_INTERVAL': 30, # Seconds between incremental loads
+    'REBUILD_INTERVAL': 3600, # Seconds between full rebuilds
+    'PRUNE_BATCH_SIZE': 1000, # Rows deleted per batch by prune_token_blacklist
+}
+
+# Cached "my profile" GET representations (users/profile_cache.py)
+PROFILE_CACHE = {
+    'TIMEOUT': 300, # Seconds; signals invalidate on update, this bounds anything they miss
+}
+
+# Launch-time "me" bootstrap endpoint (users/bootstrap.py)
+ME_BOOTSTRAP = {
+    'CONCURRENT': True, # Sections run in parallel threads, each on its own database connection
+    'INBOX_SIZE': 20,
+    'COMMUNITIES_SIZE': 50,
+}
+
+# Bulk user provisioning (users/provisioning.py)
+USER_PROVISIONING = {
+    'CHUNK_SIZE': 1000, # Rows validated, duplicate-checked and inserted together
+    'MAX_ERRORS': 100,
+    'HASH_WORKERS': None, # Processes in the long-lived bulk hashing pool; None uses half the CPUs
+}
+
+# Typeahead user search over the UserSearchTerm prefix index (users/search.py)
+USER_SEARCH = {
+    'MAX_RESULTS': 10, # Per-query cap; also bounds the index rows read
+    'MIN_QUERY_LENGTH': 2,
+}
+
+# Skill and interest tag autocomplete from process-local tries (minara_backend/trie.py)
+VOCABULARY_AUTOCOMPLETE = {
+    'MAX_RESULTS': 20,
+    'CACHE_ALIAS': 'default', # Versions that tell every process to rebuild; must be shared (see Cache above)
+}
+
+# Versioned cache of GET responses for communities, job listings, funding and the professional feed (minara_backend/response_cache.py)
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default', # Any CACHES alias shared by every process (see Cache above)
+    'TIMEOUT': 300,
+    'LOCK_TIMEOUT': 10, # Single-flight: one request recomputes a missing response, others wait for it
+    'WAIT_TIMEOUT': 1, # Waiters sleep on their worker thread; past this they render the response themselves
+}
+
 # Email Backend (for development, prints to console)
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # For production, configure SMTP settings
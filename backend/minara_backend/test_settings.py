@@ -0,0 +1,14 @@
+"""
+Settings for the test suite.
+
+manage.py test uses this module by default; other runners should set
+DJANGO_SETTINGS_MODULE=minara_backend.test_settings. Tests start from an empty
+in-process cache instead of the file or Redis cache the server shares.
+"""
+from .settings import * # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -0,0 +1,168 @@
+"""
+Process-local prefix tries for small, read-mostly vocabularies (skills, interest tags).
+
+A VocabularyTrie loads its model's rows on first use and indexes every word
+suffix of each name ("machine learning" is found by "mach" and "lear").
+Each trie node keeps the first MAX_RESULTS matching rows (names starting
+with the prefix first, each group in name order), so a lookup walks
+len(prefix) nodes and copies a short list, with no query.
+
+The rows are reloaded when the vocabulary's version, a token in the
+CACHE_ALIAS cache, changes. That cache must be shared by every worker process
+(see CACHES in settings): a process-local one would leave the other workers
+serving their old trie and ETag, and answering 304 to clients holding it.
+Save/delete receivers call bump_version(), which replaces the token
+immediately and again once the transaction commits, so every process
+rebuilds on its next request. The ETag is a hash of the loaded rows, so
+clients can keep the full vocabulary and revalidate it cheaply.
+"""
+import hashlib
+import json
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+DEFAULT_CONFIG = {
+    "MAX_RESULTS": 20, # Per autocomplete query; also the number of rows kept per trie node
+    "CACHE_ALIAS": "default", # Holds the vocabulary versions; must be shared by every process
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "VOCABULARY_AUTOCOMPLETE", {}))
+    return config
+
+def get_cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+def normalize(text):
+    return " ".join((text or "").casefold().split())
+
+def _suffixes(text):
+    # Suffixes starting at each word, so "node.js" is found by "node" and "js"
+    return [
+        text[start:] for start in range(len(text))
+        if text[start].isalnum() and (start == 0 or not text[start - 1].isalnum())
+    ]
+
+class _Node:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children = {}
+        self.items = []
+
+class PrefixTrie:
+    def __init__(self, entries, node_limit):
+        """entries: (text, item) pairs in result order; each node keeps its first node_limit items."""
+        self.root = _Node()
+        texts = [normalize(text) for text, _ in entries]
+        # Names starting with the prefix come first, then names with a later word starting with it
+        for index, (text, (_, item)) in enumerate(zip(texts, entries)):
+            self._insert(text, index, item, node_limit)
+        for index, (text, (_, item)) in enumerate(zip(texts, entries)):
+            for suffix in _suffixes(text)[1:]:
+                self._insert(suffix, index, item, node_limit)
+
+    def _insert(self, key, index, item, node_limit):
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            if len(node.items) < node_limit and all(other != index for other, _ in node.items):
+                node.items.append((index, item))
+
+    def search(self, prefix, limit):
+        node = self.root
+        for char in normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [item for _, item in node.items[:limit]]
+
+def _version_key(model):
+    return f"vocabulary-version:{model._meta.label_lower}"
+
+def _set_version(model):
+    get_cache().set(_version_key(model), uuid.uuid4().hex, None)
+
+def bump_version(model):
+    """Make every process reload model's vocabulary, now and again once the current transaction commits."""
+    _set_version(model)
+    transaction.on_commit(lambda: _set_version(model))
+
+class VocabularyTrie:
+    def __init__(self, model, fields=("id", "name"), text_field="name"):
+        self.model = model
+        self.fields = fields
+        self.text_field = text_field
+        self._lock = threading.Lock()
+        self._state = None # (version, rows, trie, etag)
+
+    def _version(self):
+        cache = get_cache()
+        key = _version_key(self.model)
+        version = cache.get(key)
+        if version is None:
+            # First use, or evicted: any fresh token differs from what processes have loaded
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+        return version
+
+    def _current(self):
+        version = self._version()
+        state = self._state
+        if state is not None and state[0] == version:
+            return state
+        with self._lock:
+            if self._state is not None and self._state[0] == version:
+                return self._state
+            rows = list(self.model.objects.order_by(self.text_field, "pk").values(*self.fields))
+            trie = PrefixTrie([(row[self.text_field], row) for row in rows], get_config()["MAX_RESULTS"])
+            encoded = json.dumps(rows, sort_keys=True, separators=(",", ":"), default=str)
+            etag = f'"{self.model._meta.model_name}-{hashlib.sha256(encoded.encode()).hexdigest()[:20]}"'
+            self._state = (version, rows, trie, etag)
+            return self._state
+
+    def complete(self, prefix, limit=None):
+        """(rows whose name has a word starting with prefix, ETag of the vocabulary)."""
+        _, _, trie, etag = self._current()
+        limit = min(limit or get_config()["MAX_RESULTS"], get_config()["MAX_RESULTS"])
+        return [dict(row) for row in trie.search(prefix, limit)], etag
+
+    def all(self):
+        _, rows, _, etag = self._current()
+        return [dict(row) for row in rows], etag
+
+class VocabularyAutocompleteMixin:
+    """
+    ViewSet mixin adding GET .../autocomplete/?q=<prefix> served from `vocabulary`, a VocabularyTrie.
+    Without q the whole vocabulary is returned. Responses carry the vocabulary's ETag.
+    The action authenticates with a TokenUser (see users/authentication.py): it only
+    needs to know the request is signed in.
+    """
+    vocabulary = None
+    token_user_authentication = False
+
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated], token_user_authentication=True)
+    def autocomplete(self, request):
+        query = request.query_params.get("q", "").strip()
+        limit = request.query_params.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            if limit < 1:
+                return Response({"detail": "limit must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
+        results, etag = self.vocabulary.complete(query, limit) if query else self.vocabulary.all()
+        known = {tag.strip().removeprefix("W/") for tag in request.headers.get("If-None-Match", "").split(",")}
+        response = Response(status=status.HTTP_304_NOT_MODIFIED) if etag in known else Response(results)
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache" # Clients may keep it, but revalidate with If-None-Match
+        return response
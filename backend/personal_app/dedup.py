@@ -0,0 +1,191 @@
+"""
+Near-duplicate detection for community and personal posts.
+
+Each post is reduced to a MinHash signature over character shingles. The
+signature is split into LSH bands and every band is stored as a row in
+SignatureBucket, so finding candidates for a new post is a handful of indexed
+(band, bucket) lookups instead of a pairwise comparison with every post.
+"""
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import ContentSignature, SignatureBucket, Post, PersonalPost
+
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures stay comparable across processes and deploys
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "THRESHOLD": 0.8, # Estimated Jaccard similarity above which content is a near-duplicate
+    "ACTION": "flag", # "flag" only records the match, "hold" also hides the post until reviewed
+    "SHINGLE_SIZE": 5,
+    "MAX_CANDIDATES": 50, # Cap on candidates compared per post during a spam wave
+}
+
+CONTENT_MODELS = {
+    "POST": Post,
+    "PERSONAL_POST": PersonalPost,
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "NEAR_DUPLICATE_DETECTION", {}))
+    return config
+
+def content_kind_for(instance):
+    for kind, model in CONTENT_MODELS.items():
+        if isinstance(instance, model):
+            return kind
+    raise ValueError(f"Unsupported content type: {type(instance).__name__}")
+
+def text_for(instance):
+    if isinstance(instance, Post):
+        return f"{instance.title} {instance.content}"
+    return instance.content
+
+def shingles(text, size):
+    normalized = " ".join(_NON_WORD.sub(" ", text.lower()).split())
+    if not normalized:
+        return set()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+def compute_signature(text, shingle_size=None):
+    """Return the MinHash signature of text as a uint32 array, or None for empty text."""
+    shingle_size = shingle_size or get_config()["SHINGLE_SIZE"]
+    tokens = shingles(text, shingle_size)
+    if not tokens:
+        return None
+    hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # Universal hashing (a * x + b) mod p, one column per permutation; all operands stay below 2**64
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def band_buckets(signature):
+    """Hash each band of a signature into a signed 63-bit bucket id."""
+    buckets = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "big")).digest()
+        buckets.append(int.from_bytes(digest, "big") >> 1)
+    return buckets
+
+def estimate_similarity(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+def _load_signature(raw):
+    return np.frombuffer(bytes(raw), dtype=np.uint32)
+
+def _candidate_rows(entries, per_bucket):
+    """Indexed rows sharing a (band, bucket) with any entry, at most per_bucket (newest first) per bucket."""
+    by_band = {}
+    for _, _, buckets in entries:
+        for band, bucket in enumerate(buckets):
+            by_band.setdefault(band, set()).add(bucket)
+    # One (band, bucket__in) term per band, so the (band, bucket) index serves every lookup
+    matching = Q()
+    for band, buckets in by_band.items():
+        matching |= Q(band=band, bucket__in=buckets)
+    return (
+        SignatureBucket.objects.filter(matching)
+        .annotate(position=Window(RowNumber(), partition_by=[F("band"), F("bucket")], order_by=F("pk").desc()))
+        .filter(position__lte=per_bucket)
+        .select_related("signature")
+    )
+
+def index_contents(kind, instances, check=True):
+    """
+    Store signatures and LSH buckets for the given instances of one content kind.
+
+    When check is True each instance is compared against already-indexed
+    content (and earlier instances in the same batch) and flagged or held if
+    it is a near-duplicate. Candidate lookup is a single indexed query for the
+    batch, reading at most MAX_CANDIDATES rows per bucket.
+    Returns the list of ContentSignature objects that were flagged.
+    """
+    config = get_config()
+    entries = []
+    for instance in instances:
+        signature = compute_signature(text_for(instance), config["SHINGLE_SIZE"])
+        if signature is not None:
+            entries.append((instance, signature, band_buckets(signature)))
+    if not entries:
+        return []
+
+    # (band, bucket) -> list of (ContentSignature, signature array) already indexed
+    bucket_index = {}
+    if check:
+        for row in _candidate_rows(entries, config["MAX_CANDIDATES"]):
+            bucket_index.setdefault((row.band, row.bucket), []).append(
+                (row.signature, _load_signature(row.signature.signature))
+            )
+
+    flagged = []
+    held_ids = []
+    with transaction.atomic():
+        for instance, signature, buckets in entries:
+            match, similarity = None, 0.0
+            if check:
+                seen = set()
+                for band, bucket in enumerate(buckets):
+                    for candidate, candidate_sig in bucket_index.get((band, bucket), []):
+                        if candidate.pk in seen or len(seen) >= config["MAX_CANDIDATES"]:
+                            continue
+                        seen.add(candidate.pk)
+                        score = estimate_similarity(signature, candidate_sig)
+                        if score > similarity:
+                            match, similarity = candidate, score
+
+            is_duplicate = match is not None and similarity >= config["THRESHOLD"]
+            record = ContentSignature.objects.create(
+                content_kind=kind,
+                object_id=instance.pk,
+                signature=signature.tobytes(),
+                duplicate_of=match if is_duplicate else None,
+                similarity=similarity if is_duplicate else None,
+                is_flagged=is_duplicate,
+            )
+            SignatureBucket.objects.bulk_create([
+                SignatureBucket(signature=record, band=band, bucket=bucket)
+                for band, bucket in enumerate(buckets)
+            ])
+            for band, bucket in enumerate(buckets):
+                bucket_index.setdefault((band, bucket), []).append((record, signature))
+
+            if is_duplicate:
+                flagged.append(record)
+                if config["ACTION"] == "hold":
+                    held_ids.append(instance.pk)
+                    instance.is_held = True
+
+        if held_ids:
+            CONTENT_MODELS[kind].objects.filter(pk__in=held_ids).update(is_held=True)
+    return flagged
+
+def check_new_content(instance):
+    """Index a newly created post and flag/hold it if it is a near-duplicate."""
+    if not get_config()["ENABLED"]:
+        return []
+    return index_contents(content_kind_for(instance), [instance])
+
+def remove_content(instance):
+    ContentSignature.objects.filter(content_kind=content_kind_for(instance), object_id=instance.pk).delete()
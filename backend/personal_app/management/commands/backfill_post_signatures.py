@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from personal_app import dedup
+from personal_app.models import ContentSignature
+
+
+class Command(BaseCommand):
+    help = "Index existing posts and personal posts for near-duplicate detection, streaming in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--kind", choices=list(dedup.CONTENT_MODELS), action="append",
+            help="Content kind to backfill (repeatable). Defaults to all kinds."
+        )
+        parser.add_argument(
+            "--no-check", action="store_true",
+            help="Only build the index; do not flag existing near-duplicates."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        kinds = options["kind"] or list(dedup.CONTENT_MODELS)
+        for kind in kinds:
+            model = dedup.CONTENT_MODELS[kind]
+            indexed = flagged = 0
+            batch = []
+            # Oldest first, so the original post is indexed before its copies
+            for instance in model.objects.order_by("pk").iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    done, found = self._index_batch(kind, batch, not options["no_check"])
+                    indexed, flagged = indexed + done, flagged + found
+                    batch = []
+            if batch:
+                done, found = self._index_batch(kind, batch, not options["no_check"])
+                indexed, flagged = indexed + done, flagged + found
+            self.stdout.write(self.style.SUCCESS(f"{kind}: indexed {indexed}, flagged {flagged} near-duplicates."))
+
+    def _index_batch(self, kind, batch, check):
+        existing = set(ContentSignature.objects.filter(
+            content_kind=kind, object_id__in=[obj.pk for obj in batch]
+        ).values_list("object_id", flat=True))
+        pending = [obj for obj in batch if obj.pk not in existing]
+        flagged = dedup.index_contents(kind, pending, check=check)
+        return len(pending), len(flagged)
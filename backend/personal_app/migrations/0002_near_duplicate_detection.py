@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalpost',
+            name='is_held',
+            field=models.BooleanField(default=False, help_text='Held for moderation, e.g. flagged as a near-duplicate'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_held',
+            field=models.BooleanField(default=False, help_text='Held for moderation, e.g. flagged as a near-duplicate'),
+        ),
+        migrations.CreateModel(
+            name='ContentSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_kind', models.CharField(choices=[('POST', 'Community Post'), ('PERSONAL_POST', 'Personal Post')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('signature', models.BinaryField()),
+                ('similarity', models.FloatField(blank=True, help_text='Estimated Jaccard similarity to duplicate_of', null=True)),
+                ('is_flagged', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('duplicate_of', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='personal_app.contentsignature')),
+            ],
+            options={
+                'unique_together': {('content_kind', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SignatureBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='personal_app.contentsignature')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='personal_ap_band_4010d1_idx')],
+            },
+        ),
+    ]
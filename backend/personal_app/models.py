@@ -88,6 +88,7 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     upvotes_count = models.IntegerField(default=0) # Denormalized for quick sorting, update with signals/tasks
+    is_held = models.BooleanField(default=False, help_text="Held for moderation, e.g. flagged as a near-duplicate")
 
     def __str__(self):
         return self.title
@@ -146,6 +147,7 @@ class PersonalPost(models.Model):
     # video_url = models.URLField(max_length=500, blank=True, null=True) # Future
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    is_held = models.BooleanField(default=False, help_text="Held for moderation, e.g. flagged as a near-duplicate")
 
     def __str__(self):
         return f"Personal post by {self.author.email} at {self.created_at}"
@@ -161,3 +163,37 @@ class Follow(models.Model):
     def __str__(self):
         return f"{self.follower.email} follows {self.followed.email}"
 
+
+# Near-duplicate detection (see personal_app/dedup.py)
+class ContentSignature(models.Model):
+    """MinHash signature of a Post or PersonalPost, used to spot spam waves."""
+    CONTENT_KINDS = [
+        ("POST", "Community Post"),
+        ("PERSONAL_POST", "Personal Post"),
+    ]
+    content_kind = models.CharField(max_length=20, choices=CONTENT_KINDS)
+    object_id = models.PositiveBigIntegerField()
+    signature = models.BinaryField()
+    # Set when the content was found to be a near-duplicate of earlier content
+    duplicate_of = models.ForeignKey("self", null=True, blank=True, on_delete=models.SET_NULL, related_name="near_duplicates")
+    similarity = models.FloatField(null=True, blank=True, help_text="Estimated Jaccard similarity to duplicate_of")
+    is_flagged = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("content_kind", "object_id")
+
+    def __str__(self):
+        return f"Signature for {self.content_kind} {self.object_id}"
+
+class SignatureBucket(models.Model):
+    """One LSH band of a ContentSignature; candidates share a (band, bucket) pair."""
+    signature = models.ForeignKey(ContentSignature, on_delete=models.CASCADE, related_name="buckets")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [models.Index(fields=["band", "bucket"])]
+
+    def __str__(self):
+        return f"Band {self.band} bucket {self.bucket}"
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model # Import get_user_model
 from rest_framework import serializers
+from minara_backend.fieldsets import SparseFieldsetsMixin
+from minara_backend.fields import BulkPrimaryKeyRelatedField
+from users.cards import UserCardField
 from .models import (
     InterestTag, Community, CommunityMembership, Post, Comment, Vote, 
     CommunityCreationRequest, PersonalPost, Follow
@@ -8,27 +11,22 @@ from .models import (
 
 User = get_user_model() # Get the User model class
 
-class LightUserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User # Use the actual User model class
-        fields = ["id", "email", "phone_number"]
-
-class InterestTagSerializer(serializers.ModelSerializer):
+class InterestTagSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = InterestTag
         fields = ["id", "name", "slug"]
 
-class CommunityMembershipSerializer(serializers.ModelSerializer):
-    user = LightUserSerializer(read_only=True)
+class CommunityMembershipSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    user = UserCardField()
     class Meta:
         model = CommunityMembership
         fields = ["id", "user", "community", "date_joined", "is_approved"]
         read_only_fields = ["community", "date_joined"]
 
-class CommunitySerializer(serializers.ModelSerializer):
-    created_by = LightUserSerializer(read_only=True)
+class CommunitySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    created_by = UserCardField()
     interests = InterestTagSerializer(many=True, read_only=True)
-    interest_ids = serializers.PrimaryKeyRelatedField(
+    interest_ids = BulkPrimaryKeyRelatedField(
         many=True, queryset=InterestTag.objects.all(), source="interests", write_only=True, required=False
     )
     members_count = serializers.SerializerMethodField()
@@ -44,14 +42,16 @@ class CommunitySerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at", "created_by", "members_count"]
 
     def get_members_count(self, obj):
-        return obj.members.count()
+        # Querysets can annotate num_members=Count("members") to avoid a query per community
+        annotated = getattr(obj, "num_members", None)
+        return annotated if annotated is not None else obj.members.count()
     
     def create(self, validated_data):
         validated_data["created_by"] = self.context["request"].user
         return super().create(validated_data)
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = LightUserSerializer(read_only=True)
+class CommentSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    author = UserCardField()
     replies = serializers.SerializerMethodField()
 
     class Meta:
@@ -68,8 +68,8 @@ class CommentSerializer(serializers.ModelSerializer):
         validated_data["author"] = self.context["request"].user
         return super().create(validated_data)
 
-class PostSerializer(serializers.ModelSerializer):
-    author = LightUserSerializer(read_only=True)
+class PostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    author = UserCardField()
     community_name = serializers.CharField(source="community.name", read_only=True)
     comments_count = serializers.SerializerMethodField()
     upvotes_count = serializers.IntegerField(read_only=True)
@@ -78,9 +78,9 @@ class PostSerializer(serializers.ModelSerializer):
         model = Post
         fields = [
             "id", "community", "community_name", "author", "title", "content", 
-            "created_at", "updated_at", "upvotes_count", "comments_count"
+            "created_at", "updated_at", "upvotes_count", "comments_count", "is_held"
         ]
-        read_only_fields = ["author", "created_at", "updated_at", "upvotes_count", "comments_count", "community_name"]
+        read_only_fields = ["author", "created_at", "updated_at", "upvotes_count", "comments_count", "community_name", "is_held"]
 
     def get_comments_count(self, obj):
         return obj.comments.count()
@@ -89,8 +89,8 @@ class PostSerializer(serializers.ModelSerializer):
         validated_data["author"] = self.context["request"].user
         return super().create(validated_data)
 
-class VoteSerializer(serializers.ModelSerializer):
-    user = LightUserSerializer(read_only=True)
+class VoteSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    user = UserCardField()
 
     class Meta:
         model = Vote
@@ -111,8 +111,8 @@ class VoteSerializer(serializers.ModelSerializer):
             post_obj.save(update_fields=["upvotes_count"])
         return vote
 
-class CommunityCreationRequestSerializer(serializers.ModelSerializer):
-    requested_by = LightUserSerializer(read_only=True)
+class CommunityCreationRequestSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    requested_by = UserCardField()
 
     class Meta:
         model = CommunityCreationRequest
@@ -123,22 +123,22 @@ class CommunityCreationRequestSerializer(serializers.ModelSerializer):
         validated_data["requested_by"] = self.context["request"].user
         return super().create(validated_data)
 
-class PersonalPostSerializer(serializers.ModelSerializer):
-    author = LightUserSerializer(read_only=True)
+class PersonalPostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    author = UserCardField()
 
     class Meta:
         model = PersonalPost
-        fields = ["id", "author", "content", "image_url", "created_at", "updated_at"]
-        read_only_fields = ["author", "created_at", "updated_at"]
+        fields = ["id", "author", "content", "image_url", "created_at", "updated_at", "is_held"]
+        read_only_fields = ["author", "created_at", "updated_at", "is_held"]
 
     def create(self, validated_data):
         validated_data["author"] = self.context["request"].user
         return super().create(validated_data)
 
-class FollowSerializer(serializers.ModelSerializer):
-    follower = LightUserSerializer(read_only=True)
+class FollowSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    follower = UserCardField()
     followed = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), write_only=True) # Use User model directly
-    followed_detail = LightUserSerializer(source="followed", read_only=True)
+    followed_detail = UserCardField(source="followed")
 
     class Meta:
         model = Follow
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from minara_backend import response_cache, trie
+from .models import Post, PersonalPost, InterestTag, Community, CommunityMembership
+from . import dedup
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=PersonalPost)
+def check_post_for_near_duplicates(sender, instance, created, raw=False, **kwargs):
+    # Only new content is checked; edits keep their original signature
+    if created and not raw:
+        dedup.check_new_content(instance)
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=PersonalPost)
+def remove_post_signature(sender, instance, **kwargs):
+    dedup.remove_content(instance)
+
+# Interest tag autocomplete (minara_backend/trie.py)
+@receiver(post_save, sender=InterestTag)
+@receiver(post_delete, sender=InterestTag)
+def bump_interest_tag_vocabulary(sender, **kwargs):
+    trie.bump_version(InterestTag)
+
+# Cached community responses (minara_backend/response_cache.py)
+@receiver(post_save, sender=Community)
+@receiver(post_delete, sender=Community)
+@receiver(post_save, sender=CommunityMembership)
+@receiver(post_delete, sender=CommunityMembership)
+@receiver(post_save, sender=InterestTag)
+@receiver(post_delete, sender=InterestTag)
+def bump_response_cache_version(sender, **kwargs):
+    response_cache.bump_versions(sender)
+
+@receiver(m2m_changed, sender=Community.interests.through)
+@receiver(m2m_changed, sender=Community.members.through)
+@receiver(m2m_changed, sender=Community.admins.through)
+def bump_community_response_cache_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        response_cache.bump_versions(Community, CommunityMembership)
@@ -1,3 +1,142 @@
-from django.test import TestCase
+import threading
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from minara_backend import response_cache
+from . import dedup
+from .models import Community, ContentSignature, PersonalPost, SignatureBucket
+
+User = get_user_model()
+
+SPAM = "Limited offer! Click this link now to claim your free prize before midnight, only for today."
+OTHER = "Our reading group meets on Thursday evenings to discuss the book of Psalms together."
+
+
+class NearDuplicateDetectionTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(email="author@example.com", phone_number="300", password=None)
+
+    def post(self, content):
+        post = PersonalPost.objects.create(author=self.author, content=content)
+        post.refresh_from_db()
+        return post
+
+    def signature(self, post):
+        return ContentSignature.objects.get(content_kind="PERSONAL_POST", object_id=post.pk)
+
+    def test_near_duplicate_is_flagged(self):
+        original = self.post(SPAM)
+        copy = self.post(SPAM.replace("now", "right now"))
+        other = self.post(OTHER)
+        record = self.signature(copy)
+        self.assertTrue(record.is_flagged)
+        self.assertEqual(record.duplicate_of, self.signature(original))
+        self.assertGreaterEqual(record.similarity, 0.8)
+        self.assertFalse(copy.is_held)
+        self.assertFalse(self.signature(other).is_flagged)
+        self.assertFalse(self.signature(original).is_flagged)
+
+    @override_settings(NEAR_DUPLICATE_DETECTION={"ACTION": "hold"})
+    def test_hold_action_hides_the_copy(self):
+        original = self.post(SPAM)
+        copy = self.post(SPAM)
+        self.assertTrue(copy.is_held)
+        self.assertFalse(original.is_held)
+
+    def test_candidates_are_capped_per_bucket_in_sql(self):
+        for _ in range(3):
+            self.post(SPAM)
+        signature = dedup.compute_signature(SPAM)
+        entries = [(None, signature, dedup.band_buckets(signature))]
+        rows = list(dedup._candidate_rows(entries, per_bucket=1))
+        self.assertEqual(len(rows), dedup.BANDS)
+        newest = SignatureBucket.objects.order_by("-signature_id").values_list("signature_id", flat=True).first()
+        self.assertEqual({row.signature_id for row in rows}, {newest})
+
+    def test_backfill_indexes_existing_posts(self):
+        with override_settings(NEAR_DUPLICATE_DETECTION={"ENABLED": False}):
+            original = self.post(SPAM)
+            copy = self.post(SPAM)
+        self.assertFalse(ContentSignature.objects.exists())
+        call_command("backfill_post_signatures", kind=["PERSONAL_POST"], batch_size=1, stdout=StringIO())
+        self.assertFalse(self.signature(original).is_flagged)
+        self.assertEqual(self.signature(copy).duplicate_of, self.signature(original))
+        # Already indexed posts are skipped on a second run
+        call_command("backfill_post_signatures", kind=["PERSONAL_POST"], stdout=StringIO())
+        self.assertEqual(ContentSignature.objects.count(), 2)
+
+
+class CommunityResponseCacheTests(APITestCase):
+    URL = "/api/personal/communities/"
+
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(email="founder@example.com", phone_number="310", password=None)
+        self.reader = User.objects.create_user(email="reader@example.com", phone_number="311", password=None)
+        self.community = Community.objects.bulk_create([Community(name="Readers", created_by=self.creator)])[0]
+
+    def names(self, response):
+        return [community["name"] for community in response.data["results"]]
+
+    def user_version(self):
+        return response_cache.get_versions([User])[0]
+
+    def test_responses_are_cached_per_path_and_auth_scope(self):
+        self.assertEqual(self.names(self.client.get(self.URL)), ["Readers"])
+        # update() sends no signals, so only uncached responses see it
+        Community.objects.filter(pk=self.community.pk).update(name="Writers")
+        self.assertEqual(self.names(self.client.get(self.URL)), ["Readers"])
+        self.assertEqual(self.names(self.client.get(self.URL, {"page": 1})), ["Writers"])
+        self.client.force_authenticate(self.reader)
+        self.assertEqual(self.names(self.client.get(self.URL)), ["Writers"])
+
+    def test_changed_card_fields_invalidate_nested_users(self):
+        self.client.get(self.URL)
+        version = self.user_version()
+        User.objects.create_user(email="newcomer@example.com", phone_number="312", password=None)
+        self.creator.save(update_fields=["last_login"])
+        self.creator.is_staff = True # Not on the card
+        self.creator.save()
+        self.assertEqual(self.user_version(), version)
+        self.assertEqual(self.client.get(self.URL).data["results"][0]["created_by"]["email"], "founder@example.com")
+
+        creator = User.objects.get(pk=self.creator.pk)
+        creator.email = "founder@example.org"
+        creator.save()
+        self.assertNotEqual(self.user_version(), version)
+        self.assertEqual(self.client.get(self.URL).data["results"][0]["created_by"]["email"], "founder@example.org")
+
+    def test_deferred_card_fields_count_as_changed(self):
+        version = self.user_version()
+        creator = User.objects.only("pk").get(pk=self.creator.pk)
+        creator.phone_number = "313"
+        creator.save(update_fields=["phone_number"])
+        self.assertNotEqual(self.user_version(), version)
+
+    def test_one_request_computes_a_missing_key_while_others_wait(self):
+        key = "response-cache:single-flight"
+        cache.add(f"{key}:lock", 1) # Another request is computing
+        threading.Timer(0.1, lambda: cache.set(key, "theirs")).start()
+        computed = []
+        self.assertEqual(response_cache.get_or_compute(key, lambda: computed.append(1) or "mine"), "theirs")
+        self.assertEqual(computed, [])
+        self.assertEqual(response_cache.get_or_compute(key, lambda: "mine"), "theirs")
+
+    @override_settings(RESPONSE_CACHE={"WAIT_TIMEOUT": 0.1})
+    def test_waiters_render_themselves_after_wait_timeout(self):
+        key = "response-cache:slow"
+        cache.add(f"{key}:lock", 1) # A recompute that never finishes
+        self.assertEqual(response_cache.get_or_compute(key, lambda: "mine"), "mine")
+        self.assertEqual(cache.get(key), "mine")
+        self.assertEqual(cache.get(f"{key}:lock"), 1) # Still theirs
+
+    def test_lock_is_released_after_computing(self):
+        key = "response-cache:uncacheable"
+        self.assertIsNone(response_cache.get_or_compute(key, lambda: None))
+        self.assertIsNone(cache.get(f"{key}:lock"))
+        self.assertIsNone(cache.get(key))
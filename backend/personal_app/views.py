@@ -2,6 +2,7 @@ from rest_framework import viewsets, status, permissions, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.db.models import Q
 from .models import (
     InterestTag, Community, CommunityMembership, Post, Comment, Vote,
     CommunityCreationRequest, PersonalPost, Follow
@@ -11,19 +12,32 @@ from .serializers import (
     PostSerializer, CommentSerializer, VoteSerializer,
     CommunityCreationRequestSerializer, PersonalPostSerializer, FollowSerializer
 )
+from minara_backend.prefetch import PrefetchPlannerMixin
+from minara_backend.response_cache import ResponseCacheMixin
+from minara_backend.trie import VocabularyAutocompleteMixin, VocabularyTrie
 from .permissions import IsAdminOrReadOnly, IsAuthorOrReadOnly, IsCommunityAdminOrMemberReadOnly
 
 from django.conf import settings
 from django.contrib.auth import get_user_model # Use get_user_model
 User = get_user_model()
 
-class InterestTagViewSet(viewsets.ModelViewSet):
+def exclude_held(queryset, user):
+    # Held posts (e.g. near-duplicates awaiting review) are only visible to their author and staff
+    if user.is_authenticated and user.is_staff:
+        return queryset
+    if user.is_authenticated:
+        return queryset.filter(Q(is_held=False) | Q(author=user))
+    return queryset.filter(is_held=False)
+
+class InterestTagViewSet(VocabularyAutocompleteMixin, viewsets.ModelViewSet):
     queryset = InterestTag.objects.all()
     serializer_class = InterestTagSerializer
     permission_classes = [permissions.IsAdminUser]
+    vocabulary = VocabularyTrie(InterestTag, fields=("id", "name", "slug")) # autocomplete/ is open to any authenticated user
 
-class CommunityViewSet(viewsets.ModelViewSet):
+class CommunityViewSet(ResponseCacheMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = Community.objects.all()
+    response_cache_models = [CommunityMembership, InterestTag, User]
     serializer_class = CommunitySerializer
     # Adjusted permissions: Authenticated users can create, others can read.
     # Specific object permissions (like IsCommunityAdminOrMemberReadOnly) can be added for update/delete.
@@ -71,13 +85,13 @@ class CommunityViewSet(viewsets.ModelViewSet):
         except CommunityMembership.DoesNotExist:
             return Response({"detail": "Not a member of this community."}, status=status.HTTP_400_BAD_REQUEST)
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all().order_by("-created_at")
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = exclude_held(super().get_queryset(), self.request.user)
         community_id = self.request.query_params.get("community_id")
         if community_id:
             queryset = queryset.filter(community_id=community_id)
@@ -105,7 +119,7 @@ class PostViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all().order_by("created_at")
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
@@ -126,7 +140,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             parent_comment = get_object_or_404(Comment, pk=parent_comment_id)
         serializer.save(author=self.request.user, post=post, parent_comment=parent_comment)
 
-class CommunityCreationRequestViewSet(viewsets.ModelViewSet):
+class CommunityCreationRequestViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = CommunityCreationRequest.objects.all()
     serializer_class = CommunityCreationRequestSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
@@ -160,13 +174,13 @@ class CommunityCreationRequestViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Request rejected."}, status=status.HTTP_200_OK)
         return Response({"detail": "Request not pending."}, status=status.HTTP_400_BAD_REQUEST)
 
-class PersonalPostViewSet(viewsets.ModelViewSet):
+class PersonalPostViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = PersonalPost.objects.all().order_by("-created_at")
     serializer_class = PersonalPostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = exclude_held(super().get_queryset(), self.request.user)
         user_id = self.request.query_params.get("user_id")
         if user_id:
             return queryset.filter(author_id=user_id)
@@ -175,16 +189,16 @@ class PersonalPostViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-class UserFeedView(generics.ListAPIView):
+class UserFeedView(PrefetchPlannerMixin, generics.ListAPIView):
     serializer_class = PersonalPostSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         followed_users = Follow.objects.filter(follower=user).values_list("followed_id", flat=True)
-        return PersonalPost.objects.filter(author_id__in=list(followed_users)).order_by("-created_at")
+        return PersonalPost.objects.filter(author_id__in=list(followed_users), is_held=False).order_by("-created_at")
 
-class FollowViewSet(viewsets.ModelViewSet):
+class FollowViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProfessionalAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'professional_app'
+
+    def ready(self):
+        from . import signals # Connects the signal receivers
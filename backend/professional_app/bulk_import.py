@@ -0,0 +1,139 @@
+"""
+Streaming bulk import of job listings for one business.
+
+Rows come from NDJSON (one JSON object per line) or CSV (header row, skills
+comma-separated in one cell) and are read incrementally, so an upload of any
+size is processed one chunk at a time. Per chunk, every row is validated on its
+own, skill names are resolved (and optionally created) in one batch, and the
+listings and their skill rows are written with bulk_create. Rows that fail
+validation are reported by line number without stopping the import.
+
+bulk_create does not send signals, so each chunk updates the search index, the
+skill bitsets and the referral matches itself, and bumps the skill vocabulary
+and cached listing responses. New listings have no applications yet, so there are
+no applicant rankings to invalidate.
+"""
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Max
+from django.db.models.functions import Lower
+
+from minara_backend import response_cache, trie
+from minara_backend.row_streams import ImportResult, iter_chunks
+
+from .models import Skill, JobListing
+from .serializers import JobListingImportRowSerializer
+from . import search, matching, referrals
+
+DEFAULT_CONFIG = {
+    "CHUNK_SIZE": 500,
+    "MAX_ERRORS": 100, # Errors listed in the result; later ones are only counted
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "JOB_LISTING_IMPORT", {}))
+    return config
+
+def resolve_skills(names, create=True):
+    """
+    Map lowercased skill names to Skill ids in one case-insensitive query.
+
+    Missing skills are created when create is True. Returns (ids by lowercased
+    name, number of skills created).
+    """
+    wanted = {name.lower(): name for name in names}
+    if not wanted:
+        return {}, 0
+    found = dict(
+        Skill.objects.annotate(lower_name=Lower("name"))
+        .filter(lower_name__in=list(wanted))
+        .values_list("lower_name", "pk")
+    )
+    missing = [name for key, name in wanted.items() if key not in found]
+    if not missing or not create:
+        return found, 0
+    last_pk = Skill.objects.aggregate(last_pk=Max("pk"))["last_pk"] or 0
+    Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+    trie.bump_version(Skill)
+    response_cache.bump_versions(Skill)
+    # Re-read rather than trusting what bulk_create returns: it includes the rows
+    # skipped as conflicts (created concurrently), which have no id
+    created = 0
+    for name, pk in Skill.objects.filter(name__in=missing).values_list("name", "pk"):
+        found[name.lower()] = pk
+        created += pk > last_pk
+    return found, created
+
+class ListingImportResult(ImportResult):
+    def __init__(self, max_errors=None):
+        super().__init__(max_errors)
+        self.skills_created = 0
+
+    def as_dict(self):
+        return {**super().as_dict(), "skills_created": self.skills_created}
+
+def _import_chunk(business, chunk, create_skills, result):
+    valid = []
+    for line, row, error in chunk:
+        if error:
+            result.add_error(line, {"non_field_errors": [error]})
+            continue
+        if isinstance(row.get("employment_type"), str):
+            row["employment_type"] = row["employment_type"].strip().upper()
+        serializer = JobListingImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            result.add_error(line, serializer.errors)
+            continue
+        valid.append((line, serializer.validated_data))
+    if not valid:
+        return
+
+    skill_ids, skills_created = resolve_skills(
+        {name for _, data in valid for name in data["skills"]}, create=create_skills
+    )
+    result.skills_created += skills_created
+
+    rows = []
+    for line, data in valid:
+        unknown = [name for name in data["skills"] if name.lower() not in skill_ids]
+        if unknown:
+            result.add_error(line, {"skills": [f"Unknown skill: {name}" for name in unknown]})
+            continue
+        rows.append((line, data))
+    if not rows:
+        return
+
+    through = JobListing.required_skills.through
+    try:
+        with transaction.atomic():
+            listings = JobListing.objects.bulk_create([
+                JobListing(
+                    posted_by_business=business,
+                    **{key: value for key, value in data.items() if key != "skills"},
+                )
+                for _, data in rows
+            ])
+            through.objects.bulk_create([
+                through(joblisting_id=listing.pk, skill_id=skill_id)
+                for listing, (_, data) in zip(listings, rows)
+                for skill_id in sorted({skill_ids[name.lower()] for name in data["skills"]})
+            ])
+            listing_ids = [listing.pk for listing in listings]
+            search.index_job_listings(listing_ids)
+            matching.refresh_skill_bits(JobListing, listing_ids)
+            referrals.refresh_listings(listing_ids)
+            response_cache.bump_versions(JobListing)
+    except DatabaseError as exc:
+        for line, _ in rows:
+            result.add_error(line, {"non_field_errors": [f"Could not save listing: {exc}"]})
+        return
+    result.created += len(listing_ids)
+    result.ids.extend(listing_ids)
+
+def import_job_listings(business, stream, input_format, create_skills=True, chunk_size=None, max_errors=None):
+    """Import listings for business from an NDJSON or CSV stream and return a ListingImportResult."""
+    result = ListingImportResult(max_errors=max_errors)
+    for chunk in iter_chunks(stream, input_format, chunk_size or get_config()["CHUNK_SIZE"]):
+        _import_chunk(business, chunk, create_skills, result)
+    return result
@@ -0,0 +1,96 @@
+"""
+Indexed work experience and education entries.
+
+ProfessionalProfile.work_experience and .education are free-form JSON lists.
+Each entry is extracted into a ProfileExperienceEntry row on save, with the
+company or school normalized, so "worked at Acme" or "alumni of State U" is an
+indexed (kind, organization) lookup instead of decoding every profile's JSON.
+"""
+from datetime import datetime
+
+from django.db import transaction
+
+from .models import ProfessionalProfile, ProfileExperienceEntry
+from .organizations import normalize_organization # Also used by views
+
+# kind -> (profile field, organization keys, title keys), first non-empty key wins
+KINDS = {
+    "WORK": ("work_experience", ["company", "organization", "employer"], ["title", "position", "role"]),
+    "EDUCATION": ("education", ["school", "institution", "university", "organization"], ["degree", "field_of_study", "title"]),
+}
+START_KEYS = ["start_date", "start", "from"]
+END_KEYS = ["end_date", "end", "to"]
+CURRENT_WORDS = {"present", "current", "now"}
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m", "%Y/%m", "%m/%Y", "%b %Y", "%B %Y", "%Y"]
+
+PROFILE_FIELDS = [field for field, _, _ in KINDS.values()]
+
+def _first(entry, keys):
+    for key in keys:
+        value = entry.get(key)
+        if value not in (None, ""):
+            return " ".join(str(value).split())[:255]
+    return ""
+
+def parse_date(value):
+    """Parse the loose date formats people type ("2020", "2020-05", "May 2020"); None if unknown."""
+    value = " ".join(str(value or "").split())
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def index_entries(profile):
+    entries = []
+    for kind, (field, organization_keys, title_keys) in KINDS.items():
+        items = getattr(profile, field)
+        if not isinstance(items, list):
+            continue
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            organization = _first(item, organization_keys)
+            title = _first(item, title_keys)
+            if not organization and not title:
+                continue
+            end = _first(item, END_KEYS)
+            entries.append(ProfileExperienceEntry(
+                profile_id=profile.pk,
+                kind=kind,
+                position=position,
+                organization=normalize_organization(organization),
+                organization_label=organization,
+                title=title,
+                start_date=parse_date(_first(item, START_KEYS)),
+                end_date=parse_date(end),
+                is_current=end.lower() in CURRENT_WORDS or item.get("current") is True or item.get("is_current") is True,
+            ))
+    return entries
+
+def sync_profiles(profiles):
+    """Rewrite the index rows for a batch of profiles."""
+    rows = [entry for profile in profiles for entry in index_entries(profile)]
+    with transaction.atomic():
+        ProfileExperienceEntry.objects.filter(profile_id__in=[profile.pk for profile in profiles]).delete()
+        ProfileExperienceEntry.objects.bulk_create(rows)
+
+def sync_profile(profile):
+    sync_profiles([profile])
+
+def find_profiles(kind, organization, current=None):
+    """Profiles with an entry of `kind` at the (normalized) organization, most recent first."""
+    entries = ProfileExperienceEntry.objects.filter(kind=kind, organization=normalize_organization(organization))
+    if current is not None:
+        entries = entries.filter(is_current=current)
+    return ProfessionalProfile.objects.filter(pk__in=entries.values("profile_id")).order_by("-updated_at", "-pk")
+
+def entries_for(profile_ids, kind, organization):
+    """The matching entries for a page of profiles, as {profile_id: [entry dicts]}."""
+    matched = {}
+    for entry in ProfileExperienceEntry.objects.filter(
+        profile_id__in=profile_ids, kind=kind, organization=normalize_organization(organization)
+    ).values("profile_id", "organization_label", "title", "start_date", "end_date", "is_current"):
+        matched.setdefault(entry.pop("profile_id"), []).append(entry)
+    return matched
@@ -0,0 +1,104 @@
+"""
+Numeric funding ranges.
+
+FundingOpportunity.funding_amount_range and FundingRequest.funding_amount_sought
+are free text ("$50k - $250k", "up to 1M", "$500k+"). They are parsed on save
+into funding_min/funding_max, in whole currency units, so amounts can be
+filtered and matched with indexed range-overlap queries. A parsed range always
+has funding_min; funding_max is None when it is open-ended. Text that cannot
+be parsed, or amounts beyond what the BigIntegerField columns hold, leave both
+None and never match.
+"""
+import math
+import re
+
+from django.db.models import Q
+
+UNITS = {
+    "k": 10**3, "thousand": 10**3,
+    "m": 10**6, "mm": 10**6, "mn": 10**6, "million": 10**6,
+    "b": 10**9, "bn": 10**9, "billion": 10**9,
+}
+
+_AMOUNT = re.compile(r"(\d+(?:[.,]\d+)*)\s*(thousand|million|billion|mm|mn|bn|k|m|b)?\b", re.IGNORECASE)
+_UP_TO = re.compile(r"\b(up\s+to|under|below|less\s+than|max(?:imum)?)\b|<", re.IGNORECASE)
+_AT_LEAST = re.compile(r"\b(at\s+least|over|above|more\s+than|min(?:imum)?|from)\b|>|\+", re.IGNORECASE)
+# Text allowed between the two numbers of a range ("$50 - $250k", "50 to 250k")
+_RANGE_SEPARATOR = re.compile(r"[\s$€£]*(?:-|–|—|to)[\s$€£]*", re.IGNORECASE)
+
+# Largest value of the funding_min/funding_max BigIntegerField columns
+MAX_AMOUNT = 2**63 - 1
+
+def _amounts(text):
+    """(value, unit multiplier or None, match) for each number in text."""
+    amounts = []
+    for match in _AMOUNT.finditer(text):
+        number, unit = match.groups()
+        # Commas are thousands separators ("250,000"); a lone comma before 1-2 digits is a decimal ("1,5M")
+        if re.fullmatch(r"\d+,\d{1,2}", number):
+            number = number.replace(",", ".")
+        else:
+            number = number.replace(",", "")
+        try:
+            value = float(number)
+        except ValueError:
+            continue
+        amounts.append((value, UNITS[unit.lower()] if unit else None, match))
+    return amounts
+
+def _whole(value, unit):
+    """value * unit as an int, or None when it does not fit the funding columns."""
+    value *= unit or 1
+    if not math.isfinite(value) or value > MAX_AMOUNT:
+        return None
+    return int(value)
+
+def parse_funding_range(text):
+    """Parse free-text funding amounts into (min, max) integers; (None, None) if nothing parses."""
+    text = text or ""
+    amounts = _amounts(text)
+    if not amounts:
+        return None, None
+    if len(amounts) >= 2:
+        (low, low_unit, low_match), (high, high_unit, high_match) = amounts[:2]
+        # "$50-250k": a bare first number joined to the second by a range separator takes its unit
+        if low_unit is None and _RANGE_SEPARATOR.fullmatch(text, low_match.end(), high_match.start()):
+            low_unit = high_unit
+        low, high = _whole(low, low_unit), _whole(high, high_unit)
+        if low is None or high is None:
+            return None, None
+        return min(low, high), max(low, high)
+    value, unit, _ = amounts[0]
+    value = _whole(value, unit)
+    if value is None:
+        return None, None
+    if _UP_TO.search(text):
+        return 0, value
+    if _AT_LEAST.search(text):
+        return value, None
+    return value, value
+
+def set_funding_range(instance, text, kwargs):
+    """Parse text into instance.funding_min/max inside save(), keeping update_fields in step."""
+    instance.funding_min, instance.funding_max = parse_funding_range(text)
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None:
+        extra = [name for name in ("funding_min", "funding_max") if name not in update_fields]
+        kwargs["update_fields"] = list(update_fields) + extra
+
+def overlapping(queryset, low, high):
+    """Rows of queryset whose parsed range overlaps [low, high]; high None means open-ended."""
+    queryset = queryset.filter(funding_min__isnull=False)
+    if high is not None:
+        queryset = queryset.filter(funding_min__lte=high)
+    if low is not None:
+        queryset = queryset.filter(Q(funding_max__isnull=True) | Q(funding_max__gte=low))
+    return queryset
+
+def parse_amount(value):
+    """Parse a single query parameter amount such as "250k"; None if missing or invalid."""
+    amounts = _amounts(value or "")
+    if not amounts:
+        return None
+    amount, unit, _ = amounts[0]
+    return _whole(amount, unit)
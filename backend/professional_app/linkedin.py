@@ -0,0 +1,44 @@
+"""
+Applying a parsed LinkedIn export (linkedin_export.py) to a user's profile.
+
+Work history, education, headline and summary from the export replace the
+profile's values when the export has them; skills are added to the existing
+ones, resolved or created in one batch. Everything, new skills included, is
+written in one transaction, and the profile's save and skill signals keep the derived
+indexes (experience, referrals, skill bitsets, search) up to date.
+"""
+from django.db import transaction
+
+from .models import Skill, ProfessionalProfile
+from .bulk_import import resolve_skills
+
+def apply_export(user, parsed):
+    """Update (or create) user's ProfessionalProfile from a parsed export; return a summary dict."""
+    max_length = Skill._meta.get_field("name").max_length
+    with transaction.atomic():
+        skill_ids, skills_created = resolve_skills(name[:max_length] for name in parsed["skills"])
+        profile, created = ProfessionalProfile.objects.select_for_update().get_or_create(user=user)
+        changed = []
+        for field, value in (
+            ("headline", parsed["profile"].get("headline", "")[:255]),
+            ("summary", parsed["profile"].get("summary", "")),
+            ("work_experience", parsed["positions"]),
+            ("education", parsed["education"]),
+        ):
+            if value:
+                setattr(profile, field, value)
+                changed.append(field)
+        if changed:
+            profile.save()
+        if skill_ids:
+            profile.skills.add(*skill_ids.values())
+    return {
+        "profile_id": profile.pk,
+        "created": created,
+        "updated_fields": changed,
+        "positions": len(parsed["positions"]),
+        "education": len(parsed["education"]),
+        "skills": len(skill_ids),
+        "skills_created": skills_created,
+        "truncated": parsed.get("truncated", []), # Members cut off at linkedin_export.MAX_ROWS rows
+    }
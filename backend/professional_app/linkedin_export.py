@@ -0,0 +1,108 @@
+"""
+Parsing of LinkedIn data-export ZIP archives.
+
+The archive's CSV members are decompressed and parsed as streams, one row at a
+time, so nothing is extracted to disk or read whole into memory. Members are
+read up to MAX_ROWS rows; the keys of longer ones are listed under
+"truncated" in the result. Parsing returns plain data and this module must not import Django: the
+import_linkedin_exports command runs it in spawned worker processes.
+"""
+import csv
+import io
+import posixpath
+import zipfile
+import zlib
+
+# Member name (lowercased basename) -> key in the parsed export
+MEMBERS = {
+    "profile.csv": "profile",
+    "positions.csv": "positions",
+    "education.csv": "education",
+    "skills.csv": "skills",
+    "email addresses.csv": "emails",
+}
+
+MAX_MEMBER_SIZE = 20 * 1024 * 1024 # Uncompressed bytes per CSV, guards against zip bombs
+MAX_ROWS = 5000
+
+class ExportError(Exception):
+    pass
+
+def _clean(value):
+    return " ".join((value or "").split())
+
+def _rows(archive, info, on_truncated):
+    if info.file_size > MAX_MEMBER_SIZE:
+        raise ExportError(f"{info.filename} is too large.")
+    with archive.open(info) as raw:
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline=""))
+        for index, row in enumerate(reader):
+            if index >= MAX_ROWS:
+                on_truncated()
+                break
+            yield {(key or "").strip(): value for key, value in row.items()}
+
+def _position(row):
+    entry = {
+        "title": _clean(row.get("Title")),
+        "company": _clean(row.get("Company Name")),
+        "location": _clean(row.get("Location")),
+        "start_date": _clean(row.get("Started On")),
+        "end_date": _clean(row.get("Finished On")) or ("Present" if row.get("Started On") else ""),
+        "description": (row.get("Description") or "").strip(),
+    }
+    return {key: value for key, value in entry.items() if value}
+
+def _education(row):
+    entry = {
+        "degree": _clean(row.get("Degree Name")),
+        "school": _clean(row.get("School Name")),
+        "start_date": _clean(row.get("Start Date")),
+        "end_date": _clean(row.get("End Date")),
+        "notes": (row.get("Notes") or "").strip(),
+    }
+    return {key: value for key, value in entry.items() if value}
+
+def parse_export(source):
+    """
+    Parse a LinkedIn export (path or seekable file object) into
+    {"profile", "positions", "education", "skills", "emails", "truncated"}.
+    Missing CSVs give empty values; raises ExportError for anything that is not a usable ZIP.
+    """
+    parsed = {"profile": {}, "positions": [], "education": [], "skills": [], "emails": [], "truncated": []}
+    try:
+        archive = zipfile.ZipFile(source)
+    except (zipfile.BadZipFile, OSError) as exc:
+        raise ExportError(f"Not a ZIP archive: {exc}")
+    with archive:
+        members = {}
+        for info in archive.infolist():
+            key = MEMBERS.get(posixpath.basename(info.filename).lower())
+            if key and not info.is_dir():
+                members.setdefault(key, info)
+        if not members:
+            raise ExportError("The archive does not contain any LinkedIn export CSV files.")
+        try:
+            for key, info in members.items():
+                rows = _rows(archive, info, lambda key=key: parsed["truncated"].append(key))
+                if key == "profile":
+                    row = next(rows, {})
+                    parsed["profile"] = {
+                        "headline": _clean(row.get("Headline")),
+                        "summary": (row.get("Summary") or "").strip(),
+                    }
+                elif key == "positions":
+                    parsed["positions"] = [entry for entry in map(_position, rows) if entry.get("title") or entry.get("company")]
+                elif key == "education":
+                    parsed["education"] = [entry for entry in map(_education, rows) if entry.get("school") or entry.get("degree")]
+                elif key == "skills":
+                    parsed["skills"] = [name for name in (_clean(row.get("Name")) for row in rows) if name]
+                elif key == "emails":
+                    emails = [
+                        ((row.get("Primary") or "").lower() == "yes", _clean(row.get("Email Address")).lower())
+                        for row in rows
+                    ]
+                    parsed["emails"] = [email for _, email in sorted(emails, key=lambda item: not item[0]) if email]
+        except (zipfile.BadZipFile, zlib.error, csv.Error, EOFError) as exc:
+            raise ExportError(f"Could not read the archive: {exc}")
+    return parsed
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from professional_app import experience, referrals
+from professional_app.models import ProfessionalProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the work experience and education index from professional profiles, in batches, "
+        "and the referral matches that depend on it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        processed = 0
+        batch = []
+        profiles = ProfessionalProfile.objects.only("pk", *experience.PROFILE_FIELDS).order_by("pk")
+        for profile in profiles.iterator(chunk_size=batch_size):
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                self.sync(batch)
+                processed += len(batch)
+                batch = []
+        if batch:
+            self.sync(batch)
+            processed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"Indexed experience for {processed} profiles."))
+
+    def sync(self, profiles):
+        experience.sync_profiles(profiles)
+        referrals.refresh_referrers([profile.pk for profile in profiles])
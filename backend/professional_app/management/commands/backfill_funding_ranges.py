@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from professional_app.funding import parse_funding_range
+from professional_app.models import FundingOpportunity, FundingRequest
+
+
+class Command(BaseCommand):
+    help = "Parse funding amounts of existing opportunities and requests into funding_min/funding_max, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, text_field in [(FundingOpportunity, "funding_amount_range"), (FundingRequest, "funding_amount_sought")]:
+            processed = unparsed = 0
+            batch = []
+            for instance in model.objects.only("pk", text_field).order_by("pk").iterator(chunk_size=batch_size):
+                instance.funding_min, instance.funding_max = parse_funding_range(getattr(instance, text_field))
+                unparsed += instance.funding_min is None
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, ["funding_min", "funding_max"])
+                    processed += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, ["funding_min", "funding_max"])
+                processed += len(batch)
+            self.stdout.write(self.style.SUCCESS(
+                f"{model.__name__}: parsed {processed} rows ({unparsed} without a recognizable amount)."
+            ))
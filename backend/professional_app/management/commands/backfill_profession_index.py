@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from professional_app import mentorship
+
+
+class Command(BaseCommand):
+    help = "Rebuild the mentor/mentee profession index from both professional profile models, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for source, (model, mentor_field, mentee_field) in mentorship.SOURCES.items():
+            fields = ["pk", "user_id", "is_mentor", "is_mentee", mentor_field, mentee_field]
+            processed = 0
+            batch = []
+            for profile in model.objects.only(*fields).order_by("pk").iterator(chunk_size=batch_size):
+                batch.append(profile)
+                if len(batch) >= batch_size:
+                    mentorship.sync_profiles(batch, source)
+                    processed += len(batch)
+                    batch = []
+            if batch:
+                mentorship.sync_profiles(batch, source)
+                processed += len(batch)
+            self.stdout.write(self.style.SUCCESS(f"{source}: indexed {processed} profiles."))
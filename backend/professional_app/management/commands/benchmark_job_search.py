@@ -0,0 +1,105 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from professional_app import search
+from professional_app.models import BusinessProfile, JobListing, Skill
+
+User = get_user_model()
+
+TITLES = [
+    "Software Engineer", "Data Scientist", "Product Manager", "Accountant", "Teacher",
+    "Nurse", "Graphic Designer", "Sales Associate", "Imam", "Civil Engineer",
+    "Marketing Specialist", "Backend Developer", "Mobile Developer", "Operations Analyst",
+]
+WORDS = [
+    "python", "django", "leadership", "community", "finance", "design", "remote", "growth",
+    "analytics", "customer", "cloud", "security", "education", "health", "arabic", "logistics",
+    "research", "writing", "strategy", "mentoring", "quality", "support", "payments", "mobile",
+]
+LOCATIONS = ["London", "Dubai", "Toronto", "Chicago", "Kuala Lumpur", "Istanbul", "Cairo", "Jakarta", "Remote"]
+QUERIES = [
+    {"keyword": "engineer"}, {"keyword": "python django"}, {"keyword": "data sci"},
+    {"keyword": "design", "location": "london"}, {"location": "dubai"}, {"keyword": "mentor"},
+    {"keyword": "product manager", "location": "remote"}, {"keyword": "fin"},
+]
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark job search latency against a synthetic dataset. Listings are created inside a "
+        "transaction that is rolled back afterwards, so the database is left unchanged."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=25, help="Runs per query")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--compare", action="store_true", help="Also time the unindexed icontains fallback")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._populate(options["listings"], options["batch_size"])
+                search.reset_backend_cache()
+                self._report(type(search.get_backend()).__name__, search.get_backend(), options["repeat"])
+                if options["compare"]:
+                    self._report("IContainsSearchBackend", search.IContainsSearchBackend(), options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _populate(self, count, batch_size):
+        rng = random.Random(42)
+        user = User.objects.create_user(email="bench-search@example.com", phone_number="bench-search", password=None)
+        businesses = BusinessProfile.objects.bulk_create([
+            BusinessProfile(user_manager=user, company_name=f"Bench Company {i}") for i in range(200)
+        ])
+        skills = Skill.objects.bulk_create([Skill(name=f"bench-{word}") for word in WORDS])
+        through = JobListing.required_skills.through
+        started = time.perf_counter()
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            listings = JobListing.objects.bulk_create([
+                JobListing(
+                    posted_by_business=rng.choice(businesses),
+                    title=rng.choice(TITLES),
+                    description=" ".join(rng.choices(WORDS, k=30)),
+                    location=rng.choice(LOCATIONS),
+                    employment_type=rng.choice(JobListing.EMPLOYMENT_TYPE_CHOICES)[0],
+                )
+                for _ in range(size)
+            ])
+            through.objects.bulk_create([
+                through(joblisting_id=listing.pk, skill_id=skill.pk)
+                for listing in listings
+                for skill in rng.sample(skills, 3)
+            ])
+            created += size
+        search.get_backend().rebuild()
+        self.stdout.write(f"Created and indexed {created} listings in {time.perf_counter() - started:.1f}s")
+
+    def _report(self, label, backend, repeat):
+        base = JobListing.objects.filter(is_active=True).order_by("-posted_at")
+        self.stdout.write(f"\n{label}")
+        for query in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                queryset = backend.search(base, **query)
+                queryset.count()
+                list(queryset[:10]) # One page, as served by JobListingViewSet
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"  {query}: p50 {statistics.median(timings):.1f}ms  p95 {p95:.1f}ms  max {timings[-1]:.1f}ms"
+            )
@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from minara_backend import row_streams
+from professional_app import bulk_import
+from professional_app.models import BusinessProfile
+
+
+class Command(BaseCommand):
+    help = "Import job listings for a business from an NDJSON or CSV file (use - for stdin), in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--business-id", type=int, required=True)
+        parser.add_argument("--format", choices=row_streams.FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=None)
+        parser.add_argument("--no-create-skills", action="store_true", help="Reject rows naming unknown skills.")
+
+    def handle(self, *args, **options):
+        try:
+            business = BusinessProfile.objects.get(pk=options["business_id"])
+        except BusinessProfile.DoesNotExist:
+            raise CommandError(f"Business profile {options['business_id']} does not exist.")
+        path = options["path"]
+        input_format = options["format"] or row_streams.detect_format(filename=path)
+        if input_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            result = bulk_import.import_job_listings(
+                business, stream, input_format,
+                create_skills=not options["no_create_skills"],
+                chunk_size=options["chunk_size"],
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result.created} listings ({result.skills_created} new skills); {result.failed} rows failed."
+        ))
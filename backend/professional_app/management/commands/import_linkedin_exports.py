@@ -0,0 +1,52 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.core.management.base import BaseCommand
+
+from professional_app import linkedin
+from professional_app.linkedin_export import MAX_ROWS, parse_export, ExportError
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import LinkedIn data-export ZIPs into professional profiles. Archives are parsed in parallel "
+        "worker processes and matched to users by the export's email addresses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+")
+        parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count).")
+
+    def handle(self, *args, **options):
+        imported = failed = 0
+        # Workers only parse; database writes stay in this process, one archive at a time
+        with ProcessPoolExecutor(max_workers=options["workers"], mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {executor.submit(parse_export, path): path for path in options["paths"]}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    parsed = future.result()
+                except ExportError as exc:
+                    self.stderr.write(f"{path}: {exc}")
+                    failed += 1
+                    continue
+                matches = User.objects.annotate(lower_email=Lower("email")).filter(lower_email__in=parsed["emails"])
+                users = {user.lower_email: user for user in matches}
+                user = next((users[email] for email in parsed["emails"] if email in users), None)
+                if user is None:
+                    self.stderr.write(f"{path}: no user matches the export's email addresses.")
+                    failed += 1
+                    continue
+                summary = linkedin.apply_export(user, parsed)
+                imported += 1
+                self.stdout.write(
+                    f"{path}: {user.email} - {summary['positions']} positions, "
+                    f"{summary['education']} education entries, {summary['skills']} skills"
+                )
+                if summary["truncated"]:
+                    self.stderr.write(f"{path}: only the first {MAX_ROWS} rows of {', '.join(summary['truncated'])} were imported.")
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} archives; {failed} failed."))
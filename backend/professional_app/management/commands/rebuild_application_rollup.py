@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from professional_app import rollup
+
+
+class Command(BaseCommand):
+    help = "Recount the per-listing application status rollup used by the business dashboard."
+
+    def handle(self, *args, **options):
+        rows = rollup.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt application rollup ({rows} listing/status rows)."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from professional_app import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job listing full-text search index from the database."
+
+    def handle(self, *args, **options):
+        search.reset_backend_cache()
+        backend = search.get_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt job search index using {type(backend).__name__}."))
@@ -0,0 +1,201 @@
+"""
+Skill-overlap matching between professional profiles and job listings.
+
+Every ProfessionalProfile and JobListing keeps its skills packed into a
+bitset (``skill_bits``, bit n set for Skill id n) that is refreshed whenever
+its skills change. Scoring loads those bitsets into a per-process numpy
+matrix once and then scores every candidate with a single vectorized
+AND + popcount, instead of joining the skill tables per request.
+
+Each matrix has a version counter in the default cache, which every worker
+shares (see CACHES in settings). A change bumps the counter immediately and
+again once its transaction commits: a process that reloaded in between, from
+rows as they were before the commit, reloads once more. On commit the
+process that made the change patches its own copy in place from the
+committed rows, and the others reload on their next get(); a rollback only
+leaves the first bump, which costs a reload of unchanged rows. Patching in
+place relies on an atomic incr: with the file-based fallback two concurrent
+bumps can land on one version, so deployments with several workers should
+set REDIS_URL.
+"""
+import base64
+import binascii
+import json
+import threading
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import ProfessionalProfile, JobListing
+
+def pack_skill_ids(skill_ids):
+    """Pack skill ids into a little-endian bitset of whole 64-bit words."""
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return b""
+    words = np.zeros(max(skill_ids) // 64 + 1, dtype="<u8")
+    for skill_id in skill_ids:
+        words[skill_id // 64] |= np.uint64(1) << np.uint64(skill_id % 64)
+    return words.tobytes()
+
+def unpack_bits(raw, width):
+    row = np.zeros(width, dtype=np.uint64)
+    if raw:
+        words = np.frombuffer(bytes(raw), dtype="<u8")[:width]
+        row[:len(words)] = words
+    return row
+
+def _skill_ids_by_owner(through, owner_field, owner_ids):
+    skills = {owner_id: [] for owner_id in owner_ids}
+    for owner_id, skill_id in through.objects.filter(**{f"{owner_field}__in": owner_ids}).values_list(owner_field, "skill_id"):
+        skills[owner_id].append(skill_id)
+    return skills
+
+def refresh_skill_bits(model, owner_ids):
+    """Recompute skill_bits for the given profiles or listings with one read and one bulk write."""
+    owner_ids = list(owner_ids)
+    if not owner_ids:
+        return
+    matrix = MATRICES[model]
+    through = matrix.through()
+    skills = _skill_ids_by_owner(through, matrix.owner_field, owner_ids)
+    instances = [model(pk=owner_id, skill_bits=pack_skill_ids(skill_ids)) for owner_id, skill_ids in skills.items()]
+    model.objects.bulk_update(instances, ["skill_bits"])
+    matrix.invalidate(owner_ids)
+
+class SkillMatrix:
+    """Process-local matrix of skill bitsets for one model, reloaded when its version changes."""
+
+    def __init__(self, model, owner_field, through_attr, queryset_filter=None):
+        self.model = model
+        self.owner_field = owner_field
+        self.through_attr = through_attr
+        self.queryset_filter = queryset_filter or {}
+        self.version_key = f"skill_matrix:version:{model._meta.label_lower}"
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._bits = np.zeros((0, 1), dtype=np.uint64)
+
+    def through(self):
+        return getattr(self.model, self.through_attr).through
+
+    def _rows(self, ids=None):
+        queryset = self.model.objects.filter(**self.queryset_filter).exclude(skill_bits=b"")
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return list(queryset.values_list("pk", "skill_bits"))
+
+    def _build(self, rows):
+        width = max([len(bytes(raw)) // 8 for _, raw in rows] + [1])
+        ids = np.fromiter((pk for pk, _ in rows), dtype=np.int64, count=len(rows))
+        bits = np.zeros((len(rows), width), dtype=np.uint64)
+        for i, (_, raw) in enumerate(rows):
+            bits[i] = unpack_bits(raw, width)
+        return ids, bits
+
+    def get(self):
+        """Return (ids, bits) arrays, reloading from the database if another process bumped the version."""
+        version = cache.get(self.version_key, 0)
+        with self._lock:
+            if self._loaded_version != version:
+                self._ids, self._bits = self._build(self._rows())
+                self._loaded_version = version
+            return self._ids, self._bits
+
+    def _bump(self):
+        try:
+            return cache.incr(self.version_key)
+        except ValueError:
+            cache.add(self.version_key, 0, timeout=None)
+            return cache.incr(self.version_key)
+
+    def invalidate(self, changed_ids):
+        """Bump the shared version now and again on commit, then patch this process's copy in place for the changed rows."""
+        changed_ids = list(changed_ids)
+        version = self._bump()
+        with self._lock:
+            # The copy loaded here still matches what other transactions can see until the commit
+            if self._loaded_version is not None and self._loaded_version == version - 1:
+                self._loaded_version = version
+        transaction.on_commit(lambda: self._patch(changed_ids))
+
+    def _patch(self, changed_ids):
+        version = self._bump()
+        with self._lock:
+            if self._loaded_version is None or self._loaded_version != version - 1:
+                return # Not loaded here (or already stale); the next get() reloads
+            changed = np.fromiter(changed_ids, dtype=np.int64)
+            keep = ~np.isin(self._ids, changed)
+            new_ids, new_bits = self._build(self._rows(changed))
+            width = max(self._bits.shape[1], new_bits.shape[1])
+            self._ids = np.concatenate([self._ids[keep], new_ids])
+            self._bits = np.concatenate([_pad(self._bits[keep], width), _pad(new_bits, width)])
+            self._loaded_version = version
+
+def _pad(bits, width):
+    if bits.shape[1] == width:
+        return bits
+    padded = np.zeros((bits.shape[0], width), dtype=np.uint64)
+    padded[:, :bits.shape[1]] = bits
+    return padded
+
+MATRICES = {
+    ProfessionalProfile: SkillMatrix(ProfessionalProfile, "professionalprofile_id", "skills"),
+    JobListing: SkillMatrix(JobListing, "joblisting_id", "required_skills", {"is_active": True}),
+}
+
+def _score(target_raw, candidates_model, requirement_side):
+    """
+    Score every candidate against the target bitset.
+
+    The score is the fraction of the listing's required skills covered by the
+    profile, so requirement_side says whether the listing is the target or
+    the candidates.
+    """
+    ids, bits = MATRICES[candidates_model].get()
+    target = unpack_bits(target_raw, bits.shape[1])
+    overlap = np.bitwise_count(bits & target).sum(axis=1).astype(np.int64)
+    if requirement_side == "target":
+        required = np.full(len(ids), int(np.bitwise_count(target).sum()), dtype=np.int64)
+    else:
+        required = np.bitwise_count(bits).sum(axis=1).astype(np.int64)
+    scores = overlap / np.maximum(required, 1)
+    matched = overlap > 0
+    return ids[matched], scores[matched], overlap[matched]
+
+def encode_cursor(score, overlap, pk):
+    return base64.urlsafe_b64encode(json.dumps([score, overlap, pk]).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        score, overlap, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(overlap), int(pk)
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+def _page(ids, scores, overlap, cursor, page_size):
+    # Ordered by score, then overlap, then newest id, all descending
+    order = np.lexsort((-ids, -overlap, -scores))
+    ids, scores, overlap = ids[order], scores[order], overlap[order]
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        score, last_overlap, pk = position
+        after = (scores < score) | ((scores == score) & (
+            (overlap < last_overlap) | ((overlap == last_overlap) & (ids < pk))
+        ))
+        ids, scores, overlap = ids[after], scores[after], overlap[after]
+    results = [(int(i), float(s), int(o)) for i, s, o in zip(ids[:page_size], scores[:page_size], overlap[:page_size])]
+    next_cursor = encode_cursor(*results[-1][1:], results[-1][0]) if len(ids) > page_size else None
+    return results, next_cursor
+
+def match_jobs_for_profile(profile, cursor=None, page_size=10):
+    """Return ([(listing_id, score, matched_skills)], next_cursor) for active listings."""
+    ids, scores, overlap = _score(profile.skill_bits, JobListing, requirement_side="candidates")
+    return _page(ids, scores, overlap, cursor, page_size)
+
+def match_profiles_for_listing(listing, cursor=None, page_size=10):
+    """Return ([(profile_id, score, matched_skills)], next_cursor) for all profiles."""
+    ids, scores, overlap = _score(listing.skill_bits, ProfessionalProfile, requirement_side="target")
+    return _page(ids, scores, overlap, cursor, page_size)
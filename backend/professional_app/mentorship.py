@@ -0,0 +1,79 @@
+"""
+Normalized mentor/mentee profession index.
+
+Both professional profile models store mentorship professions as
+comma-separated text. They are split into MentorshipProfession rows on save
+so matching mentors and mentees is an indexed (role, profession) lookup.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from users.models import ProfessionalProfile as CoreProfessionalProfile
+from .models import ProfessionalProfile, MentorshipProfession
+
+# source -> (model, mentor field, mentee field)
+SOURCES = {
+    "DETAILED": (ProfessionalProfile, "mentor_professions", "mentee_professions"),
+    "CORE": (CoreProfessionalProfile, "mentor_categories", "mentee_categories"),
+}
+
+def parse_professions(text):
+    """Split comma-separated professions into {normalized: label}, dropping blanks and duplicates."""
+    professions = {}
+    for part in (text or "").split(","):
+        label = " ".join(part.split())
+        if label:
+            professions.setdefault(label.lower(), label[:255])
+    return professions
+
+def source_for(profile):
+    for source, (model, _, _) in SOURCES.items():
+        if isinstance(profile, model):
+            return source
+    raise ValueError(f"Unsupported profile type: {type(profile).__name__}")
+
+def index_entries(profile, source):
+    _, mentor_field, mentee_field = SOURCES[source]
+    entries = {}
+    if profile.is_mentor:
+        for profession, label in parse_professions(getattr(profile, mentor_field)).items():
+            entries[("MENTOR", profession)] = label
+    if profile.is_mentee:
+        for profession, label in parse_professions(getattr(profile, mentee_field)).items():
+            entries[("MENTEE", profession)] = label
+    return entries
+
+def sync_profiles(profiles, source):
+    """Rewrite the index rows for a batch of profiles from one source."""
+    user_ids = [profile.user_id for profile in profiles]
+    rows = [
+        MentorshipProfession(user_id=profile.user_id, role=role, source=source, profession=profession, label=label)
+        for profile in profiles
+        for (role, profession), label in index_entries(profile, source).items()
+    ]
+    with transaction.atomic():
+        MentorshipProfession.objects.filter(source=source, user_id__in=user_ids).delete()
+        MentorshipProfession.objects.bulk_create(rows)
+
+def sync_profile(profile):
+    sync_profiles([profile], source_for(profile))
+
+def remove_profile(profile):
+    MentorshipProfession.objects.filter(source=source_for(profile), user_id=profile.user_id).delete()
+
+def professions_for(user, role):
+    return set(MentorshipProfession.objects.filter(user=user, role=role).values_list("profession", flat=True))
+
+def find_matches(user, role, professions):
+    """
+    Users holding `role` for any of the given normalized professions, best overlap first.
+
+    Returns a values queryset of {"user_id", "overlap"} rows so it can be paginated.
+    """
+    return (
+        MentorshipProfession.objects.filter(role=role, profession__in=professions)
+        .exclude(user=user)
+        .values("user_id")
+        .annotate(overlap=Count("profession", distinct=True))
+        .order_by("-overlap", "user_id")
+    )
@@ -0,0 +1,87 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# The DDL is spelled out here rather than imported from professional_app/search.py,
+# so later changes to the search module never change what this migration does.
+FTS_TABLE = "professional_app_joblisting_fts"
+PG_TABLE = "professional_app_joblisting_search"
+
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, company, location, skills, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+]
+SQLITE_REBUILD = [
+    f"DELETE FROM {FTS_TABLE}",
+    f"INSERT INTO {FTS_TABLE} (rowid, title, description, company, location, skills) "
+    "SELECT jl.id, jl.title, jl.description, bp.company_name, jl.location, "
+    "COALESCE((SELECT group_concat(s.name, ' ') "
+    "FROM professional_app_joblisting_required_skills rs "
+    "JOIN professional_app_skill s ON s.id = rs.skill_id "
+    "WHERE rs.joblisting_id = jl.id), '') "
+    "FROM professional_app_joblisting jl "
+    "JOIN professional_app_businessprofile bp ON bp.id = jl.posted_by_business_id",
+]
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', jl.title), 'A') || "
+    "setweight(to_tsvector('simple', bp.company_name), 'B') || "
+    "setweight(to_tsvector('simple', sk.names), 'B') || "
+    "setweight(to_tsvector('simple', jl.location), 'C') || "
+    "setweight(to_tsvector('simple', jl.description), 'D')"
+)
+PG_CREATE = [
+    f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+    "listing_id bigint PRIMARY KEY REFERENCES professional_app_joblisting(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "company tsvector NOT NULL, "
+    "document tsvector NOT NULL)",
+    f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_gin ON {PG_TABLE} USING GIN (document)",
+    f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_company_gin ON {PG_TABLE} USING GIN (company)",
+]
+PG_REBUILD = [
+    f"DELETE FROM {PG_TABLE}",
+    f"INSERT INTO {PG_TABLE} (listing_id, company, document) "
+    f"SELECT jl.id, to_tsvector('simple', bp.company_name), {PG_DOCUMENT} "
+    "FROM professional_app_joblisting jl "
+    "JOIN professional_app_businessprofile bp ON bp.id = jl.posted_by_business_id "
+    "LEFT JOIN LATERAL (SELECT COALESCE(string_agg(s.name, ' '), '') AS names "
+    "FROM professional_app_joblisting_required_skills rs "
+    "JOIN professional_app_skill s ON s.id = rs.skill_id "
+    "WHERE rs.joblisting_id = jl.id) sk ON TRUE",
+]
+
+# vendor -> (create statements, rebuild statements, drop statement)
+STATEMENTS = {
+    "sqlite": (SQLITE_CREATE, SQLITE_REBUILD, f"DROP TABLE IF EXISTS {FTS_TABLE}"),
+    "postgresql": (PG_CREATE, PG_REBUILD, f"DROP TABLE IF EXISTS {PG_TABLE}"),
+}
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in STATEMENTS:
+        return # Other backends use the icontains fallback
+    create, rebuild, _ = STATEMENTS[schema_editor.connection.vendor]
+    try:
+        for statement in create:
+            schema_editor.execute(statement)
+    except OperationalError:
+        # e.g. SQLite compiled without FTS5; search falls back to icontains filters
+        return
+    for statement in rebuild:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in STATEMENTS:
+        schema_editor.execute(STATEMENTS[schema_editor.connection.vendor][2])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
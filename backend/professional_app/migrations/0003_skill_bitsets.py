@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:18
+
+from django.db import migrations, models
+
+
+def pack_skill_ids(skill_ids):
+    # Same layout as professional_app.matching.pack_skill_ids: little-endian 64-bit words
+    if not skill_ids:
+        return b""
+    value = 0
+    for skill_id in skill_ids:
+        value |= 1 << skill_id
+    return value.to_bytes((max(skill_ids) // 64 + 1) * 8, "little")
+
+
+def backfill_skill_bits(apps, schema_editor):
+    for model_name, field_name in (("ProfessionalProfile", "skills"), ("JobListing", "required_skills")):
+        model = apps.get_model("professional_app", model_name)
+        through = getattr(model, field_name).through
+        owner_field = f"{model_name.lower()}_id"
+        skills = {}
+        for owner_id, skill_id in through.objects.values_list(owner_field, "skill_id").iterator():
+            skills.setdefault(owner_id, []).append(skill_id)
+        model.objects.bulk_update(
+            [model(pk=owner_id, skill_bits=pack_skill_ids(skill_ids)) for owner_id, skill_ids in skills.items()],
+            ["skill_bits"],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0002_joblisting_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='skill_bits',
+            field=models.BinaryField(blank=True, default=b'', help_text='Packed skill id bitset, see professional_app/matching.py'),
+        ),
+        migrations.AddField(
+            model_name='professionalprofile',
+            name='skill_bits',
+            field=models.BinaryField(blank=True, default=b'', help_text='Packed skill id bitset, see professional_app/matching.py'),
+        ),
+        migrations.RunPython(backfill_skill_bits, migrations.RunPython.noop),
+    ]
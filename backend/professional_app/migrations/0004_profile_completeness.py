@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:19
+
+from django.db import migrations, models
+
+COMPLETENESS_FIELDS = ["headline", "summary", "work_experience", "education", "resume_url"]
+
+
+def backfill_completeness(apps, schema_editor):
+    ProfessionalProfile = apps.get_model("professional_app", "ProfessionalProfile")
+    batch = []
+    for profile in ProfessionalProfile.objects.only("pk", *COMPLETENESS_FIELDS).iterator(chunk_size=1000):
+        profile.completeness = sum(1 for name in COMPLETENESS_FIELDS if getattr(profile, name)) / len(COMPLETENESS_FIELDS)
+        batch.append(profile)
+        if len(batch) >= 1000:
+            ProfessionalProfile.objects.bulk_update(batch, ["completeness"])
+            batch = []
+    ProfessionalProfile.objects.bulk_update(batch, ["completeness"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0003_skill_bitsets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='professionalprofile',
+            name='completeness',
+            field=models.FloatField(default=0.0, editable=False, help_text='Fraction of COMPLETENESS_FIELDS filled in, kept up to date on save'),
+        ),
+        migrations.RunPython(backfill_completeness, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0004_profile_completeness'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorshipProfession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('MENTOR', 'Mentor'), ('MENTEE', 'Mentee')], max_length=10)),
+                ('source', models.CharField(choices=[('DETAILED', 'Detailed professional profile'), ('CORE', 'Core professional profile')], max_length=10)),
+                ('profession', models.CharField(help_text='Normalized (lowercased, single-spaced) profession', max_length=255)),
+                ('label', models.CharField(help_text='Profession as the user wrote it', max_length=255)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mentorship_professions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['role', 'profession'], name='professiona_role_bc6531_idx')],
+                'unique_together': {('user', 'role', 'source', 'profession')},
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0005_mentorship_profession_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileExperienceEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('WORK', 'Work experience'), ('EDUCATION', 'Education')], max_length=10)),
+                ('position', models.PositiveIntegerField(help_text="Index of the entry in the profile's JSON list")),
+                ('organization', models.CharField(blank=True, help_text='Normalized (lowercased, single-spaced) company or school', max_length=255)),
+                ('organization_label', models.CharField(blank=True, help_text='Company or school as the user wrote it', max_length=255)),
+                ('title', models.CharField(blank=True, help_text='Job title or degree', max_length=255)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_current', models.BooleanField(default=False)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='experience_entries', to='professional_app.professionalprofile')),
+            ],
+            options={
+                'ordering': ['profile', 'kind', 'position'],
+                'indexes': [models.Index(fields=['kind', 'organization'], name='professiona_kind_fdc1b1_idx')],
+                'unique_together': {('profile', 'kind', 'position')},
+            },
+        ),
+    ]
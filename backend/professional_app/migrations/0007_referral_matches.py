@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0006_profile_experience_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferralMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, help_text="The referrer's title at the company", max_length=255)),
+                ('is_current', models.BooleanField(default=False, help_text='Whether the referrer still works at the company')),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referral_matches', to='professional_app.businessprofile')),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referral_matches', to='professional_app.joblisting')),
+                ('referrer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='referral_matches', to='professional_app.professionalprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['listing', 'is_current'], name='professiona_listing_24634c_idx')],
+                'unique_together': {('listing', 'referrer')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0007_referral_matches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fundingopportunity',
+            name='funding_max',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Parsed upper bound; empty when open-ended', null=True),
+        ),
+        migrations.AddField(
+            model_name='fundingopportunity',
+            name='funding_min',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Parsed from funding_amount_range, see professional_app/funding.py', null=True),
+        ),
+        migrations.AddField(
+            model_name='fundingrequest',
+            name='funding_max',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Parsed upper bound; empty when open-ended', null=True),
+        ),
+        migrations.AddField(
+            model_name='fundingrequest',
+            name='funding_min',
+            field=models.BigIntegerField(blank=True, editable=False, help_text='Parsed from funding_amount_sought, see professional_app/funding.py', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='fundingopportunity',
+            index=models.Index(fields=['funding_min', 'funding_max'], name='professiona_funding_3dbc6f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fundingrequest',
+            index=models.Index(fields=['funding_min', 'funding_max'], name='professiona_funding_57354a_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_status_counts(apps, schema_editor):
+    JobApplication = apps.get_model("professional_app", "JobApplication")
+    JobApplicationStatusCount = apps.get_model("professional_app", "JobApplicationStatusCount")
+    counts = (
+        JobApplication.objects.values("job_listing_id", "job_listing__posted_by_business_id", "status")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    JobApplicationStatusCount.objects.bulk_create([
+        JobApplicationStatusCount(
+            listing_id=row["job_listing_id"],
+            business_id=row["job_listing__posted_by_business_id"],
+            status=row["status"],
+            count=row["total"],
+        )
+        for row in counts
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0008_funding_ranges'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('APPLIED', 'Applied'), ('UNDER_REVIEW', 'Under Review'), ('INTERVIEWING', 'Interviewing'), ('OFFERED', 'Offered'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_counts', to='professional_app.businessprofile')),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_counts', to='professional_app.joblisting')),
+            ],
+            options={
+                'unique_together': {('listing', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_status_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    # "My profile" GETs no longer create the profile, so every existing user needs one
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    ProfessionalProfile = apps.get_model("professional_app", "ProfessionalProfile")
+    missing = User.objects.exclude(pk__in=ProfessionalProfile.objects.values("user_id")).values_list("pk", flat=True)
+    ProfessionalProfile.objects.bulk_create(
+        [ProfessionalProfile(user_id=user_id) for user_id in missing.iterator()], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0009_application_status_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
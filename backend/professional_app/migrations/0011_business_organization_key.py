@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+def normalize_organization(name):
+    # Copy of professional_app.organizations.normalize_organization as of this migration
+    return " ".join(str(name or "").split()).lower()[:255]
+
+
+def backfill_organization_keys(apps, schema_editor):
+    BusinessProfile = apps.get_model("professional_app", "BusinessProfile")
+    batch = []
+    for business in BusinessProfile.objects.only("pk", "company_name").iterator(chunk_size=1000):
+        business.organization_key = normalize_organization(business.company_name)
+        batch.append(business)
+        if len(batch) >= 1000:
+            BusinessProfile.objects.bulk_update(batch, ["organization_key"])
+            batch = []
+    BusinessProfile.objects.bulk_update(batch, ["organization_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professional_app', '0010_backfill_professional_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessprofile',
+            name='organization_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Normalized company_name, matched against work history (see professional_app/organizations.py)', max_length=255),
+        ),
+        migrations.RunPython(backfill_organization_keys, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,9 @@ from django.db import models
 from django.conf import settings
 from django.contrib.auth import get_user_model # Import get_user_model
 
+from .funding import set_funding_range
+from .organizations import normalize_organization
+
 User = get_user_model() # Use get_user_model to get the actual User model class
 
 class Skill(models.Model):
@@ -25,12 +28,28 @@ class ProfessionalProfile(models.Model):
     mentor_professions = models.CharField(max_length=255, blank=True, help_text="Comma-separated list of professions for mentorship")
     is_mentee = models.BooleanField(default=False)
     mentee_professions = models.CharField(max_length=255, blank=True, help_text="Comma-separated list of professions for mentee interest")
+    skill_bits = models.BinaryField(default=b"", blank=True, editable=False, help_text="Packed skill id bitset, see professional_app/matching.py")
+    completeness = models.FloatField(default=0.0, editable=False, help_text="Fraction of COMPLETENESS_FIELDS filled in, kept up to date on save")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Fields counted towards profile completeness (skills are scored separately via skill_bits)
+    COMPLETENESS_FIELDS = ["headline", "summary", "work_experience", "education", "resume_url"]
+
     def __str__(self):
         return f"Detailed Professional Profile for {self.user.email}"
 
+    def compute_completeness(self):
+        filled = sum(1 for name in self.COMPLETENESS_FIELDS if getattr(self, name))
+        return filled / len(self.COMPLETENESS_FIELDS)
+
+    def save(self, *args, **kwargs):
+        self.completeness = self.compute_completeness()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "completeness" not in update_fields:
+            kwargs["update_fields"] = list(update_fields) + ["completeness"]
+        super().save(*args, **kwargs)
+
 class BusinessProfile(models.Model):
     user_manager = models.ForeignKey(User, on_delete=models.CASCADE, related_name="managed_business_profiles")
     company_name = models.CharField(max_length=255, unique=True)
@@ -41,12 +60,20 @@ class BusinessProfile(models.Model):
     mission_statement = models.TextField(blank=True)
     is_startup = models.BooleanField(default=False)
     is_vc_firm = models.BooleanField(default=False, verbose_name="Is Venture Capital Firm")
+    organization_key = models.CharField(max_length=255, blank=True, db_index=True, editable=False, help_text="Normalized company_name, matched against work history (see professional_app/organizations.py)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.company_name
 
+    def save(self, *args, **kwargs):
+        self.organization_key = normalize_organization(self.company_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "company_name" in update_fields and "organization_key" not in update_fields:
+            kwargs["update_fields"] = list(update_fields) + ["organization_key"]
+        super().save(*args, **kwargs)
+
 class JobListing(models.Model):
     posted_by_business = models.ForeignKey(BusinessProfile, on_delete=models.CASCADE, related_name="job_listings")
     title = models.CharField(max_length=255)
@@ -61,6 +88,7 @@ class JobListing(models.Model):
     ]
     employment_type = models.CharField(max_length=20, choices=EMPLOYMENT_TYPE_CHOICES, blank=True)
     required_skills = models.ManyToManyField(Skill, blank=True, related_name="job_listings")
+    skill_bits = models.BinaryField(default=b"", blank=True, editable=False, help_text="Packed skill id bitset, see professional_app/matching.py")
     is_active = models.BooleanField(default=True)
     posted_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -94,25 +122,43 @@ class FundingOpportunity(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     funding_amount_range = models.CharField(max_length=100, blank=True, help_text="e.g., $50k - $250k")
+    funding_min = models.BigIntegerField(null=True, blank=True, editable=False, help_text="Parsed from funding_amount_range, see professional_app/funding.py")
+    funding_max = models.BigIntegerField(null=True, blank=True, editable=False, help_text="Parsed upper bound; empty when open-ended")
     eligibility_criteria = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     posted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["funding_min", "funding_max"])]
+
     def __str__(self):
         return f"Funding: {self.title} by {self.posted_by_business.company_name}"
 
+    def save(self, *args, **kwargs):
+        set_funding_range(self, self.funding_amount_range, kwargs)
+        super().save(*args, **kwargs)
+
 class FundingRequest(models.Model):
     requested_by_business = models.ForeignKey(BusinessProfile, on_delete=models.CASCADE, related_name="funding_requests")
     title = models.CharField(max_length=255)
     description = models.TextField()
     funding_amount_sought = models.CharField(max_length=100, blank=True, help_text="e.g., $100k")
+    funding_min = models.BigIntegerField(null=True, blank=True, editable=False, help_text="Parsed from funding_amount_sought, see professional_app/funding.py")
+    funding_max = models.BigIntegerField(null=True, blank=True, editable=False, help_text="Parsed upper bound; empty when open-ended")
     business_plan_url = models.URLField(max_length=500, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     requested_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["funding_min", "funding_max"])]
+
     def __str__(self):
         return f"Funding Request: {self.title} by {self.requested_by_business.company_name}"
 
+    def save(self, *args, **kwargs):
+        set_funding_range(self, self.funding_amount_sought, kwargs)
+        super().save(*args, **kwargs)
+
 class ProfessionalFeedPost(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="professional_feed_posts")
     content = models.TextField()
@@ -125,3 +171,93 @@ class ProfessionalFeedPost(models.Model):
     def __str__(self):
         return f"Professional post by {self.author.email} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
 
+
+class MentorshipProfession(models.Model):
+    """
+    One normalized mentor/mentee profession per row, extracted from the comma-separated
+    fields on both professional_app.ProfessionalProfile and users.ProfessionalProfile.
+    """
+    ROLE_CHOICES = [
+        ("MENTOR", "Mentor"),
+        ("MENTEE", "Mentee"),
+    ]
+    SOURCE_CHOICES = [
+        ("DETAILED", "Detailed professional profile"), # professional_app.ProfessionalProfile
+        ("CORE", "Core professional profile"), # users.ProfessionalProfile
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mentorship_professions")
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    profession = models.CharField(max_length=255, help_text="Normalized (lowercased, single-spaced) profession")
+    label = models.CharField(max_length=255, help_text="Profession as the user wrote it")
+
+    class Meta:
+        unique_together = ("user", "role", "source", "profession")
+        indexes = [models.Index(fields=["role", "profession"])]
+
+    def __str__(self):
+        return f"{self.user_id} {self.role.lower()}: {self.label}"
+
+
+class ProfileExperienceEntry(models.Model):
+    """
+    One row per work_experience or education entry of a ProfessionalProfile,
+    extracted from the JSON lists on save so organization lookups use an index.
+    """
+    KIND_CHOICES = [
+        ("WORK", "Work experience"),
+        ("EDUCATION", "Education"),
+    ]
+    profile = models.ForeignKey(ProfessionalProfile, on_delete=models.CASCADE, related_name="experience_entries")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    position = models.PositiveIntegerField(help_text="Index of the entry in the profile's JSON list")
+    organization = models.CharField(max_length=255, blank=True, help_text="Normalized (lowercased, single-spaced) company or school")
+    organization_label = models.CharField(max_length=255, blank=True, help_text="Company or school as the user wrote it")
+    title = models.CharField(max_length=255, blank=True, help_text="Job title or degree")
+    start_date = models.DateField(null=True, blank=True)
+    end_date = models.DateField(null=True, blank=True)
+    is_current = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("profile", "kind", "position")
+        indexes = [models.Index(fields=["kind", "organization"])]
+        ordering = ["profile", "kind", "position"]
+
+    def __str__(self):
+        return f"{self.profile_id} {self.kind.lower()}: {self.title} at {self.organization_label}"
+
+
+class ReferralMatch(models.Model):
+    """
+    A profile that can refer candidates for an active job listing, because its work history
+    includes the listing's company. Maintained by professional_app/referrals.py.
+    """
+    business = models.ForeignKey(BusinessProfile, on_delete=models.CASCADE, related_name="referral_matches")
+    listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name="referral_matches")
+    referrer = models.ForeignKey(ProfessionalProfile, on_delete=models.CASCADE, related_name="referral_matches")
+    title = models.CharField(max_length=255, blank=True, help_text="The referrer's title at the company")
+    is_current = models.BooleanField(default=False, help_text="Whether the referrer still works at the company")
+
+    class Meta:
+        unique_together = ("listing", "referrer")
+        indexes = [models.Index(fields=["listing", "is_current"])]
+
+    def __str__(self):
+        return f"Profile {self.referrer_id} can refer for listing {self.listing_id}"
+
+
+class JobApplicationStatusCount(models.Model):
+    """
+    Number of applications per (listing, status), kept up to date by the JobApplication
+    signals in professional_app/signals.py. Rebuild with `manage.py rebuild_application_rollup`.
+    """
+    listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name="application_status_counts")
+    business = models.ForeignKey(BusinessProfile, on_delete=models.CASCADE, related_name="application_status_counts")
+    status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("listing", "status")
+
+    def __str__(self):
+        return f"{self.count} {self.status.lower()} for listing {self.listing_id}"
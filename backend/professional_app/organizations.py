@@ -0,0 +1,10 @@
+"""
+Normalized company and school names.
+
+Work history entries (experience.py) and business profiles store the same
+normalized key, so "ACME  Corp" on a profile matches the "Acme Corp" business
+with an indexed equality lookup on both sides.
+"""
+
+def normalize_organization(name):
+    return " ".join(str(name or "").split()).lower()[:255]
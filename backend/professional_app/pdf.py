@@ -0,0 +1,143 @@
+"""
+"Download my profile as PDF", rendered off the request path and cached on disk.
+
+The profile is reduced to a plain document dict whose SHA-256 names the output
+file under MEDIA_ROOT/<DIRECTORY>/<profile id>/<hash>.pdf. An unchanged profile
+is therefore served straight from disk; a changed one gets a new hash and is
+rendered by a process pool (pdf_render.py) while the request returns 202 with
+Retry-After. Concurrent requests for the same render share one job.
+
+Profiles are readable anonymously, so the queue is bounded: with MAX_PENDING
+renders queued or running, further ones raise RenderQueueFull (503 with
+Retry-After). Finished jobs leave _in_flight at once. The error of a failed
+one is kept, in an LRU of MAX_FAILURES entries, until the next request for
+that content reports it; the request after that queues a new attempt.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .pdf_render import render_profile_pdf
+
+logger = logging.getLogger(__name__)
+
+RENDERER_VERSION = 1 # Bump when the layout changes so cached PDFs are re-rendered
+
+DEFAULT_CONFIG = {
+    "MAX_WORKERS": 2,
+    "RETRY_AFTER": 2, # Seconds clients should wait before polling again
+    "DIRECTORY": "profile_pdfs", # Under MEDIA_ROOT
+    "MAX_PENDING": 32, # Renders queued or running before requests get 503 + Retry-After
+    "MAX_FAILURES": 256, # Failed renders remembered until a request reports them
+}
+
+_lock = threading.Lock()
+_executor = None
+_in_flight = {} # path -> Future of a queued or running render
+_failures = OrderedDict() # path -> error of a failed render, oldest first
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "PROFILE_PDF", {}))
+    return config
+
+def _new_executor():
+    # spawn keeps workers free of the parent's threads and open connections
+    return ProcessPoolExecutor(max_workers=get_config()["MAX_WORKERS"], mp_context=multiprocessing.get_context("spawn"))
+
+def profile_document(profile):
+    """Everything the PDF shows, as plain JSON-serializable data."""
+    user = profile.user
+    personal_profile = getattr(user, "personal_profile", None) # Missing reverse one-to-one raises AttributeError
+    name = (personal_profile.full_name if personal_profile else "") or user.email
+    return {
+        "renderer_version": RENDERER_VERSION,
+        "name": name,
+        "email": user.email,
+        "headline": profile.headline,
+        "summary": profile.summary,
+        "resume_url": profile.resume_url or "",
+        "work_experience": profile.work_experience if isinstance(profile.work_experience, list) else [],
+        "education": profile.education if isinstance(profile.education, list) else [],
+        "skills": sorted(skill.name for skill in profile.skills.all()),
+    }
+
+def content_hash(document):
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def pdf_path(profile_id, digest):
+    return os.path.join(settings.MEDIA_ROOT, get_config()["DIRECTORY"], str(profile_id), f"{digest}.pdf")
+
+class RenderFailed(Exception):
+    pass
+
+class RenderQueueFull(Exception):
+    """MAX_PENDING renders are queued or running; retry after retry_after seconds."""
+    detail = "Too many PDFs are being rendered. Please try again shortly."
+
+    def __init__(self):
+        super().__init__(self.detail)
+        self.retry_after = get_config()["RETRY_AFTER"]
+
+def get_or_schedule(profile):
+    """
+    Return (path, digest) when the current PDF is on disk, or (None, digest) after making
+    sure a render is queued. Raises RenderFailed if the last render of this content failed,
+    and RenderQueueFull if a new render cannot be queued.
+    """
+    document = profile_document(profile)
+    digest = content_hash(document)
+    path = pdf_path(profile.pk, digest)
+    if os.path.exists(path):
+        return path, digest
+    with _lock:
+        error = _failures.pop(path, None)
+    if error is not None:
+        logger.error("Rendering profile %s PDF failed", profile.pk, exc_info=error)
+        raise RenderFailed(str(error)) # The next request retries
+    _submit(document, path)
+    if os.path.exists(path):
+        return path, digest # Finished in between
+    return None, digest
+
+def _finished(path, future):
+    # Successful renders are found on disk from now on; failures wait for a request to report them
+    error = None if future.cancelled() else future.exception()
+    with _lock:
+        _in_flight.pop(path, None)
+        if error is not None:
+            _failures[path] = error
+            _failures.move_to_end(path)
+            while len(_failures) > get_config()["MAX_FAILURES"]:
+                _failures.popitem(last=False)
+
+def _submit(document, path):
+    global _executor
+    future = None
+    with _lock:
+        if path in _in_flight:
+            return
+        if len(_in_flight) >= get_config()["MAX_PENDING"]:
+            raise RenderQueueFull()
+        for _ in range(2):
+            if _executor is None:
+                _executor = _new_executor()
+            try:
+                future = _in_flight[path] = _executor.submit(render_profile_pdf, document, path)
+                break
+            except BrokenProcessPool:
+                _executor = None # A worker died; retry once on a fresh pool
+    if future is None:
+        raise RenderFailed("The PDF worker pool is unavailable.")
+    # Outside the lock: the callback runs immediately if the render already finished
+    future.add_done_callback(partial(_finished, path))
@@ -0,0 +1,74 @@
+"""
+Profile PDF rendering, run inside the worker processes started by pdf.py.
+
+This module must not import Django: workers are spawned fresh and only
+receive a plain document dict (see pdf.profile_document) and a target path.
+"""
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+def _paragraph(text, style):
+    from reportlab.platypus import Paragraph
+    return Paragraph(escape(str(text)).replace("\n", "<br/>"), style)
+
+def _entry_lines(entries, heading_keys, detail_keys):
+    lines = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        heading = " at ".join(str(entry[key]) for key in heading_keys if entry.get(key))
+        details = " - ".join(str(entry[key]) for key in detail_keys if entry.get(key))
+        if heading or details:
+            lines.append((heading, details))
+    return lines
+
+def render_profile_pdf(document, path):
+    """Render document to path atomically and remove older renders of the same profile."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    story = [_paragraph(document["name"], styles["Title"])]
+    if document["headline"]:
+        story.append(_paragraph(document["headline"], styles["Heading3"]))
+    contact = " | ".join(value for value in (document["email"], document["resume_url"]) if value)
+    if contact:
+        story.append(_paragraph(contact, styles["Normal"]))
+    if document["summary"]:
+        story += [Spacer(1, 4 * mm), _paragraph("Summary", styles["Heading2"]), _paragraph(document["summary"], styles["BodyText"])]
+
+    sections = [
+        ("Experience", _entry_lines(document["work_experience"], ["title", "company"], ["start_date", "end_date", "description"])),
+        ("Education", _entry_lines(document["education"], ["degree", "school"], ["start_date", "end_date", "field_of_study"])),
+    ]
+    for title, lines in sections:
+        if lines:
+            story += [Spacer(1, 4 * mm), _paragraph(title, styles["Heading2"])]
+            for heading, details in lines:
+                story.append(_paragraph(heading or details, styles["Heading4"] if heading else styles["BodyText"]))
+                if heading and details:
+                    story.append(_paragraph(details, styles["BodyText"]))
+    if document["skills"]:
+        story += [Spacer(1, 4 * mm), _paragraph("Skills", styles["Heading2"]), _paragraph(", ".join(document["skills"]), styles["BodyText"])]
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write next to the target and rename, so readers never see a partial file
+    handle, temporary_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    os.close(handle)
+    try:
+        SimpleDocTemplate(temporary_path, pagesize=A4, title=document["name"]).build(story)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    for name in os.listdir(directory):
+        if name.endswith(".pdf") and os.path.join(directory, name) != path:
+            try:
+                os.unlink(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return path
@@ -0,0 +1,93 @@
+"""
+Ranked applicant lists for business managers.
+
+Each applicant is scored from precomputed profile features: skill overlap
+with the listing (via the skill_bits bitsets from matching.py), profile
+completeness and the referral flags. All applicants of a listing are scored
+in one vectorized pass and the ranking is cached per listing, in the
+default cache every worker shares, until an application or the listing's
+required skills change.
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .matching import unpack_bits
+from .models import JobApplication
+
+DEFAULT_CONFIG = {
+    "WEIGHTS": {
+        "skill_overlap": 0.6,
+        "completeness": 0.25,
+        "can_give_referrals": 0.1,
+        "looking_for_referrals": 0.05,
+    },
+    "CACHE_TIMEOUT": 600, # Upper bound on staleness from profile edits, which do not invalidate
+}
+
+FEATURES = ["skill_overlap", "completeness", "can_give_referrals", "looking_for_referrals"]
+
+_PROFILE = "applicant__user_detailed_professional_profile__"
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "APPLICANT_RANKING", {}))
+    return config
+
+def cache_key(listing_id):
+    return f"applicant_ranking:{listing_id}"
+
+def invalidate_rankings(listing_ids):
+    """Drop the cached rankings now and again on commit, in case a request cached the old data in between."""
+    keys = [cache_key(listing_id) for listing_id in listing_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+def compute_ranking(job_listing):
+    """Score all non-withdrawn applications for a listing, best first."""
+    rows = list(
+        JobApplication.objects.filter(job_listing=job_listing)
+        .exclude(status="WITHDRAWN")
+        .values_list(
+            "pk", f"{_PROFILE}skill_bits", f"{_PROFILE}completeness",
+            f"{_PROFILE}can_give_referrals", f"{_PROFILE}looking_for_referrals",
+        )
+    )
+    if not rows:
+        return []
+
+    width = max([len(bytes(raw or b"")) // 8 for _, raw, *_ in rows] + [len(bytes(job_listing.skill_bits)) // 8, 1])
+    required = unpack_bits(job_listing.skill_bits, width)
+    required_count = int(np.bitwise_count(required).sum())
+    bits = np.vstack([unpack_bits(raw, width) for _, raw, *_ in rows])
+    overlap = np.bitwise_count(bits & required).sum(axis=1)
+
+    # Applicants without a detailed profile get zeros for every profile feature
+    features = np.column_stack([
+        overlap / required_count if required_count else np.zeros(len(rows)),
+        np.array([completeness or 0.0 for _, _, completeness, _, _ in rows]),
+        np.array([bool(can_refer) for *_, can_refer, _ in rows], dtype=float),
+        np.array([bool(looking) for *_, looking in rows], dtype=float),
+    ])
+    weights = get_config()["WEIGHTS"]
+    scores = features @ np.array([weights[name] for name in FEATURES])
+
+    ids = np.array([pk for pk, *_ in rows])
+    order = np.lexsort((ids, -scores)) # Ties go to the earlier application
+    return [
+        {
+            "application_id": int(ids[i]),
+            "score": round(float(scores[i]), 4),
+            "features": {name: round(float(features[i, j]), 4) for j, name in enumerate(FEATURES)},
+        }
+        for i in order
+    ]
+
+def get_ranking(job_listing):
+    key = cache_key(job_listing.pk)
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = compute_ranking(job_listing)
+        cache.set(key, ranking, get_config()["CACHE_TIMEOUT"])
+    return ranking
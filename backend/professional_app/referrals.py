@@ -0,0 +1,83 @@
+"""
+Precomputed referral matches.
+
+A profile with can_give_referrals can refer candidates for every active
+listing of a company in its work history (the ProfileExperienceEntry index
+from experience.py, matched on BusinessProfile.organization_key). Those (business, listing, referrer) triples are kept in
+ReferralMatch so "who can refer me for this listing" is one indexed lookup.
+
+Rows are refreshed per referrer when a profile's work history or referral flag
+changes, and per listing when a listing or its business changes.
+"""
+from django.db import transaction
+
+from .models import BusinessProfile, JobListing, ProfileExperienceEntry, ReferralMatch
+
+def _best_entries(entries):
+    # One entry per (profile, organization): current jobs first, then the earliest listed
+    best = {}
+    for entry in sorted(entries, key=lambda e: (not e.is_current, e.position)):
+        best.setdefault((entry.profile_id, entry.organization), entry)
+    return best.values()
+
+def _referrer_entries(**filters):
+    return ProfileExperienceEntry.objects.filter(
+        kind="WORK", profile__can_give_referrals=True, **filters
+    ).only("profile_id", "organization", "title", "is_current", "position")
+
+def _matches(entries, listings_by_organization):
+    return [
+        ReferralMatch(
+            business_id=listing.posted_by_business_id,
+            listing_id=listing.pk,
+            referrer_id=entry.profile_id,
+            title=entry.title,
+            is_current=entry.is_current,
+        )
+        for entry in _best_entries(entries)
+        for listing in listings_by_organization.get(entry.organization, [])
+    ]
+
+def _active_listings_by_organization(listings):
+    by_organization = {}
+    for listing in listings:
+        by_organization.setdefault(listing.posted_by_business.organization_key, []).append(listing)
+    return by_organization
+
+def refresh_referrers(profile_ids):
+    """Recompute the matches of the given referrer profiles."""
+    profile_ids = list(profile_ids)
+    if not profile_ids:
+        return
+    entries = list(_referrer_entries(profile_id__in=profile_ids).exclude(organization=""))
+    organizations = {entry.organization for entry in entries}
+    businesses = BusinessProfile.objects.filter(organization_key__in=organizations) if organizations else BusinessProfile.objects.none()
+    listings = JobListing.objects.filter(posted_by_business__in=businesses, is_active=True).select_related("posted_by_business")
+    rows = _matches(entries, _active_listings_by_organization(listings))
+    with transaction.atomic():
+        ReferralMatch.objects.filter(referrer_id__in=profile_ids).delete()
+        ReferralMatch.objects.bulk_create(rows)
+
+def refresh_listings(listing_ids):
+    """Recompute the matches of the given listings; inactive or deleted listings end up with none."""
+    listing_ids = list(listing_ids)
+    if not listing_ids:
+        return
+    listings = list(JobListing.objects.filter(pk__in=listing_ids, is_active=True).select_related("posted_by_business"))
+    by_organization = _active_listings_by_organization(listings)
+    entries = list(_referrer_entries(organization__in=list(by_organization))) if by_organization else []
+    rows = _matches(entries, by_organization)
+    with transaction.atomic():
+        ReferralMatch.objects.filter(listing_id__in=listing_ids).delete()
+        ReferralMatch.objects.bulk_create(rows)
+
+def refresh_business(business):
+    refresh_listings(list(business.job_listings.values_list("pk", flat=True)))
+
+def referrers_for(listing):
+    """Referral matches for a listing, current employees first."""
+    return (
+        ReferralMatch.objects.filter(listing=listing)
+        .select_related("referrer__user")
+        .order_by("-is_current", "referrer_id")
+    )
@@ -0,0 +1,98 @@
+"""
+Per-listing application counts by status for the business hiring dashboard.
+
+JobApplicationStatusCount holds one row per (listing, status). Signals adjust
+the counts as applications are created, change status or are deleted, so the
+dashboard reads a handful of rows instead of counting applications. Bulk
+QuerySet.update()/delete() calls skip signals; run rebuild() (or the
+rebuild_application_rollup command) after those.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import JobApplication, JobApplicationStatusCount
+
+def adjust(listing_id, status, delta, business_id=None):
+    """Add delta to the (listing, status) count, creating the row on first increment."""
+    rows = JobApplicationStatusCount.objects.filter(listing_id=listing_id, status=status)
+    if delta < 0:
+        # Never below zero (the column is unsigned): a count that drifted, e.g. after a
+        # bulk delete, stays at zero until rebuild() recounts it
+        rows.filter(count__gte=-delta).update(count=F("count") + delta)
+        return
+    if rows.update(count=F("count") + delta) or delta == 0:
+        return
+    try:
+        with transaction.atomic():
+            JobApplicationStatusCount.objects.create(
+                listing_id=listing_id, business_id=business_id, status=status, count=delta
+            )
+    except IntegrityError:
+        # Created concurrently since the update above
+        rows.update(count=F("count") + delta)
+
+def application_saved(application, created):
+    listing_id, status = application.job_listing_id, application.status
+    original_listing_id, original_status = getattr(application, "_rollup_original", (None, None))
+    if not created and (original_listing_id, original_status) == (listing_id, status):
+        return
+    if not created and original_status is not None:
+        adjust(original_listing_id, original_status, -1)
+    adjust(listing_id, status, 1, business_id=application.job_listing.posted_by_business_id)
+    application._rollup_original = (listing_id, status)
+
+def application_deleted(application):
+    adjust(application.job_listing_id, application.status, -1)
+
+def dashboard(business):
+    """Per-listing status counts for a business, from one query over the rollup table."""
+    listings, totals = {}, {}
+    rows = (
+        JobApplicationStatusCount.objects.filter(business=business, count__gt=0)
+        .select_related("listing")
+        .order_by("-listing__posted_at", "listing_id")
+    )
+    for row in rows:
+        entry = listings.setdefault(row.listing_id, {
+            "listing_id": row.listing_id,
+            "title": row.listing.title,
+            "is_active": row.listing.is_active,
+            "total": 0,
+            "counts": {},
+        })
+        entry["counts"][row.status] = row.count
+        entry["total"] += row.count
+        totals[row.status] = totals.get(row.status, 0) + row.count
+    return {
+        "business_id": business.pk,
+        "total": sum(totals.values()),
+        "totals": totals,
+        "listings": list(listings.values()),
+    }
+
+def rebuild(listing_ids=None):
+    """Recount from the applications table, for all listings or the given ones."""
+    applications = JobApplication.objects.all()
+    if listing_ids is not None:
+        applications = applications.filter(job_listing_id__in=listing_ids)
+    counts = (
+        applications.values("job_listing_id", "job_listing__posted_by_business_id", "status")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    rows = [
+        JobApplicationStatusCount(
+            listing_id=row["job_listing_id"],
+            business_id=row["job_listing__posted_by_business_id"],
+            status=row["status"],
+            count=row["total"],
+        )
+        for row in counts
+    ]
+    with transaction.atomic():
+        existing = JobApplicationStatusCount.objects.all()
+        if listing_ids is not None:
+            existing = existing.filter(listing_id__in=listing_ids)
+        existing.delete()
+        JobApplicationStatusCount.objects.bulk_create(rows)
+    return len(rows)
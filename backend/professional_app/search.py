@@ -0,0 +1,274 @@
+"""
+Full-text search for job listings.
+
+SQLite uses an FTS5 virtual table ranked with bm25(); PostgreSQL uses a side
+table holding a weighted tsvector behind a GIN index, ranked with ts_rank_cd().
+Any other backend (or SQLite built without FTS5) falls back to the original
+icontains filters. The index is created by migration 0002 and kept in sync by
+the receivers in professional_app/signals.py.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import JobListing
+
+FTS_TABLE = "professional_app_joblisting_fts"
+PG_TABLE = "professional_app_joblisting_search"
+LISTING_TABLE = JobListing._meta.db_table
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+def _tokens(text):
+    return _TOKEN.findall((text or "").lower())
+
+def _skills_text(listing):
+    return " ".join(skill.name for skill in listing.required_skills.all())
+
+def _listings_for_index(listing_ids):
+    return (
+        JobListing.objects.filter(pk__in=listing_ids)
+        .select_related("posted_by_business")
+        .prefetch_related("required_skills")
+    )
+
+class IContainsSearchBackend:
+    """Unindexed fallback matching the original JobListingViewSet filters."""
+    vendor = None
+
+    def is_available(self):
+        return True
+
+    def create_index(self, schema_editor):
+        pass
+
+    def drop_index(self, schema_editor):
+        pass
+
+    def rebuild_statements(self):
+        return []
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            for statement in self.rebuild_statements():
+                cursor.execute(statement)
+
+    def index(self, listing_ids):
+        pass
+
+    def remove(self, listing_ids):
+        pass
+
+    def search(self, queryset, keyword=None, location=None, company=None):
+        for term in _tokens(keyword):
+            queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+        if company:
+            queryset = queryset.filter(posted_by_business__company_name__icontains=company)
+        return queryset
+
+class SQLiteFTS5SearchBackend(IContainsSearchBackend):
+    vendor = "sqlite"
+    # bm25 column weights, in table column order: title, description, company, location, skills
+    BM25_WEIGHTS = (10.0, 1.0, 4.0, 0.5, 5.0)
+
+    def is_available(self):
+        return FTS_TABLE in connection.introspection.table_names()
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "title, description, company, location, skills, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def rebuild_statements(self):
+        return [
+            f"DELETE FROM {FTS_TABLE}",
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, company, location, skills) "
+            "SELECT jl.id, jl.title, jl.description, bp.company_name, jl.location, "
+            "COALESCE((SELECT group_concat(s.name, ' ') "
+            "FROM professional_app_joblisting_required_skills rs "
+            "JOIN professional_app_skill s ON s.id = rs.skill_id "
+            "WHERE rs.joblisting_id = jl.id), '') "
+            "FROM professional_app_joblisting jl "
+            "JOIN professional_app_businessprofile bp ON bp.id = jl.posted_by_business_id",
+        ]
+
+    def index(self, listing_ids):
+        listings = list(_listings_for_index(listing_ids))
+        rows = [
+            (l.pk, l.title, l.description, l.posted_by_business.company_name, l.location, _skills_text(l))
+            for l in listings
+        ]
+        with connection.cursor() as cursor:
+            self._delete(cursor, listing_ids)
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, company, location, skills) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, listing_ids):
+        with connection.cursor() as cursor:
+            self._delete(cursor, listing_ids)
+
+    def _delete(self, cursor, listing_ids):
+        listing_ids = list(listing_ids)
+        if listing_ids:
+            placeholders = ", ".join(["%s"] * len(listing_ids))
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", listing_ids)
+
+    def _match_expression(self, keyword, location, company):
+        clauses = []
+        # Every token is a quoted prefix query, so user input can never inject FTS5 syntax
+        keyword_terms = " ".join(f'"{t}"*' for t in _tokens(keyword))
+        if keyword_terms:
+            clauses.append(f"{{title description company skills}} : ({keyword_terms})")
+        location_terms = " ".join(f'"{t}"*' for t in _tokens(location))
+        if location_terms:
+            clauses.append(f"location : ({location_terms})")
+        company_terms = " ".join(f'"{t}"*' for t in _tokens(company))
+        if company_terms:
+            clauses.append(f"company : ({company_terms})")
+        return " AND ".join(clauses)
+
+    def search(self, queryset, keyword=None, location=None, company=None):
+        match = self._match_expression(keyword, location, company)
+        if not match:
+            return queryset
+        weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+        return queryset.extra(
+            select={"search_rank": f"bm25({FTS_TABLE}, {weights})"},
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE} MATCH %s", f"{FTS_TABLE}.rowid = {LISTING_TABLE}.id"],
+            params=[match],
+        ).order_by("search_rank", "-posted_at") # bm25() is lower-is-better
+
+class PostgresSearchBackend(IContainsSearchBackend):
+    vendor = "postgresql"
+    # setweight labels per field; location gets its own label so it can be filtered on alone
+    DOCUMENT_SQL = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C') || "
+        "setweight(to_tsvector('simple', %s), 'D')"
+    )
+
+    def is_available(self):
+        return PG_TABLE in connection.introspection.table_names()
+
+    def create_index(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            f"listing_id bigint PRIMARY KEY REFERENCES {LISTING_TABLE}(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "company tsvector NOT NULL, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_gin ON {PG_TABLE} USING GIN (document)")
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_company_gin ON {PG_TABLE} USING GIN (company)")
+
+    def drop_index(self, schema_editor):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {PG_TABLE}")
+
+    def rebuild_statements(self):
+        document = self.DOCUMENT_SQL % ("jl.title", "bp.company_name", "sk.names", "jl.location", "jl.description")
+        return [
+            f"DELETE FROM {PG_TABLE}",
+            f"INSERT INTO {PG_TABLE} (listing_id, company, document) "
+            f"SELECT jl.id, to_tsvector('simple', bp.company_name), {document} "
+            "FROM professional_app_joblisting jl "
+            "JOIN professional_app_businessprofile bp ON bp.id = jl.posted_by_business_id "
+            "LEFT JOIN LATERAL (SELECT COALESCE(string_agg(s.name, ' '), '') AS names "
+            "FROM professional_app_joblisting_required_skills rs "
+            "JOIN professional_app_skill s ON s.id = rs.skill_id "
+            "WHERE rs.joblisting_id = jl.id) sk ON TRUE",
+        ]
+
+    def index(self, listing_ids):
+        listings = list(_listings_for_index(listing_ids))
+        with connection.cursor() as cursor:
+            for l in listings:
+                company = l.posted_by_business.company_name
+                cursor.execute(
+                    f"INSERT INTO {PG_TABLE} (listing_id, company, document) "
+                    f"VALUES (%s, to_tsvector('simple', %s), {self.DOCUMENT_SQL}) "
+                    "ON CONFLICT (listing_id) DO UPDATE SET company = EXCLUDED.company, document = EXCLUDED.document",
+                    [l.pk, company, l.title, company, _skills_text(l), l.location, l.description],
+                )
+
+    def remove(self, listing_ids):
+        listing_ids = list(listing_ids)
+        if listing_ids:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {PG_TABLE} WHERE listing_id = ANY(%s)", [listing_ids])
+
+    def _tsquery(self, text, weights=""):
+        return " & ".join(f"{t}:*{weights}" for t in _tokens(text))
+
+    def search(self, queryset, keyword=None, location=None, company=None):
+        where, params = [], []
+        keyword_query = self._tsquery(keyword, "ABD")
+        location_query = self._tsquery(location, "C")
+        document_query = " & ".join(q for q in (keyword_query, location_query) if q)
+        if document_query:
+            where.append(f"{PG_TABLE}.document @@ to_tsquery('simple', %s)")
+            params.append(document_query)
+        company_query = self._tsquery(company)
+        if company_query:
+            where.append(f"{PG_TABLE}.company @@ to_tsquery('simple', %s)")
+            params.append(company_query)
+        if not where:
+            return queryset
+        queryset = queryset.extra(
+            tables=[PG_TABLE],
+            where=[f"{PG_TABLE}.listing_id = {LISTING_TABLE}.id"] + where,
+            params=params,
+        )
+        if not document_query:
+            return queryset
+        return queryset.extra(
+            select={"search_rank": f"ts_rank_cd({PG_TABLE}.document, to_tsquery('simple', %s))"},
+            select_params=[document_query],
+        ).order_by("-search_rank", "-posted_at")
+
+_BACKENDS = {
+    "sqlite": SQLiteFTS5SearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+def backend_for_vendor(vendor):
+    return _BACKENDS.get(vendor, IContainsSearchBackend)()
+
+_fallback = IContainsSearchBackend()
+_available = {}
+
+def get_backend():
+    """Return the search backend for the default connection, falling back to icontains."""
+    if connection.vendor not in _BACKENDS:
+        return _fallback
+    if connection.vendor not in _available:
+        backend = backend_for_vendor(connection.vendor)
+        _available[connection.vendor] = backend if backend.is_available() else None
+    return _available[connection.vendor] or _fallback
+
+def reset_backend_cache():
+    _available.clear()
+
+def search_job_listings(queryset, keyword=None, location=None, company=None):
+    return get_backend().search(queryset, keyword=keyword, location=location, company=company)
+
+def index_job_listings(listing_ids):
+    get_backend().index(listing_ids)
+
+def remove_job_listings(listing_ids):
+    get_backend().remove(listing_ids)
+
+def rebuild_job_listing_index():
+    get_backend().rebuild()
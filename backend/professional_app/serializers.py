@@ -3,20 +3,22 @@ from .models import (
     Skill, ProfessionalProfile, BusinessProfile, JobListing, 
     JobApplication, FundingOpportunity, FundingRequest, ProfessionalFeedPost
 )
-from users.serializers import LightUserSerializer # Ensure this import is correct and LightUserSerializer is defined in users.serializers
+from users.cards import UserCardField
 from django.conf import settings
+from minara_backend.fieldsets import SparseFieldsetsMixin
+from minara_backend.fields import BulkPrimaryKeyRelatedField
 
 User = settings.AUTH_USER_MODEL
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = ["id", "name"]
 
-class ProfessionalProfileSerializer(serializers.ModelSerializer):
-    user = LightUserSerializer(read_only=True)
+class ProfessionalProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    user = UserCardField()
     skills = SkillSerializer(many=True, read_only=True)
-    skill_ids = serializers.PrimaryKeyRelatedField(
+    skill_ids = BulkPrimaryKeyRelatedField(
         many=True, queryset=Skill.objects.all(), source="skills", write_only=True, required=False
     )
 
@@ -35,7 +37,9 @@ class ProfessionalProfileSerializer(serializers.ModelSerializer):
         validated_data["user"] = self.context["request"].user
         # Handle M2M for skills if skill_ids are passed
         skills_data = validated_data.pop("skills", None)
-        profile = ProfessionalProfile.objects.create(**validated_data)
+        # Every user already has a profile (created with the user), so "create" fills it in
+        user = validated_data.pop("user")
+        profile, created = ProfessionalProfile.objects.update_or_create(user=user, defaults=validated_data)
         if skills_data:
             profile.skills.set(skills_data)
         return profile
@@ -46,8 +50,8 @@ class ProfessionalProfileSerializer(serializers.ModelSerializer):
             instance.skills.set(validated_data.pop("skills"))
         return super().update(instance, validated_data)
 
-class BusinessProfileSerializer(serializers.ModelSerializer):
-    user_manager = LightUserSerializer(read_only=True)
+class BusinessProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    user_manager = UserCardField()
 
     class Meta:
         model = BusinessProfile
@@ -62,13 +66,13 @@ class BusinessProfileSerializer(serializers.ModelSerializer):
         validated_data["user_manager"] = self.context["request"].user
         return super().create(validated_data)
 
-class JobListingSerializer(serializers.ModelSerializer):
+class JobListingSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     posted_by_business = BusinessProfileSerializer(read_only=True)
     posted_by_business_id = serializers.PrimaryKeyRelatedField(
         queryset=BusinessProfile.objects.all(), source="posted_by_business", write_only=True
     )
     required_skills = SkillSerializer(many=True, read_only=True)
-    required_skill_ids = serializers.PrimaryKeyRelatedField(
+    required_skill_ids = BulkPrimaryKeyRelatedField(
         many=True, queryset=Skill.objects.all(), source="required_skills", write_only=True, required=False
     )
     company_name = serializers.CharField(source="posted_by_business.company_name", read_only=True)
@@ -99,8 +103,41 @@ class JobListingSerializer(serializers.ModelSerializer):
             instance.required_skills.set(validated_data.pop("required_skills"))
         return super().update(instance, validated_data)
 
-class JobApplicationSerializer(serializers.ModelSerializer):
-    applicant = LightUserSerializer(read_only=True)
+class SkillNamesField(serializers.Field):
+    """Skill names as a list or a comma-separated string (CSV imports), stripped and de-duplicated."""
+    default_error_messages = {
+        "invalid": "Expected a list of skill names or a comma-separated string.",
+        "max_length": "Skill names can be at most {max_length} characters.",
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = data.split(",")
+        if not isinstance(data, (list, tuple)) or not all(isinstance(name, str) for name in data):
+            self.fail("invalid")
+        names = {}
+        max_length = Skill._meta.get_field("name").max_length
+        for name in data:
+            name = " ".join(name.split())
+            if len(name) > max_length:
+                self.fail("max_length", max_length=max_length)
+            if name:
+                names.setdefault(name.lower(), name)
+        return list(names.values())
+
+    def to_representation(self, value):
+        return value
+
+class JobListingImportRowSerializer(serializers.ModelSerializer):
+    """Validates one row of a bulk job listing import (see professional_app/bulk_import.py)."""
+    skills = SkillNamesField(required=False, default=list)
+
+    class Meta:
+        model = JobListing
+        fields = ["title", "description", "location", "employment_type", "is_active", "skills"]
+
+class JobApplicationSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    applicant = UserCardField()
     job_listing_title = serializers.CharField(source="job_listing.title", read_only=True)
 
     class Meta:
@@ -114,7 +151,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"detail": "You have already applied for this job."})        
         return super().create(validated_data)
 
-class FundingOpportunitySerializer(serializers.ModelSerializer):
+class FundingOpportunitySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     posted_by_business = BusinessProfileSerializer(read_only=True)
     posted_by_business_id = serializers.PrimaryKeyRelatedField(
         queryset=BusinessProfile.objects.all(), source="posted_by_business", write_only=True
@@ -125,7 +162,7 @@ class FundingOpportunitySerializer(serializers.ModelSerializer):
         model = FundingOpportunity
         fields = [
             "id", "posted_by_business", "posted_by_business_id", "company_name", "title", "description", 
-            "funding_amount_range", "eligibility_criteria", "is_active", "posted_at"
+            "funding_amount_range", "funding_min", "funding_max", "eligibility_criteria", "is_active", "posted_at"
         ]
         read_only_fields = ["id", "posted_by_business", "posted_at", "company_name"]
 
@@ -134,7 +171,7 @@ class FundingOpportunitySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You do not have permission to post funding opportunities for this business.")
         return value
 
-class FundingRequestSerializer(serializers.ModelSerializer):
+class FundingRequestSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     requested_by_business = BusinessProfileSerializer(read_only=True)
     requested_by_business_id = serializers.PrimaryKeyRelatedField(
         queryset=BusinessProfile.objects.all(), source="requested_by_business", write_only=True
@@ -145,7 +182,7 @@ class FundingRequestSerializer(serializers.ModelSerializer):
         model = FundingRequest
         fields = [
             "id", "requested_by_business", "requested_by_business_id", "company_name", "title", "description", 
-            "funding_amount_sought", "business_plan_url", "is_active", "requested_at"
+            "funding_amount_sought", "funding_min", "funding_max", "business_plan_url", "is_active", "requested_at"
         ]
         read_only_fields = ["id", "requested_by_business", "requested_at", "company_name"]
 
@@ -154,8 +191,8 @@ class FundingRequestSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You do not have permission to post funding requests for this business.")
         return value
 
-class ProfessionalFeedPostSerializer(serializers.ModelSerializer):
-    author = LightUserSerializer(read_only=True)
+class ProfessionalFeedPostSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    author = UserCardField()
 
     class Meta:
         model = ProfessionalFeedPost
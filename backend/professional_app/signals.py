@@ -0,0 +1,238 @@
+from django.db.models.signals import post_init, pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.conf import settings
+from django.dispatch import receiver
+
+from .models import (
+    Skill, ProfessionalProfile, BusinessProfile, JobListing, JobApplication, JobApplicationStatusCount,
+    FundingOpportunity, FundingRequest, ProfessionalFeedPost,
+)
+from users.models import ProfessionalProfile as CoreProfessionalProfile
+from users import profile_cache
+from users.provisioning import users_provisioned
+from minara_backend import response_cache, trie
+from . import search, matching, ranking, mentorship, experience, referrals, rollup
+
+# Job search index (professional_app/search.py)
+@receiver(post_save, sender=JobListing)
+def index_saved_job_listing(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_job_listings([instance.pk])
+
+@receiver(m2m_changed, sender=JobListing.required_skills.through)
+def index_job_listing_skills(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            search.index_job_listings([instance.pk])
+        return
+    # Reverse side: instance is a Skill and pk_set holds the affected listings
+    if action == "pre_clear":
+        instance._cleared_job_listing_ids = list(instance.job_listings.values_list("pk", flat=True))
+    elif action == "post_clear":
+        search.index_job_listings(getattr(instance, "_cleared_job_listing_ids", []))
+    elif action in ("post_add", "post_remove") and pk_set:
+        search.index_job_listings(pk_set)
+
+@receiver(post_delete, sender=JobListing)
+def remove_deleted_job_listing(sender, instance, **kwargs):
+    search.remove_job_listings([instance.pk])
+
+@receiver(post_save, sender=BusinessProfile)
+def reindex_business_job_listings(sender, instance, created, raw=False, **kwargs):
+    # Listings carry the company name in their search document
+    if not created and not raw:
+        search.index_job_listings(list(instance.job_listings.values_list("pk", flat=True)))
+
+@receiver(post_save, sender=Skill)
+def reindex_skill_job_listings(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.index_job_listings(list(instance.job_listings.values_list("pk", flat=True)))
+
+# Skill bitsets for matching (professional_app/matching.py)
+# through model -> (owner model, reverse accessor on Skill)
+SKILL_OWNERS = {
+    ProfessionalProfile.skills.through: (ProfessionalProfile, "professional_profiles"),
+    JobListing.required_skills.through: (JobListing, "job_listings"),
+}
+
+def skills_changed(owner_model, owner_ids):
+    matching.refresh_skill_bits(owner_model, owner_ids)
+    if owner_model is JobListing:
+        ranking.invalidate_rankings(owner_ids)
+    else:
+        invalidate_cached_profiles(owner_ids)
+
+@receiver(m2m_changed, sender=ProfessionalProfile.skills.through)
+@receiver(m2m_changed, sender=JobListing.required_skills.through)
+def refresh_skill_bits(sender, instance, action, reverse, pk_set, **kwargs):
+    owner_model, skill_accessor = SKILL_OWNERS[sender]
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            skills_changed(owner_model, [instance.pk])
+        return
+    # Reverse side: instance is a Skill and pk_set holds profile or listing ids
+    if action == "pre_clear":
+        instance._cleared_skill_owner_ids = list(getattr(instance, skill_accessor).values_list("pk", flat=True))
+    elif action == "post_clear":
+        skills_changed(owner_model, getattr(instance, "_cleared_skill_owner_ids", []))
+    elif action in ("post_add", "post_remove") and pk_set:
+        skills_changed(owner_model, pk_set)
+
+@receiver(pre_delete, sender=Skill)
+def collect_skill_owners(sender, instance, **kwargs):
+    # Deleting a skill cascades through the M2M tables without sending m2m_changed
+    instance._skill_owner_ids = {
+        ProfessionalProfile: list(instance.professional_profiles.values_list("pk", flat=True)),
+        JobListing: list(instance.job_listings.values_list("pk", flat=True)),
+    }
+
+@receiver(post_delete, sender=Skill)
+def refresh_deleted_skill_owners(sender, instance, **kwargs):
+    for owner_model, owner_ids in getattr(instance, "_skill_owner_ids", {}).items():
+        skills_changed(owner_model, owner_ids)
+        if owner_model is JobListing:
+            # Drop the deleted skill's name from the listings' search documents
+            search.index_job_listings(owner_ids)
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+@receiver(post_delete, sender=ProfessionalProfile)
+def invalidate_skill_matrix(sender, instance, raw=False, **kwargs):
+    # Covers listings being (de)activated and rows disappearing
+    if not raw:
+        matching.MATRICES[sender].invalidate([instance.pk])
+
+# Applicant rankings (professional_app/ranking.py)
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def invalidate_applicant_ranking(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ranking.invalidate_rankings([instance.job_listing_id])
+
+# Mentor/mentee profession index (professional_app/mentorship.py)
+@receiver(post_save, sender=ProfessionalProfile)
+@receiver(post_save, sender=CoreProfessionalProfile)
+def index_mentorship_professions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mentorship.sync_profile(instance)
+
+@receiver(post_delete, sender=ProfessionalProfile)
+@receiver(post_delete, sender=CoreProfessionalProfile)
+def remove_mentorship_professions(sender, instance, **kwargs):
+    mentorship.remove_profile(instance)
+
+# Work experience and education index (professional_app/experience.py); rows cascade on delete
+@receiver(post_save, sender=ProfessionalProfile)
+def index_profile_experience(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & set(experience.PROFILE_FIELDS)):
+        return
+    experience.sync_profile(instance)
+
+# Referral matches (professional_app/referrals.py); runs after the experience index is synced
+REFERRER_FIELDS = set(experience.PROFILE_FIELDS) | {"can_give_referrals"}
+
+@receiver(post_save, sender=ProfessionalProfile)
+def refresh_profile_referral_matches(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(update_fields) & REFERRER_FIELDS):
+        return
+    referrals.refresh_referrers([instance.pk])
+
+@receiver(post_save, sender=JobListing)
+def refresh_listing_referral_matches(sender, instance, raw=False, **kwargs):
+    if not raw:
+        referrals.refresh_listings([instance.pk])
+
+@receiver(post_save, sender=BusinessProfile)
+def refresh_business_referral_matches(sender, instance, created, raw=False, **kwargs):
+    # The company name decides which work histories match
+    if not created and not raw:
+        referrals.refresh_business(instance)
+
+# Application status rollup for the hiring dashboard (professional_app/rollup.py)
+@receiver(post_init, sender=JobApplication)
+def remember_application_status(sender, instance, **kwargs):
+    # Read __dict__ so deferred fields are not loaded
+    instance._rollup_original = (instance.__dict__.get("job_listing_id"), instance.__dict__.get("status"))
+
+@receiver(pre_save, sender=JobApplication)
+def load_deferred_application_status(sender, instance, raw=False, **kwargs):
+    # Instances loaded with only()/defer() never saw their original status; read it before it is overwritten
+    if not raw and not instance._state.adding and None in instance._rollup_original:
+        original = sender.objects.filter(pk=instance.pk).values_list("job_listing_id", "status").first()
+        instance._rollup_original = original or (None, None)
+
+@receiver(post_save, sender=JobApplication)
+def count_saved_application(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        rollup.application_saved(instance, created)
+
+@receiver(post_delete, sender=JobApplication)
+def count_deleted_application(sender, instance, **kwargs):
+    rollup.application_deleted(instance)
+
+@receiver(post_save, sender=JobListing)
+def move_listing_rollup(sender, instance, created, raw=False, **kwargs):
+    # A listing can be reassigned to another business
+    if not created and not raw:
+        JobApplicationStatusCount.objects.filter(listing=instance).exclude(
+            business_id=instance.posted_by_business_id
+        ).update(business_id=instance.posted_by_business_id)
+
+# Profiles exist from registration on, so "my profile" reads never have to create them
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_detailed_professional_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ProfessionalProfile.objects.create(user=instance)
+
+@receiver(users_provisioned)
+def create_provisioned_professional_profiles(sender, user_ids, **kwargs):
+    # Bulk-provisioned users are created without post_save
+    ProfessionalProfile.objects.bulk_create([ProfessionalProfile(user_id=user_id) for user_id in user_ids])
+
+# Cached "my profile" representations (users/profile_cache.py)
+def invalidate_cached_profiles(profile_ids):
+    user_ids = ProfessionalProfile.objects.filter(pk__in=profile_ids).values_list("user_id", flat=True)
+    profile_cache.invalidate(ProfessionalProfile, list(user_ids))
+
+@receiver(post_save, sender=ProfessionalProfile)
+@receiver(post_delete, sender=ProfessionalProfile)
+def invalidate_cached_professional_profile(sender, instance, **kwargs):
+    profile_cache.invalidate(ProfessionalProfile, [instance.user_id])
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_profile_user(sender, instance, created, update_fields=None, **kwargs):
+    # The representation nests the user's email and phone number
+    if not created and set(update_fields or ["*"]) != {"last_login"}:
+        profile_cache.invalidate(ProfessionalProfile, [instance.pk])
+
+@receiver(post_save, sender=Skill)
+def invalidate_skill_profiles(sender, instance, created, raw=False, **kwargs):
+    # Renamed skills are nested in profile representations
+    if not created and not raw:
+        invalidate_cached_profiles(list(instance.professional_profiles.values_list("pk", flat=True)))
+
+# Skill autocomplete (minara_backend/trie.py)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def bump_skill_vocabulary(sender, **kwargs):
+    trie.bump_version(Skill)
+
+# Cached listing and feed responses (minara_backend/response_cache.py)
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+@receiver(post_save, sender=BusinessProfile)
+@receiver(post_delete, sender=BusinessProfile)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=FundingOpportunity)
+@receiver(post_delete, sender=FundingOpportunity)
+@receiver(post_save, sender=FundingRequest)
+@receiver(post_delete, sender=FundingRequest)
+@receiver(post_save, sender=ProfessionalFeedPost)
+@receiver(post_delete, sender=ProfessionalFeedPost)
+def bump_response_cache_version(sender, **kwargs):
+    response_cache.bump_versions(sender)
+
+@receiver(m2m_changed, sender=JobListing.required_skills.through)
+def bump_job_listing_response_cache_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        response_cache.bump_versions(JobListing)
@@ -1,3 +1,1093 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import zipfile
+from concurrent.futures import Future
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from minara_backend import trie
+from minara_backend.fieldsets import EXPAND_ALL, parse_field_paths
+
+from users.models import ProfessionalProfile as CoreProfessionalProfile
+
+from . import bulk_import, experience, funding, linkedin, linkedin_export, matching, mentorship, pdf, ranking, referrals, rollup, search
+from .models import (
+    Skill, ProfessionalProfile, BusinessProfile, JobListing, JobApplicationStatusCount,
+    JobApplication, FundingOpportunity, FundingRequest, ProfessionalFeedPost, MentorshipProfession,
+    ProfileExperienceEntry,
+)
+
+User = get_user_model()
+
+
+class ListQueryCountTests(APITestCase):
+    """List endpoints must issue the same number of queries whatever the page size."""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(email="manager@example.com", phone_number="100", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=self.manager, company_name="Acme")
+        self.skills = [Skill.objects.create(name=f"Skill {i}") for i in range(3)]
+        self.client.force_authenticate(self.manager)
+        self.counter = 0
+
+    def new_user(self):
+        self.counter += 1
+        return User.objects.create_user(email=f"user{self.counter}@example.com", phone_number=f"2{self.counter}", password=None)
+
+    def new_listing(self):
+        listing = JobListing.objects.create(posted_by_business=self.business, title="Engineer", description="Build things")
+        listing.required_skills.set(self.skills)
+        return listing
+
+    def new_profile(self):
+        profile = ProfessionalProfile.objects.get(user=self.new_user()) # Created with the user
+        profile.headline = "Engineer"
+        profile.save()
+        profile.skills.set(self.skills)
+
+    def new_business(self):
+        BusinessProfile.objects.create(user_manager=self.new_user(), company_name=f"Business {self.counter}")
+
+    def new_application(self):
+        JobApplication.objects.create(applicant=self.new_user(), job_listing=self.new_listing())
+
+    def new_opportunity(self):
+        business = BusinessProfile.objects.create(user_manager=self.new_user(), company_name=f"Fund {self.counter}")
+        FundingOpportunity.objects.create(posted_by_business=business, title="Seed", description="Seed round")
+
+    def new_funding_request(self):
+        business = BusinessProfile.objects.create(user_manager=self.new_user(), company_name=f"Startup {self.counter}")
+        FundingRequest.objects.create(requested_by_business=business, title="Seed", description="Raising")
+
+    def new_feed_post(self):
+        ProfessionalFeedPost.objects.create(author=self.new_user(), content="Hello")
+
+    def query_count(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), len(response.data["results"])
+
+    def assertConstantQueries(self, url, make_item):
+        make_item()
+        few_queries, few_rows = self.query_count(url)
+        for _ in range(7):
+            make_item()
+        many_queries, many_rows = self.query_count(url)
+        self.assertGreater(many_rows, few_rows)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_professional_profiles(self):
+        self.assertConstantQueries("/api/professional/profiles/professional/", self.new_profile)
+
+    def test_business_profiles(self):
+        self.assertConstantQueries("/api/professional/profiles/business/", self.new_business)
+
+    def test_job_listings(self):
+        self.assertConstantQueries("/api/professional/jobs/listings/", self.new_listing)
+
+    def test_job_listing_search(self):
+        self.assertConstantQueries("/api/professional/jobs/listings/?keyword=engineer", self.new_listing)
+
+    def test_job_applications(self):
+        self.assertConstantQueries("/api/professional/jobs/applications/", self.new_application)
+
+    def test_funding_opportunities(self):
+        self.assertConstantQueries("/api/professional/funding/opportunities/", self.new_opportunity)
+
+    def test_funding_requests(self):
+        self.assertConstantQueries("/api/professional/funding/requests/", self.new_funding_request)
+
+    def test_professional_feed(self):
+        self.assertConstantQueries("/api/professional/feed/professional/", self.new_feed_post)
+
+    def test_job_listing_detail_permission_check_is_joined(self):
+        listing = self.new_listing()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(f"/api/professional/jobs/listings/{listing.pk}/", {"title": "Senior Engineer"})
+        self.assertEqual(response.status_code, 200)
+        # The object permission check must not lazily load posted_by_business.user_manager
+        business_loads = [q for q in context.captured_queries if 'FROM "professional_app_businessprofile"' in q["sql"]]
+        self.assertEqual(business_loads, [])
+
+
+class BulkRelatedIdsTests(APITestCase):
+    """skill_ids and required_skill_ids are validated with one query, whatever their length."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="owner@example.com", phone_number="300", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=self.user, company_name="Acme")
+        self.skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(50)])
+        self.client.force_authenticate(self.user)
+
+    def skill_id_lookups(self, context):
+        # Validation queries filter the skill table by id; saving and rendering go through the M2M table
+        return [q for q in context.captured_queries if 'WHERE "professional_app_skill"."id"' in q["sql"]]
+
+    def test_profile_skill_ids_use_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/professional/profiles/professional/",
+                {"headline": "Engineer", "skill_ids": [skill.pk for skill in self.skills]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ProfessionalProfile.objects.get(user=self.user).skills.count(), 50)
+        self.assertEqual(len(self.skill_id_lookups(context)), 1)
+
+    def test_missing_ids_are_reported_together(self):
+        listing = JobListing.objects.create(posted_by_business=self.business, title="Engineer", description="Build things")
+        response = self.client.patch(
+            f"/api/professional/jobs/listings/{listing.pk}/",
+            {"required_skill_ids": [self.skills[0].pk, 99998, 99999, "x"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["required_skill_ids"]), 1) # Malformed ids are reported first
+
+        response = self.client.patch(
+            f"/api/professional/jobs/listings/{listing.pk}/",
+            {"required_skill_ids": [self.skills[0].pk, 99998, 99999]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["required_skill_ids"]), 2)
+        self.assertIn("99999", str(response.data["required_skill_ids"][1]))
+
+
+class JobSearchTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(email="hiring@example.com", phone_number="400", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=self.manager, company_name="Acme")
+        search.reset_backend_cache()
+
+    def listing(self, title, description, skills=()):
+        listing = JobListing.objects.create(posted_by_business=self.business, title=title, description=description)
+        listing.required_skills.set(skills)
+        return listing
+
+    def search(self, **filters):
+        return list(search.search_job_listings(JobListing.objects.all(), **filters))
+
+    def test_title_match_outranks_description_match(self):
+        in_description = self.listing("Analyst", "Works alongside the gardener on the estate")
+        in_title = self.listing("Gardener", "Tends the estate grounds")
+        self.listing("Cook", "Runs the kitchen")
+        self.assertEqual(self.search(keyword="garden"), [in_title, in_description])
+
+    def test_company_and_location_filters(self):
+        listing = self.listing("Baker", "Bread")
+        listing.location = "Lagos"
+        listing.save()
+        self.assertEqual(self.search(keyword="baker", location="lag"), [listing])
+        self.assertEqual(self.search(keyword="baker", location="abuja"), [])
+        self.assertEqual(self.search(company="acm"), [listing])
+
+    def test_skill_rename_and_delete_reindex_listings(self):
+        skill = Skill.objects.create(name="Carpentry")
+        listing = self.listing("Builder", "Site work", [skill])
+        self.assertEqual(self.search(keyword="carpentry"), [listing])
+        skill.name = "Joinery"
+        skill.save()
+        self.assertEqual(self.search(keyword="carpentry"), [])
+        self.assertEqual(self.search(keyword="joinery"), [listing])
+        skill.delete()
+        self.assertEqual(self.search(keyword="joinery"), [])
+
+    def test_company_rename_reindexes_listings(self):
+        listing = self.listing("Welder", "Metal work")
+        self.business.company_name = "Globex"
+        self.business.save()
+        self.assertEqual(self.search(company="globex"), [listing])
+        self.assertEqual(self.search(company="acme"), [])
+
+
+class SkillMatchingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for matrix in matching.MATRICES.values():
+            matrix._loaded_version = None
+        self.skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(130)]) # Ids span three words
+        manager = User.objects.create_user(email="talent@example.com", phone_number="500", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=manager, company_name="Acme")
+        self.counter = 0
+
+    def profile(self, skills):
+        self.counter += 1
+        user = User.objects.create_user(email=f"pro{self.counter}@example.com", phone_number=f"5{self.counter}", password=None)
+        profile = ProfessionalProfile.objects.get(user=user)
+        profile.skills.set(skills)
+        profile.refresh_from_db()
+        return profile
+
+    def listing(self, skills, **fields):
+        listing = JobListing.objects.create(posted_by_business=self.business, title="Engineer", description="Build", **fields)
+        listing.required_skills.set(skills)
+        listing.refresh_from_db()
+        return listing
+
+    def test_pack_skill_ids(self):
+        bits = matching.pack_skill_ids([0, 65, 129])
+        self.assertEqual(len(bits), 24)
+        self.assertEqual(list(matching.unpack_bits(bits, 3)), [1, 2, 2])
+        self.assertEqual(matching.pack_skill_ids([]), b"")
+
+    def test_jobs_ranked_by_covered_requirements(self):
+        s = self.skills
+        profile = self.profile([s[0], s[64], s[129]])
+        full = self.listing([s[0], s[129]])
+        half = self.listing([s[64], s[100]])
+        third = self.listing([s[0], s[1], s[2]])
+        self.listing([s[5]])
+        self.listing([s[0]], is_active=False)
+        results, cursor = matching.match_jobs_for_profile(profile)
+        self.assertIsNone(cursor)
+        self.assertEqual([(pk, round(score, 2), overlap) for pk, score, overlap in results], [
+            (full.pk, 1.0, 2), (half.pk, 0.5, 1), (third.pk, 0.33, 1),
+        ])
+
+    def test_profiles_ranked_for_listing_and_paged(self):
+        s = self.skills
+        listing = self.listing([s[0], s[1], s[70], s[128]])
+        profiles = [self.profile(s[:count]) for count in (1, 2)] + [self.profile([s[0], s[1], s[70], s[128], s[3]])]
+        self.profile([s[9]])
+        first, cursor = matching.match_profiles_for_listing(listing, page_size=2)
+        self.assertEqual([(pk, score) for pk, score, _ in first], [(profiles[2].pk, 1.0), (profiles[1].pk, 0.5)])
+        rest, cursor = matching.match_profiles_for_listing(listing, cursor=cursor, page_size=2)
+        self.assertEqual([(pk, score) for pk, score, _ in rest], [(profiles[0].pk, 0.25)])
+        self.assertIsNone(cursor)
+
+    def test_skill_changes_reach_a_loaded_matrix(self):
+        s = self.skills
+        profile = self.profile([s[0]])
+        listing = self.listing([s[1]])
+        self.assertEqual(matching.match_jobs_for_profile(profile)[0], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            listing.required_skills.add(s[0]) # Patched in place on commit
+        self.assertEqual([pk for pk, _, _ in matching.match_jobs_for_profile(profile)[0]], [listing.pk])
+
+        # Another process rewrites the bits and bumps the shared version: this one reloads
+        JobListing.objects.filter(pk=listing.pk).update(skill_bits=matching.pack_skill_ids([s[2].pk]))
+        cache.incr(matching.MATRICES[JobListing].version_key)
+        self.assertEqual(matching.match_jobs_for_profile(profile)[0], [])
+
+    def test_matrix_is_invalidated_again_on_commit(self):
+        s = self.skills
+        profile = self.profile([s[0]])
+        listing = self.listing([s[1]])
+        matrix = matching.MATRICES[JobListing]
+        other_process = matching.SkillMatrix(JobListing, "joblisting_id", "required_skills", {"is_active": True})
+        other_process.get()
+        self.assertEqual(matching.match_jobs_for_profile(profile)[0], [])
+        with self.captureOnCommitCallbacks() as callbacks:
+            listing.required_skills.add(s[0])
+            # Reloaded before the commit; in production these would still be the old rows
+            other_process.get()
+            stale_version = other_process._loaded_version
+        self.assertEqual(matching.match_jobs_for_profile(profile)[0], []) # Not patched before the commit
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache.get(matrix.version_key), stale_version)
+        self.assertEqual(matrix._loaded_version, cache.get(matrix.version_key))
+        self.assertEqual([pk for pk, _, _ in matching.match_jobs_for_profile(profile)[0]], [listing.pk])
+        other_process.get()
+        self.assertEqual(other_process._loaded_version, cache.get(matrix.version_key))
+
+
+class ApplicantRankingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.skills = Skill.objects.bulk_create([Skill(name=f"Skill {i}") for i in range(4)])
+        self.manager = User.objects.create_user(email="recruiter@example.com", phone_number="600", password=None)
+        business = BusinessProfile.objects.create(user_manager=self.manager, company_name="Acme")
+        self.listing = JobListing.objects.create(posted_by_business=business, title="Engineer", description="Build")
+        self.listing.required_skills.set(self.skills[:2])
+        self.counter = 0
+
+    def apply(self, skills, **profile_fields):
+        self.counter += 1
+        user = User.objects.create_user(email=f"applicant{self.counter}@example.com", phone_number=f"6{self.counter}", password=None)
+        profile = ProfessionalProfile.objects.get(user=user)
+        for field, value in profile_fields.items():
+            setattr(profile, field, value)
+        profile.save()
+        profile.skills.set(skills)
+        return JobApplication.objects.create(applicant=user, job_listing=self.listing)
+
+    def ranking(self):
+        self.listing.refresh_from_db()
+        return ranking.get_ranking(self.listing)
+
+    def test_applicants_ordered_by_weighted_score(self):
+        s = self.skills
+        referrer = self.apply([s[0]], can_give_referrals=True)
+        full = self.apply(s[:2])
+        tied = self.apply([s[1]], can_give_referrals=True)
+        withdrawn = self.apply(s[:2])
+        withdrawn.status = "WITHDRAWN"
+        withdrawn.save()
+        results = self.ranking()
+        self.assertEqual([entry["application_id"] for entry in results], [full.pk, referrer.pk, tied.pk])
+        self.assertEqual(results[0]["features"]["skill_overlap"], 1.0)
+        self.assertEqual(results[1]["features"]["skill_overlap"], 0.5)
+        self.assertEqual(results[1]["features"]["can_give_referrals"], 1.0)
+
+    def test_new_application_and_skill_change_invalidate(self):
+        first = self.apply([self.skills[2]])
+        self.assertEqual([entry["application_id"] for entry in self.ranking()], [first.pk])
+        second = self.apply([self.skills[0]])
+        self.assertEqual([entry["application_id"] for entry in self.ranking()], [second.pk, first.pk])
+        self.listing.required_skills.set(self.skills[2:])
+        self.assertEqual([entry["application_id"] for entry in self.ranking()], [first.pk, second.pk])
+
+    def test_only_the_manager_sees_the_ranking(self):
+        self.apply([self.skills[0]])
+        url = f"/api/professional/jobs/listings/{self.listing.pk}/ranked-applicants/"
+        self.client.force_authenticate(User.objects.create_user(email="other@example.com", phone_number="699", password=None))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_authenticate(self.manager)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class JobListingImportTests(APITestCase):
+    url = "/api/professional/jobs/listings/bulk-import/"
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(email="importer@example.com", phone_number="700", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=self.manager, company_name="Acme")
+        self.python = Skill.objects.create(name="Python")
+        self.client.force_authenticate(self.manager)
+
+    def post(self, body, content_type, **params):
+        query = "&".join(f"{key}={value}" for key, value in {"business_id": self.business.pk, **params}.items())
+        return self.client.generic("POST", f"{self.url}?{query}", body, content_type=content_type)
+
+    def test_ndjson_rows_are_imported_and_errors_reported_by_line(self):
+        body = "\n".join([
+            '{"title": "Backend", "description": "APIs", "skills": ["python", "Django"]}',
+            '{"title": "", "description": "Missing title"}',
+            "not json",
+            '{"title": "Data", "description": "Pipelines", "skills": ["PYTHON"], "employment_type": "part_time"}',
+        ])
+        response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual(response.data["skills_created"], 1) # Django; "python" matches the existing skill
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 3])
+
+        backend = JobListing.objects.get(title="Backend")
+        self.assertEqual(set(backend.required_skills.values_list("name", flat=True)), {"Python", "Django"})
+        self.assertEqual(JobListing.objects.get(title="Data").employment_type, "PART_TIME")
+        # bulk_create skips signals, so the import indexes the rows itself
+        self.assertEqual(list(search.search_job_listings(JobListing.objects.all(), keyword="pipelines")), [JobListing.objects.get(title="Data")])
+        self.assertNotEqual(bytes(backend.skill_bits), b"")
+
+    def test_csv_without_creating_skills(self):
+        body = "title,description,skills\nAnalyst,Reports,\"python, sql\"\nEngineer,Code,python\n"
+        response = self.post(body, "text/csv", create_skills="false")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["skills_created"], 0)
+        self.assertEqual(response.data["errors"], [{"line": 2, "errors": {"skills": ["Unknown skill: sql"]}}])
+        self.assertFalse(Skill.objects.filter(name__iexact="sql").exists())
+
+    def test_only_the_manager_can_import(self):
+        self.client.force_authenticate(User.objects.create_user(email="outsider@example.com", phone_number="799", password=None))
+        response = self.post('{"title": "x", "description": "y"}', "application/x-ndjson")
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(JobListing.objects.exists())
+
+    def test_skills_created_counts_only_new_rows(self):
+        ids, created = bulk_import.resolve_skills(["python", "Rust", "Go"])
+        self.assertEqual(created, 2)
+        self.assertEqual(ids["python"], self.python.pk)
+        self.assertEqual(set(ids), {"python", "rust", "go"})
+        self.assertEqual(bulk_import.resolve_skills(["RUST", "go"]), ({"rust": ids["rust"], "go": ids["go"]}, 0))
+
+
+class ReferralMatchTests(APITestCase):
+    def setUp(self):
+        manager = User.objects.create_user(email="founder@example.com", phone_number="800", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=manager, company_name="Acme  Corp")
+        self.listing = JobListing.objects.create(posted_by_business=self.business, title="Engineer", description="Build")
+
+    def referrer(self, email, company, is_current=True, can_give_referrals=True):
+        user = User.objects.create_user(email=email, phone_number=email.split("@")[0], password=None)
+        profile = ProfessionalProfile.objects.get(user=user)
+        profile.can_give_referrals = can_give_referrals
+        profile.work_experience = [{"title": "Engineer", "company": company, "end_date": "present" if is_current else "2020"}]
+        profile.save()
+        return profile
+
+    def referrer_ids(self):
+        return [match.referrer_id for match in referrals.referrers_for(self.listing)]
+
+    def test_organization_key_is_normalized_like_work_history(self):
+        self.assertEqual(self.business.organization_key, "acme corp")
+        current = self.referrer("current@example.com", " ACME corp ")
+        former = self.referrer("former@example.com", "acme   Corp", is_current=False)
+        self.referrer("unwilling@example.com", "Acme Corp", can_give_referrals=False)
+        self.referrer("elsewhere@example.com", "Globex")
+        self.assertEqual(self.referrer_ids(), [current.pk, former.pk])
+
+    def test_lookup_uses_the_indexed_key(self):
+        profile = self.referrer("current@example.com", "Acme Corp", is_current=False)
+        with CaptureQueriesContext(connection) as context:
+            referrals.refresh_referrers([profile.pk])
+        self.assertFalse([q for q in context.captured_queries if "LOWER(" in q["sql"].upper()])
+        self.assertEqual(self.referrer_ids(), [profile.pk])
+
+    def test_company_rename_and_deactivation_refresh_matches(self):
+        profile = self.referrer("current@example.com", "Acme Corp")
+        self.business.company_name = "Globex"
+        self.business.save(update_fields=["company_name"])
+        self.business.refresh_from_db()
+        self.assertEqual(self.business.organization_key, "globex")
+        self.assertEqual(self.referrer_ids(), [])
+        self.business.company_name = "ACME CORP"
+        self.business.save()
+        self.assertEqual(self.referrer_ids(), [profile.pk])
+        self.listing.is_active = False
+        self.listing.save()
+        self.assertEqual(self.referrer_ids(), [])
+
+
+class FundingRangeParsingTests(SimpleTestCase):
+    def assertParses(self, cases):
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(funding.parse_funding_range(text), expected)
+
+    def test_ranges(self):
+        self.assertParses([
+            ("$50k - $250k", (50_000, 250_000)),
+            ("$50-250k", (50_000, 250_000)), # A bare first number takes the second's unit
+            ("1.2 million to 3 million", (1_200_000, 3_000_000)),
+            ("between 100k and 50k", (50_000, 100_000)),
+            ("250,000", (250_000, 250_000)),
+        ])
+
+    def test_unit_suffixes(self):
+        self.assertParses([
+            ("10K", (10_000, 10_000)),
+            ("2 - 5 MM", (2_000_000, 5_000_000)),
+            ("3mn", (3_000_000, 3_000_000)),
+            ("1,5M", (1_500_000, 1_500_000)), # Decimal comma
+            ("2bn", (2_000_000_000, 2_000_000_000)),
+            ("4 thousand", (4_000, 4_000)),
+        ])
+
+    def test_currencies_are_ignored(self):
+        self.assertParses([
+            ("USD 2bn", (2_000_000_000, 2_000_000_000)),
+            ("€1,5M", (1_500_000, 1_500_000)),
+            ("£250,000", (250_000, 250_000)),
+            ("10K EUR", (10_000, 10_000)),
+        ])
+
+    def test_open_ended(self):
+        self.assertParses([
+            ("up to 1M", (0, 1_000_000)),
+            ("under $200k", (0, 200_000)),
+            ("$500k+", (500_000, None)),
+            ("at least 10k", (10_000, None)),
+        ])
+
+    def test_unparseable(self):
+        self.assertParses([(text, (None, None)) for text in ["", None, "TBD", "Series A", "negotiable"]])
+
+    def test_unit_is_only_borrowed_across_a_range_separator(self):
+        self.assertParses([
+            ("$50 to $250k", (50_000, 250_000)),
+            ("50–250k", (50_000, 250_000)),
+            ("Seed: 2024 round, $1M", (2024, 1_000_000)),
+            ("50 investors, 2M total", (50, 2_000_000)),
+        ])
+
+    def test_amounts_beyond_the_column_range_are_unparsed(self):
+        self.assertParses([
+            ("99999999999 billion", (None, None)),
+            ("$1M - 99999999999 billion", (None, None)),
+            ("up to " + "9" * 400, (None, None)),
+            ("9000000000 billion", (9 * 10**18, 9 * 10**18)),
+        ])
+        self.assertIsNone(funding.parse_amount("99999999999 billion"))
+
+    def test_parse_amount(self):
+        self.assertEqual(funding.parse_amount("250k"), 250_000)
+        self.assertEqual(funding.parse_amount("1.5m"), 1_500_000)
+        self.assertIsNone(funding.parse_amount("lots"))
+        self.assertIsNone(funding.parse_amount(None))
+
+
+class FundingRangeQueryTests(APITestCase):
+    def test_saved_ranges_filter_by_overlap(self):
+        manager = User.objects.create_user(email="fund@example.com", phone_number="900", password=None)
+        business = BusinessProfile.objects.create(user_manager=manager, company_name="Fund")
+        def opportunity(text):
+            return FundingOpportunity.objects.create(posted_by_business=business, title=text, description="", funding_amount_range=text)
+        seed = opportunity("$50k - $250k")
+        growth = opportunity("$1M+")
+        opportunity("TBD")
+        huge = opportunity("99999999999 billion") # Saves instead of overflowing the column
+        self.assertEqual((huge.funding_min, huge.funding_max), (None, None))
+        self.assertEqual((seed.funding_min, seed.funding_max), (50_000, 250_000))
+        queryset = FundingOpportunity.objects.order_by("pk")
+        self.assertEqual(list(funding.overlapping(queryset, 200_000, 300_000)), [seed])
+        self.assertEqual(list(funding.overlapping(queryset, 5_000_000, None)), [growth])
+        self.assertEqual(list(funding.overlapping(queryset, None, 10_000)), [])
+
+
+class ApplicationRollupTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(email="board@example.com", phone_number="1000", password=None)
+        self.business = BusinessProfile.objects.create(user_manager=self.manager, company_name="Acme")
+        self.listing = JobListing.objects.create(posted_by_business=self.business, title="Engineer", description="Build")
+        self.counter = 0
+
+    def apply(self):
+        self.counter += 1
+        user = User.objects.create_user(email=f"candidate{self.counter}@example.com", phone_number=f"10{self.counter}", password=None)
+        return JobApplication.objects.create(applicant=user, job_listing=self.listing)
+
+    def counts(self):
+        return dict(JobApplicationStatusCount.objects.filter(listing=self.listing, count__gt=0).values_list("status", "count"))
+
+    def test_create_status_change_and_delete(self):
+        first, second = self.apply(), self.apply()
+        self.assertEqual(self.counts(), {"APPLIED": 2})
+        first.status = "UNDER_REVIEW"
+        first.save()
+        self.assertEqual(self.counts(), {"APPLIED": 1, "UNDER_REVIEW": 1})
+        deferred = JobApplication.objects.only("pk").get(pk=second.pk)
+        deferred.status = "UNDER_REVIEW"
+        deferred.save()
+        self.assertEqual(self.counts(), {"UNDER_REVIEW": 2})
+        first.delete()
+        self.assertEqual(self.counts(), {"UNDER_REVIEW": 1})
+        self.assertEqual(rollup.rebuild([self.listing.pk]), 1)
+        self.assertEqual(self.counts(), {"UNDER_REVIEW": 1})
+
+    def test_decrement_stops_at_zero(self):
+        application = self.apply()
+        JobApplicationStatusCount.objects.filter(listing=self.listing).update(count=0) # Drifted, e.g. by a bulk update
+        application.delete()
+        self.assertEqual(JobApplicationStatusCount.objects.get(listing=self.listing, status="APPLIED").count, 0)
+        rollup.adjust(self.listing.pk, "REJECTED", -1) # No row yet: nothing to decrement or create
+        self.assertFalse(JobApplicationStatusCount.objects.filter(status="REJECTED").exists())
+
+    def test_dashboard(self):
+        self.apply()
+        self.client.force_authenticate(self.manager)
+        response = self.client.get(f"/api/professional/profiles/business/{self.business.pk}/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["listings"][0]["counts"], {"APPLIED": 1})
+
+
+class SkillAutocompleteTests(APITestCase):
+    URL = "/api/professional/skills/autocomplete/"
+
+    def setUp(self):
+        cache.clear()
+        Skill.objects.bulk_create([Skill(name=name) for name in ["Machine Learning", "Node.js", "Python", "Lean Management"]])
+        user = User.objects.create_user(email="typist@example.com", phone_number="800", password=None)
+        self.client.force_authenticate(user)
+
+    def names(self, rows):
+        return [row["name"] for row in rows]
+
+    def test_prefix_trie_finds_word_prefixes_leading_words_first(self):
+        entries = [(name, name) for name in ["Learning Design", "Machine Learning", "Node.js", "lean"]]
+        prefixes = trie.PrefixTrie(entries, node_limit=3)
+        self.assertEqual(prefixes.search("lea", 10), ["Learning Design", "lean", "Machine Learning"])
+        self.assertEqual(prefixes.search("JS", 10), ["Node.js"])
+        self.assertEqual(prefixes.search("lea", 1), ["Learning Design"])
+        self.assertEqual(prefixes.search("x", 10), [])
+
+    def test_every_process_rebuilds_after_a_bump(self):
+        # Two tries over the same model stand for two worker processes sharing the cache
+        this_worker, other_worker = trie.VocabularyTrie(Skill), trie.VocabularyTrie(Skill)
+        self.assertEqual(self.names(other_worker.complete("lea")[0]), ["Lean Management", "Machine Learning"])
+        _, old_etag = other_worker.all()
+        with self.assertNumQueries(0):
+            other_worker.complete("py")
+        this_worker.all()
+        Skill.objects.create(name="Leadership") # Its receiver bumps the shared version
+        with self.assertNumQueries(1):
+            rows, etag = other_worker.complete("lea")
+        self.assertEqual(self.names(rows), ["Leadership", "Lean Management", "Machine Learning"])
+        self.assertNotEqual(etag, old_etag)
+        self.assertEqual(this_worker.all()[1], etag)
+
+    def test_matching_etag_is_not_modified_until_the_vocabulary_changes(self):
+        response = self.client.get(self.URL, {"q": "py"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(response.data), ["Python"])
+        etag = response["ETag"]
+        response = self.client.get(self.URL, {"q": "py"}, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        Skill.objects.create(name="PyTorch")
+        response = self.client.get(self.URL, {"q": "py"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(response.data), ["PyTorch", "Python"])
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.URL, {"limit": "0"}).status_code, 400)
+
+
+def linkedin_archive(members):
+    """ZIP bytes holding {member name: CSV text}."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, text in members.items():
+            archive.writestr(name, text)
+    return buffer.getvalue()
+
+EXPORT = {
+    "Basic_LinkedInDataExport/Profile.csv": "\ufeffFirst Name,Headline,Summary\nAda,Staff  Engineer,Builds things\n",
+    "Basic_LinkedInDataExport/Positions.csv": (
+        "Company Name,Title,Description,Location,Started On,Finished On\n"
+        "Acme,Engineer,,Remote,Jan 2020,\n"
+        "Globex,Intern,Coffee,,Jun 2018,Dec 2018\n"
+        ",,,,,\n"
+    ),
+    "Basic_LinkedInDataExport/Education.csv": "School Name,Start Date,End Date,Notes,Degree Name\nState U,2014,2018,,BSc\n",
+    "Basic_LinkedInDataExport/Skills.csv": "Name\nPython\n Machine  Learning \n\n",
+    "Basic_LinkedInDataExport/Email Addresses.csv": (
+        "Email Address,Confirmed,Primary\nold@example.com,Yes,No\nAda@Example.com,Yes,Yes\n"
+    ),
+}
+
+
+class LinkedInExportParsingTests(SimpleTestCase):
+    def test_members_are_parsed_into_plain_data(self):
+        parsed = linkedin_export.parse_export(io.BytesIO(linkedin_archive(EXPORT)))
+        self.assertEqual(parsed["profile"], {"headline": "Staff Engineer", "summary": "Builds things"})
+        self.assertEqual(parsed["positions"], [
+            {"title": "Engineer", "company": "Acme", "location": "Remote", "start_date": "Jan 2020", "end_date": "Present"},
+            {"title": "Intern", "company": "Globex", "start_date": "Jun 2018", "end_date": "Dec 2018", "description": "Coffee"},
+        ])
+        self.assertEqual(parsed["education"], [{"degree": "BSc", "school": "State U", "start_date": "2014", "end_date": "2018"}])
+        self.assertEqual(parsed["skills"], ["Python", "Machine Learning"])
+        self.assertEqual(parsed["emails"], ["ada@example.com", "old@example.com"]) # Primary first
+        self.assertEqual(parsed["truncated"], [])
+
+    def test_long_members_are_truncated_and_reported(self):
+        skills = "Name\n" + "".join(f"Skill {index}\n" for index in range(5))
+        with mock.patch.object(linkedin_export, "MAX_ROWS", 3):
+            parsed = linkedin_export.parse_export(io.BytesIO(linkedin_archive({"Skills.csv": skills})))
+        self.assertEqual(parsed["skills"], ["Skill 0", "Skill 1", "Skill 2"])
+        self.assertEqual(parsed["truncated"], ["skills"])
+
+    def test_unusable_archives_raise_export_error(self):
+        for source in [io.BytesIO(b"not a zip"), io.BytesIO(linkedin_archive({"notes.txt": "hello"}))]:
+            with self.assertRaises(linkedin_export.ExportError):
+                linkedin_export.parse_export(source)
+        with mock.patch.object(linkedin_export, "MAX_MEMBER_SIZE", 10):
+            with self.assertRaisesMessage(linkedin_export.ExportError, "too large"):
+                linkedin_export.parse_export(io.BytesIO(linkedin_archive(EXPORT)))
+
+
+class LinkedInImportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="ada@example.com", phone_number="1300", password=None)
+        self.profile = ProfessionalProfile.objects.get(user=self.user)
+        self.existing = Skill.objects.create(name="python")
+        self.kept = Skill.objects.create(name="Rust")
+        self.profile.skills.add(self.kept)
+
+    def parsed(self, members=EXPORT):
+        return linkedin_export.parse_export(io.BytesIO(linkedin_archive(members)))
+
+    def test_export_updates_the_profile_and_adds_skills(self):
+        summary = linkedin.apply_export(self.user, self.parsed())
+        self.assertEqual(summary["profile_id"], self.profile.pk)
+        self.assertFalse(summary["created"])
+        self.assertEqual(summary["updated_fields"], ["headline", "summary", "work_experience", "education"])
+        self.assertEqual((summary["skills"], summary["skills_created"]), (2, 1))
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.headline, "Staff Engineer")
+        self.assertEqual(self.profile.work_experience[0]["company"], "Acme")
+        self.assertEqual(sorted(self.profile.skills.values_list("name", flat=True)), ["Machine Learning", "Rust", "python"])
+
+    def test_failed_import_leaves_no_new_skills(self):
+        with mock.patch.object(ProfessionalProfile, "save", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                linkedin.apply_export(self.user, self.parsed())
+        self.assertFalse(Skill.objects.filter(name="Machine Learning").exists())
+        self.assertEqual(list(self.profile.skills.all()), [self.kept])
+
+    def test_upload_endpoint(self):
+        self.client.force_authenticate(self.user)
+        url = "/api/professional/profiles/professional/me/import-linkedin/"
+        upload = SimpleUploadedFile("export.zip", linkedin_archive(EXPORT), content_type="application/zip")
+        response = self.client.post(url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["import"]["positions"], 2)
+        self.assertEqual(response.data["profile"]["headline"], "Staff Engineer")
+        self.assertEqual(self.client.post(url, {}, format="multipart").status_code, 400)
+        bad = SimpleUploadedFile("export.zip", b"not a zip", content_type="application/zip")
+        self.assertEqual(self.client.post(url, {"file": bad}, format="multipart").status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(url, {}, format="multipart").status_code, 401)
+
+    def test_command_matches_archives_to_users_by_email(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, members in [("ada.zip", EXPORT), ("stranger.zip", {"Email Addresses.csv": "Email Address,Primary\nnobody@example.com,Yes\n"})]:
+                paths.append(os.path.join(directory, name))
+                with open(paths[-1], "wb") as file:
+                    file.write(linkedin_archive(members))
+            out, err = StringIO(), StringIO()
+            call_command("import_linkedin_exports", *paths, workers=1, stdout=out, stderr=err)
+        self.assertIn("Imported 1 archives; 1 failed.", out.getvalue())
+        self.assertIn("stranger.zip: no user matches", err.getvalue())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.headline, "Staff Engineer")
+
+
+class QueuedRenders:
+    """Stands in for the renderer pool: jobs run when the test says so."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, function, *args):
+        future = Future()
+        self.jobs.append((function, args, future))
+        return future
+
+    def finish(self, error=None):
+        function, args, future = self.jobs.pop(0)
+        if error is None:
+            function(*args)
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+
+class ProfilePdfTests(APITestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.renders = QueuedRenders()
+        patcher = mock.patch.object(pdf, "_new_executor", return_value=self.renders)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        pdf._executor = None
+        pdf._in_flight.clear()
+        pdf._failures.clear()
+        self.addCleanup(pdf._in_flight.clear)
+        self.addCleanup(pdf._failures.clear)
+        self.addCleanup(setattr, pdf, "_executor", None)
+        self.profile = self.make_profile("pdf@example.com", "1400")
+
+    def make_profile(self, email, phone_number):
+        user = User.objects.create_user(email=email, phone_number=phone_number, password=None)
+        profile = ProfessionalProfile.objects.get(user=user)
+        profile.headline = "Engineer"
+        profile.save()
+        return profile
+
+    def url(self, profile=None):
+        return f"/api/professional/profiles/professional/{(profile or self.profile).pk}/pdf/"
+
+    def test_content_hash_follows_what_the_pdf_shows(self):
+        first, second = Skill.objects.create(name="Zig"), Skill.objects.create(name="Ada")
+        self.profile.skills.add(first, second)
+        digest = pdf.content_hash(pdf.profile_document(self.profile))
+        self.profile.skills.set([second, first])
+        self.assertEqual(pdf.content_hash(pdf.profile_document(self.profile)), digest)
+        self.profile.headline = "Manager"
+        self.assertNotEqual(pdf.content_hash(pdf.profile_document(self.profile)), digest)
+        self.profile.resume_url = None
+        self.assertEqual(pdf.profile_document(self.profile)["resume_url"], "")
+
+    def test_render_is_queued_once_then_served_with_an_etag(self):
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(self.client.get(self.url()).status_code, 202)
+        self.assertEqual(len(self.renders.jobs), 1) # Shared by both requests
+
+        self.renders.finish()
+        self.assertEqual(pdf._in_flight, {})
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        etag = response["ETag"]
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        self.profile.headline = "Manager"
+        self.profile.save()
+        self.assertEqual(self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag).status_code, 202)
+
+    def test_failed_render_is_reported_once_then_retried(self):
+        self.client.get(self.url())
+        self.renders.finish(RuntimeError("font missing"))
+        self.assertEqual(pdf._in_flight, {})
+        self.assertEqual(self.client.get(self.url()).status_code, 500)
+        self.assertEqual(self.client.get(self.url()).status_code, 202)
+        self.assertEqual(len(self.renders.jobs), 1)
+
+    @override_settings(PROFILE_PDF={"MAX_PENDING": 1, "MAX_FAILURES": 1})
+    def test_pending_renders_and_failures_are_bounded(self):
+        other = self.make_profile("pdf2@example.com", "1401")
+        self.assertEqual(self.client.get(self.url()).status_code, 202)
+        response = self.client.get(self.url(other))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "2")
+
+        self.renders.finish(RuntimeError("first"))
+        self.assertEqual(self.client.get(self.url(other)).status_code, 202)
+        self.renders.finish(RuntimeError("second"))
+        self.assertEqual(len(pdf._failures), 1) # Only the latest failure is kept
+        self.assertEqual(self.client.get(self.url(other)).status_code, 500)
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": False})
+class SparseFieldsetsTests(APITestCase):
+    URL = "/api/professional/jobs/listings/"
+
+    def setUp(self):
+        manager = User.objects.create_user(email="sparse@example.com", phone_number="1500", password=None)
+        business = BusinessProfile.objects.create(user_manager=manager, company_name="Acme")
+        skills = Skill.objects.bulk_create([Skill(name="Go"), Skill(name="SQL")])
+        self.skill_ids = [skill.pk for skill in skills]
+        for _ in range(3):
+            listing = JobListing.objects.create(posted_by_business=business, title="Engineer", description="Build")
+            listing.required_skills.set(skills)
+        self.business, self.manager = business, manager
+
+    def get(self, queries, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context.captured_queries), queries, [query["sql"] for query in context.captured_queries])
+        self.sql = " ".join(query["sql"] for query in context.captured_queries)
+        return response.data["results"]
+
+    def test_unrequested_relations_are_neither_queried_nor_serialized(self):
+        results = self.get(2, fields="id,title") # Count and page
+        self.assertEqual(results[0], {"id": results[0]["id"], "title": "Engineer"})
+        for table in ["professional_app_businessprofile", "professional_app_skill", "users_user"]:
+            self.assertNotIn(table, self.sql)
+        self.assertEqual(len(self.get(4)[0]), 11) # Without fields the response is unchanged
+
+    def test_unexpanded_relations_render_as_primary_keys(self):
+        results = self.get(3, fields="id,posted_by_business,required_skills")
+        self.assertEqual(set(results[0]), {"id", "posted_by_business", "required_skills"})
+        self.assertEqual(results[0]["posted_by_business"], self.business.pk)
+        self.assertEqual(results[0]["required_skills"], self.skill_ids)
+        self.assertNotIn("users_user", self.sql)
+
+    def test_expanded_relations_render_in_full(self):
+        results = self.get(3, fields="id", expand="posted_by_business")
+        self.assertEqual(set(results[0]), {"id", "posted_by_business"})
+        self.assertEqual(results[0]["posted_by_business"]["company_name"], "Acme")
+        self.assertEqual(results[0]["posted_by_business"]["user_manager"]["email"], "sparse@example.com")
+        self.assertNotIn("professional_app_skill", self.sql)
+        results = self.get(3, fields="id", expand="required_skills")
+        self.assertEqual(results[0]["required_skills"], [{"id": self.skill_ids[0], "name": "Go"}, {"id": self.skill_ids[1], "name": "SQL"}])
+
+    def test_dotted_paths_pick_fields_inside_relations(self):
+        results = self.get(2, fields="id,posted_by_business.company_name")
+        self.assertEqual(results[0]["posted_by_business"], {"company_name": "Acme"})
+        self.assertNotIn("users_user", self.sql)
+        results = self.get(3, fields="posted_by_business.user_manager", expand="posted_by_business.user_manager")
+        self.assertEqual(results[0], {"posted_by_business": {"user_manager": {"id": self.manager.pk, "email": "sparse@example.com", "phone_number": "1500"}}})
+
+    def test_unknown_field_names_are_ignored(self):
+        results = self.get(2, fields="id,nope,posted_by_business.nope")
+        self.assertEqual(set(results[0]), {"id", "posted_by_business"})
+        self.assertEqual(results[0]["posted_by_business"], {})
+        self.assertEqual(self.get(2, fields="")[0], {})
+
+    def test_parse_field_paths(self):
+        self.assertEqual(parse_field_paths(" a, b.c ,b.d,,b"), {"a": EXPAND_ALL, "b": {"c": EXPAND_ALL, "d": EXPAND_ALL}})
+        self.assertEqual(parse_field_paths(None), {})
+
+
+class MentorshipMatchTests(APITestCase):
+    def setUp(self):
+        self.counter = 0
+        self.mentee = self.user()
+        self.detailed(self.mentee, is_mentee=True, mentee_professions="Data Science, UX")
+
+    def user(self):
+        self.counter += 1
+        return User.objects.create_user(email=f"mentor{self.counter}@example.com", phone_number=f"16{self.counter}", password=None)
+
+    def detailed(self, user, **fields):
+        profile = ProfessionalProfile.objects.get(user=user)
+        for name, value in fields.items():
+            setattr(profile, name, value)
+        profile.save()
+        return profile
+
+    def core(self, user, **fields):
+        profile = CoreProfessionalProfile.objects.get(user=user)
+        for name, value in fields.items():
+            setattr(profile, name, value)
+        profile.save()
+        return profile
+
+    def rows(self, user):
+        return set(MentorshipProfession.objects.filter(user=user).values_list("source", "role", "profession", "label"))
+
+    def test_parse_professions(self):
+        self.assertEqual(
+            mentorship.parse_professions(" Data  Science, data science ,,UX"),
+            {"data science": "Data Science", "ux": "UX"},
+        )
+        self.assertEqual(mentorship.parse_professions(None), {})
+
+    def test_index_follows_both_profile_models(self):
+        user = self.user()
+        detailed = self.detailed(user, is_mentor=True, mentor_professions="Data Science")
+        core = self.core(user, is_mentor=True, mentor_categories="UX, Product", mentee_categories="Law")
+        self.assertEqual(self.rows(user), {
+            ("DETAILED", "MENTOR", "data science", "Data Science"),
+            ("CORE", "MENTOR", "ux", "UX"),
+            ("CORE", "MENTOR", "product", "Product"),
+        }) # Not a mentee, so "Law" is not indexed
+        core.is_mentor = False
+        core.save()
+        self.assertEqual(self.rows(user), {("DETAILED", "MENTOR", "data science", "Data Science")})
+        detailed.delete()
+        self.assertEqual(self.rows(user), set())
+
+    def test_matches_rank_by_overlap_and_exclude_the_user(self):
+        both, one, other = self.user(), self.user(), self.user()
+        self.detailed(one, is_mentor=True, mentor_professions="UX")
+        self.detailed(both, is_mentor=True, mentor_professions="UX")
+        self.core(both, is_mentor=True, mentor_categories="data science")
+        self.detailed(other, is_mentor=True, mentor_professions="Law")
+        self.detailed(self.mentee, is_mentor=True, mentor_professions="UX")
+        matches = mentorship.find_matches(self.mentee, "MENTOR", {"ux", "data science"})
+        self.assertEqual(list(matches), [{"user_id": both.pk, "overlap": 2}, {"user_id": one.pk, "overlap": 1}])
+
+    def test_my_mentors_endpoint(self):
+        mentor = self.user()
+        self.detailed(mentor, is_mentor=True, mentor_professions="UX, Data Science, Law")
+        self.client.force_authenticate(self.mentee)
+        url = "/api/professional/profiles/professional/me/mentors/"
+        results = self.client.get(url).data["results"]
+        self.assertEqual(results, [{
+            "user": {"id": mentor.pk, "email": mentor.email, "phone_number": mentor.phone_number},
+            "overlap": 2,
+            "professions": ["Data Science", "UX"],
+        }])
+        self.assertEqual(self.client.get(url, {"profession": "law"}).data["results"][0]["professions"], ["Law"])
+        self.assertEqual(self.client.get("/api/professional/profiles/professional/me/mentees/").data["results"], [])
+
+    def test_backfill_rebuilds_the_index(self):
+        user = self.user()
+        self.core(user, is_mentee=True, mentee_categories="UX")
+        MentorshipProfession.objects.all().delete()
+        out = StringIO()
+        call_command("backfill_profession_index", batch_size=1, stdout=out)
+        self.assertIn("CORE: indexed", out.getvalue())
+        self.assertEqual(self.rows(user), {("CORE", "MENTEE", "ux", "UX")})
+        self.assertEqual(len(self.rows(self.mentee)), 2)
+
+
+class ExperienceIndexTests(APITestCase):
+    def setUp(self):
+        self.counter = 0
+
+    def profile(self, work_experience=(), education=()):
+        self.counter += 1
+        user = User.objects.create_user(email=f"alum{self.counter}@example.com", phone_number=f"17{self.counter}", password=None)
+        profile = ProfessionalProfile.objects.get(user=user)
+        profile.work_experience = list(work_experience)
+        profile.education = list(education)
+        profile.save()
+        return profile
+
+    def entries(self, profile):
+        return list(ProfileExperienceEntry.objects.filter(profile=profile).values_list(
+            "kind", "position", "organization", "organization_label", "title", "start_date", "end_date", "is_current",
+        ))
+
+    def test_entries_are_normalized(self):
+        profile = self.profile(
+            work_experience=[
+                {"company": "  ACME   Corp ", "title": "Engineer", "start_date": "May 2020", "end_date": "Present"},
+                {"employer": "Globex", "position": "Intern", "start": "2018-06", "end": "2018/12"},
+                {"organization": "Initech", "role": "Manager", "from": "2015", "current": True},
+                {"note": "no organization or title"},
+                "not a dict",
+            ],
+            education=[{"institution": "State U", "degree": "BSc", "start_date": "09/2010", "end_date": "whenever"}],
+        )
+        self.assertEqual(self.entries(profile), [
+            ("EDUCATION", 0, "state u", "State U", "BSc", date(2010, 9, 1), None, False),
+            ("WORK", 0, "acme corp", "ACME Corp", "Engineer", date(2020, 5, 1), None, True),
+            ("WORK", 1, "globex", "Globex", "Intern", date(2018, 6, 1), date(2018, 12, 1), False),
+            ("WORK", 2, "initech", "Initech", "Manager", date(2015, 1, 1), None, True),
+        ])
+        self.assertIsNone(experience.parse_date("sometime"))
+        self.assertEqual(experience.parse_date(" 2020-05-17 "), date(2020, 5, 17))
+
+    def test_index_follows_saves_and_deletes(self):
+        profile = self.profile(work_experience=[{"company": "Acme", "title": "Engineer"}])
+        profile.work_experience = [{"company": "Globex", "title": "Lead"}]
+        profile.save()
+        self.assertEqual([row[2] for row in self.entries(profile)], ["globex"])
+        with CaptureQueriesContext(connection) as context: # Saves that leave both lists alone skip the index
+            profile.save(update_fields=["headline"])
+        self.assertFalse([query for query in context.captured_queries if "profileexperienceentry" in query["sql"]])
+        profile.delete()
+        self.assertFalse(ProfileExperienceEntry.objects.exists())
+
+    def test_lookups(self):
+        current = self.profile(work_experience=[{"company": "Acme", "title": "Engineer", "end_date": "present"}])
+        former = self.profile(work_experience=[{"company": "acme", "title": "Intern", "end_date": "2019"}])
+        alumnus = self.profile(education=[{"school": "State U", "degree": "BSc"}])
+        self.assertEqual(set(experience.find_profiles("WORK", " ACME ")), {current, former})
+        self.assertEqual(list(experience.find_profiles("WORK", "Acme", current=True)), [current])
+        self.assertEqual(list(experience.find_profiles("EDUCATION", "state u")), [alumnus])
+        self.assertEqual(list(experience.find_profiles("EDUCATION", "Acme")), [])
+
+        self.client.force_authenticate(current.user)
+        response = self.client.get("/api/professional/profiles/professional/worked-at/", {"company": "acme", "current": "false"})
+        self.assertEqual([result["profile"]["id"] for result in response.data["results"]], [former.pk])
+        self.assertEqual(response.data["results"][0]["entries"], [{
+            "organization_label": "acme", "title": "Intern", "start_date": None, "end_date": date(2019, 1, 1), "is_current": False,
+        }])
+        response = self.client.get("/api/professional/profiles/professional/alumni/", {"school": "STATE U"})
+        self.assertEqual([result["profile"]["id"] for result in response.data["results"]], [alumnus.pk])
+        self.assertEqual(self.client.get("/api/professional/profiles/professional/alumni/").status_code, 400)
+        self.assertEqual(self.client.get("/api/professional/profiles/professional/worked-at/", {"company": " "}).status_code, 400)
+
+    def test_backfill_rebuilds_the_index(self):
+        profile = self.profile(work_experience=[{"company": "Acme", "title": "Engineer"}], education=[{"school": "State U"}])
+        ProfileExperienceEntry.objects.all().delete()
+        out = StringIO()
+        call_command("backfill_experience_index", batch_size=1, stdout=out)
+        self.assertIn("Indexed experience for 1 profiles.", out.getvalue())
+        self.assertEqual([row[:3] for row in self.entries(profile)], [("EDUCATION", 0, "state u"), ("WORK", 0, "acme")])
@@ -2,6 +2,7 @@ from rest_framework import viewsets, permissions, status, generics
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
+from django.http import FileResponse
 from django.db.models import Q # Moved Q import to the top
 from .models import (
     Skill, ProfessionalProfile, BusinessProfile, JobListing, 
@@ -14,18 +15,49 @@ from .serializers import (
 )
 # Moved IsAuthorOrReadOnly import to the top and ensured it's from the correct app
 from personal_app.permissions import IsAuthorOrReadOnly 
+from .search import search_job_listings
+from .matching import match_jobs_for_profile, match_profiles_for_listing
+from .ranking import get_ranking
+from . import bulk_import
+from . import mentorship, experience, referrals, funding, rollup, pdf, linkedin
+from .linkedin_export import parse_export, ExportError
+from users.cards import user_card
+from users import profile_cache
 from .permissions import IsProfileOwnerOrReadOnly, IsBusinessManagerOrReadOnly, IsJobListingOwnerOrReadOnly
 from django.conf import settings
 from django.contrib.auth import get_user_model # Added get_user_model import
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+from minara_backend.prefetch import PrefetchPlannerMixin, plan_queryset
+from minara_backend.response_cache import ResponseCacheMixin
+from minara_backend.trie import VocabularyAutocompleteMixin, VocabularyTrie
+from minara_backend import row_streams
 
 User = get_user_model() # Use get_user_model
 
-class SkillViewSet(viewsets.ModelViewSet):
+def matches_response(request, matches, next_cursor, model, serializer_class, key):
+    """Render (id, score, matched_skills) matches as a cursor-paged response."""
+    serializer_context = {"request": request}
+    queryset = plan_queryset(model.objects.all(), serializer_class(context=serializer_context))
+    objects = queryset.in_bulk([pk for pk, _, _ in matches])
+    results = []
+    for pk, score, matched_skills in matches:
+        if pk in objects:
+            results.append({
+                "score": round(score, 4),
+                "matched_skills": matched_skills,
+                key: serializer_class(objects[pk], context=serializer_context).data,
+            })
+    next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor) if next_cursor else None
+    return Response({"next": next_url, "results": results})
+
+class SkillViewSet(VocabularyAutocompleteMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAdminUser] # Only admins can create/edit skills
+    vocabulary = VocabularyTrie(Skill) # autocomplete/ is open to any authenticated user
 
-class ProfessionalProfileViewSet(viewsets.ModelViewSet):
+class ProfessionalProfileViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = ProfessionalProfile.objects.all()
     serializer_class = ProfessionalProfileSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsProfileOwnerOrReadOnly]
@@ -41,10 +73,120 @@ class ProfessionalProfileViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="me")
     def my_profile(self, request):
-        profile, created = ProfessionalProfile.objects.get_or_create(user=request.user)
-        serializer = self.get_serializer(profile)
-        return Response(serializer.data)
+        # The profile is created with the user, so this read never writes
+        def render():
+            return self.get_serializer(get_object_or_404(ProfessionalProfile, user=request.user)).data
+        if not profile_cache.cacheable(request):
+            return Response(render())
+        return Response(profile_cache.get_representation(ProfessionalProfile, request.user.pk, render))
     
+    @action(detail=False, methods=["get"], url_path="me/matching-jobs", permission_classes=[permissions.IsAuthenticated])
+    def matching_jobs(self, request):
+        profile = get_object_or_404(ProfessionalProfile, user=request.user)
+        matches, next_cursor = match_jobs_for_profile(profile, request.query_params.get("cursor"), api_settings.PAGE_SIZE)
+        return matches_response(request, matches, next_cursor, JobListing, JobListingSerializer, "job_listing")
+
+    @action(detail=False, methods=["get"], url_path="me/mentors", permission_classes=[permissions.IsAuthenticated])
+    def my_mentors(self, request):
+        return self._mentorship_matches(request, wanted_role="MENTOR", own_role="MENTEE")
+
+    @action(detail=False, methods=["get"], url_path="me/mentees", permission_classes=[permissions.IsAuthenticated])
+    def my_mentees(self, request):
+        return self._mentorship_matches(request, wanted_role="MENTEE", own_role="MENTOR")
+
+    def _mentorship_matches(self, request, wanted_role, own_role):
+        # ?profession=a,b overrides the professions listed on the user's own profiles
+        requested = request.query_params.get("profession")
+        if requested:
+            professions = set(mentorship.parse_professions(requested))
+        else:
+            professions = mentorship.professions_for(request.user, own_role)
+        page = self.paginate_queryset(mentorship.find_matches(request.user, wanted_role, professions))
+        user_ids = [row["user_id"] for row in page]
+        users = User.objects.in_bulk(user_ids)
+        matched = {}
+        for entry in mentorship.MentorshipProfession.objects.filter(
+            user_id__in=user_ids, role=wanted_role, profession__in=professions
+        ).values("user_id", "profession", "label"):
+            matched.setdefault(entry["user_id"], {}).setdefault(entry["profession"], entry["label"])
+        results = [
+            {
+                "user": user_card(users[row["user_id"]]),
+                "overlap": row["overlap"],
+                "professions": sorted(matched.get(row["user_id"], {}).values()),
+            }
+            for row in page
+        ]
+        return self.get_paginated_response(results)
+
+    @action(detail=False, methods=["post"], url_path="me/import-linkedin", permission_classes=[permissions.IsAuthenticated])
+    def import_linkedin(self, request):
+        """Fill the user's profile from a LinkedIn data-export ZIP uploaded as "file"."""
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Upload the LinkedIn export ZIP in the \"file\" field."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            parsed = parse_export(upload)
+        except ExportError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        summary = linkedin.apply_export(request.user, parsed)
+        profile = get_object_or_404(self.filter_queryset(self.get_queryset()), pk=summary["profile_id"])
+        return Response({"import": summary, "profile": self.get_serializer(profile).data})
+
+    @action(detail=True, methods=["get"], url_path="pdf")
+    def pdf(self, request, pk=None):
+        return self._pdf_response(request, self.get_object())
+
+    @action(detail=False, methods=["get"], url_path="me/pdf", permission_classes=[permissions.IsAuthenticated])
+    def my_pdf(self, request):
+        return self._pdf_response(request, get_object_or_404(self.filter_queryset(self.get_queryset()), user=request.user))
+
+    def _pdf_response(self, request, profile):
+        """Serve the cached PDF for the profile's current content, or 202 while it renders."""
+        try:
+            path, digest = pdf.get_or_schedule(profile)
+        except pdf.RenderFailed:
+            return Response({"detail": "The PDF could not be rendered. Please try again."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except pdf.RenderQueueFull as exc:
+            return Response(
+                {"detail": exc.detail}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": str(exc.retry_after)}
+            )
+        etag = f'"{digest}"'
+        if path is None:
+            response = Response({"detail": "The PDF is being rendered; retry shortly."}, status=status.HTTP_202_ACCEPTED)
+            response["Retry-After"] = str(pdf.get_config()["RETRY_AFTER"])
+            return response
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response = FileResponse(open(path, "rb"), content_type="application/pdf", filename=f"profile-{profile.pk}.pdf")
+        response["ETag"] = etag
+        return response
+
+    @action(detail=False, methods=["get"], url_path="worked-at")
+    def worked_at(self, request):
+        """Profiles with work experience at ?company= (optionally ?current=true|false)."""
+        current = request.query_params.get("current")
+        if current is not None:
+            current = current.lower() in ("1", "true", "yes")
+        return self._experience_matches(request, "WORK", request.query_params.get("company"), current)
+
+    @action(detail=False, methods=["get"], url_path="alumni")
+    def alumni(self, request):
+        """Profiles with an education entry at ?school=."""
+        return self._experience_matches(request, "EDUCATION", request.query_params.get("school"))
+
+    def _experience_matches(self, request, kind, organization, current=None):
+        if not experience.normalize_organization(organization):
+            parameter = "company" if kind == "WORK" else "school"
+            return Response({"detail": f"The {parameter} parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+        page = self.paginate_queryset(self.filter_queryset(experience.find_profiles(kind, organization, current)))
+        entries = experience.entries_for([profile.pk for profile in page], kind, organization)
+        results = [
+            {"profile": profile_data, "entries": entries.get(profile.pk, [])}
+            for profile, profile_data in zip(page, self.get_serializer(page, many=True).data)
+        ]
+        return self.get_paginated_response(results)
+
     @action(detail=False, methods=["put", "patch"], url_path="me/update")
     def update_my_profile(self, request):
         profile, created = ProfessionalProfile.objects.get_or_create(user=request.user)
@@ -54,7 +196,7 @@ class ProfessionalProfileViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class BusinessProfileViewSet(viewsets.ModelViewSet):
+class BusinessProfileViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = BusinessProfile.objects.all()
     serializer_class = BusinessProfileSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsBusinessManagerOrReadOnly]
@@ -65,29 +207,74 @@ class BusinessProfileViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user_manager=self.request.user)
 
-class JobListingViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def dashboard(self, request, pk=None):
+        """Application counts per listing and status, read from the rollup table."""
+        business = self.get_object()
+        if business.user_manager != request.user and not request.user.is_staff:
+            return Response({"detail": "Only the business manager can view the hiring dashboard."}, status=status.HTTP_403_FORBIDDEN)
+        return Response(rollup.dashboard(business))
+
+class JobListingViewSet(ResponseCacheMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = JobListing.objects.filter(is_active=True).order_by("-posted_at")
+    response_cache_models = [BusinessProfile, Skill, User]
     serializer_class = JobListingSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsJobListingOwnerOrReadOnly]
 
     def get_queryset(self):
         queryset = super().get_queryset()
-        company_id = self.request.query_params.get("company_id")
-        keyword = self.request.query_params.get("keyword")
-        location = self.request.query_params.get("location")
+        params = self.request.query_params
+        company_id = params.get("company_id")
+        employment_type = params.get("employment_type")
+        skills = params.get("skills") # Comma-separated skill ids or names
 
         if company_id:
             queryset = queryset.filter(posted_by_business_id=company_id)
-        if keyword:
-            queryset = queryset.filter(Q(title__icontains=keyword) | Q(description__icontains=keyword))
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        
-        return queryset
+        if employment_type:
+            queryset = queryset.filter(employment_type=employment_type.upper())
+        if skills:
+            values = [value.strip() for value in skills.split(",") if value.strip()]
+            skill_ids = [int(value) for value in values if value.isdigit()]
+            skill_names = [value for value in values if not value.isdigit()]
+            listing_skills = JobListing.required_skills.through.objects.filter(
+                Q(skill_id__in=skill_ids) | Q(skill__name__in=skill_names)
+            )
+            queryset = queryset.filter(pk__in=listing_skills.values("joblisting_id"))
+
+        # Keyword, location and company name go through the full-text index, ranked by relevance
+        return search_job_listings(
+            queryset,
+            keyword=params.get("keyword"),
+            location=params.get("location"),
+            company=params.get("company"),
+        )
 
     def perform_create(self, serializer):
         serializer.save()
 
+    @action(detail=False, methods=["post"], url_path="bulk-import", permission_classes=[permissions.IsAuthenticated])
+    def import_listings(self, request):
+        """
+        Import many listings for one business from NDJSON or CSV.
+
+        The body is either the raw file (Content-Type application/x-ndjson or
+        text/csv) or a multipart upload in "file". Rows are read as a stream.
+        """
+        business = get_object_or_404(BusinessProfile, pk=request.query_params.get("business_id") or None)
+        if business.user_manager != request.user and not request.user.is_staff:
+            return Response({"detail": "You do not have permission to post jobs for this business."}, status=status.HTTP_403_FORBIDDEN)
+
+        stream, input_format = row_streams.request_stream(request, "listings")
+
+        create_skills = request.query_params.get("create_skills", "true").lower() not in ("0", "false", "no")
+        result = bulk_import.import_job_listings(
+            business, stream, input_format,
+            create_skills=create_skills,
+            max_errors=bulk_import.get_config()["MAX_ERRORS"],
+        )
+        response_status = status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST
+        return Response(result.as_dict(), status=response_status)
+
     @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
     def apply(self, request, pk=None):
         job_listing = self.get_object()
@@ -101,7 +288,52 @@ class JobListingViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get"], url_path="matching-profiles", permission_classes=[permissions.IsAuthenticated])
+    def matching_profiles(self, request, pk=None):
+        job_listing = self.get_object()
+        if job_listing.posted_by_business.user_manager != request.user and not request.user.is_staff:
+            return Response({"detail": "Only the business manager can view matching profiles."}, status=status.HTTP_403_FORBIDDEN)
+        matches, next_cursor = match_profiles_for_listing(job_listing, request.query_params.get("cursor"), api_settings.PAGE_SIZE)
+        return matches_response(request, matches, next_cursor, ProfessionalProfile, ProfessionalProfileSerializer, "profile")
+
+    @action(detail=True, methods=["get"], url_path="referrers", permission_classes=[permissions.IsAuthenticated])
+    def referrers(self, request, pk=None):
+        """Profiles that can refer the requesting user for this listing, current employees first."""
+        job_listing = self.get_object()
+        page = self.paginate_queryset(referrals.referrers_for(job_listing).exclude(referrer__user=request.user))
+        results = [
+            {
+                "profile_id": match.referrer_id,
+                "user": user_card(match.referrer.user),
+                "headline": match.referrer.headline,
+                "title": match.title,
+                "is_current": match.is_current,
+            }
+            for match in page
+        ]
+        return self.get_paginated_response(results)
+
+    @action(detail=True, methods=["get"], url_path="ranked-applicants", permission_classes=[permissions.IsAuthenticated])
+    def ranked_applicants(self, request, pk=None):
+        job_listing = self.get_object()
+        if job_listing.posted_by_business.user_manager != request.user and not request.user.is_staff:
+            return Response({"detail": "Only the business manager can view applicants."}, status=status.HTTP_403_FORBIDDEN)
+        page = self.paginate_queryset(get_ranking(job_listing))
+        applications = plan_queryset(JobApplication.objects.all(), JobApplicationSerializer(context={"request": request})).in_bulk(
+            [entry["application_id"] for entry in page]
+        )
+        results = [
+            {
+                "score": entry["score"],
+                "features": entry["features"],
+                "application": JobApplicationSerializer(applications[entry["application_id"]], context={"request": request}).data,
+            }
+            for entry in page
+            if entry["application_id"] in applications
+        ]
+        return self.get_paginated_response(results)
+
+class JobApplicationViewSet(PrefetchPlannerMixin, viewsets.ModelViewSet):
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -122,24 +354,63 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(applicant=self.request.user)
 
-class FundingOpportunityViewSet(viewsets.ModelViewSet):
+class FundingAmountFilterMixin:
+    """?min_amount= and ?max_amount= (e.g. "250k") keep rows whose parsed funding range overlaps them."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if self.action == "list" and ("min_amount" in params or "max_amount" in params):
+            queryset = funding.overlapping(
+                queryset, funding.parse_amount(params.get("min_amount")), funding.parse_amount(params.get("max_amount"))
+            )
+        return queryset
+
+    def matching_response(self, source, candidates):
+        """Paginate the active candidates whose range overlaps source's range."""
+        if source.funding_min is None:
+            return Response({"detail": "The funding amount could not be parsed, so there is nothing to match."}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = funding.overlapping(candidates, source.funding_min, source.funding_max)
+        page = self.paginate_queryset(plan_queryset(queryset, self.matching_serializer_class(context=self.get_serializer_context())))
+        return self.get_paginated_response(self.matching_serializer_class(page, many=True, context=self.get_serializer_context()).data)
+
+class FundingOpportunityViewSet(ResponseCacheMixin, FundingAmountFilterMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = FundingOpportunity.objects.filter(is_active=True).order_by("-posted_at")
+    response_cache_models = [BusinessProfile, User]
     serializer_class = FundingOpportunitySerializer
+    matching_serializer_class = FundingRequestSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsBusinessManagerOrReadOnly]
 
     def perform_create(self, serializer):
         serializer.save()
 
-class FundingRequestViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get"], url_path="matching-requests")
+    def matching_requests(self, request, pk=None):
+        """Active funding requests whose sought amount overlaps this opportunity's range."""
+        opportunity = self.get_object()
+        candidates = FundingRequest.objects.filter(is_active=True).order_by("-requested_at")
+        return self.matching_response(opportunity, candidates)
+
+class FundingRequestViewSet(ResponseCacheMixin, FundingAmountFilterMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = FundingRequest.objects.filter(is_active=True).order_by("-requested_at")
+    response_cache_models = [BusinessProfile, User]
     serializer_class = FundingRequestSerializer
+    matching_serializer_class = FundingOpportunitySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsBusinessManagerOrReadOnly]
 
     def perform_create(self, serializer):
         serializer.save()
 
-class ProfessionalFeedPostViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=["get"], url_path="matching-opportunities")
+    def matching_opportunities(self, request, pk=None):
+        """Active funding opportunities whose range overlaps the amount this request seeks."""
+        funding_request = self.get_object()
+        candidates = FundingOpportunity.objects.filter(is_active=True).order_by("-posted_at")
+        return self.matching_response(funding_request, candidates)
+
+class ProfessionalFeedPostViewSet(ResponseCacheMixin, PrefetchPlannerMixin, viewsets.ModelViewSet):
     queryset = ProfessionalFeedPost.objects.all().order_by("-created_at")
+    response_cache_models = [User]
     serializer_class = ProfessionalFeedPostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
 
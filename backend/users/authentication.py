@@ -0,0 +1,170 @@
+"""
+JWT authentication that resolves users from a per-process cache.
+
+SimpleJWT's JWTAuthentication looks the user up by primary key on every
+request. CachedJWTAuthentication keeps the user's field values in a TTL-bound
+LRU cache and rebuilds a fresh User instance from them on each hit, so
+requests never share a mutable object.
+
+Each entry remembers the user's version, a token in the CACHE_ALIAS cache
+shared by every process (see CACHES in settings), and is only used while that
+token is unchanged: one shared-cache read per request instead of a database
+query. users/signals.py calls invalidate() whenever a user is saved
+(including deactivation and password changes) or deleted, which drops the
+local entry and replaces the shared token immediately and again on commit, so
+every process reloads the user on its next request. Changes made through
+QuerySet.update() send no signal and are seen once the entry's TTL expires.
+
+Views (or actions) that only need request.user.id set token_user_authentication
+= True to get a TokenUser built from the token claims, with no cache or
+database access at all. A TokenUser is not a model instance and is not checked
+for is_active, so a deactivated user keeps reaching those views until the
+access token expires; only views serving non-personal data opt in.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+DEFAULT_CONFIG = {
+    "MAX_SIZE": 10000, # Users kept per process
+    "TTL": 30, # Seconds; bounds staleness for changes made without signals
+    "CACHE_ALIAS": "default", # Holds the per-user versions; must be shared by every process
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "AUTH_USER_CACHE", {}))
+    return config
+
+def _version_key(pk):
+    return f"auth-user:version:{pk}"
+
+def user_version(pk):
+    """The user's shared version token, created if missing or evicted."""
+    cache = caches[get_config()["CACHE_ALIAS"]]
+    version = cache.get(_version_key(pk))
+    if version is None:
+        # Any fresh token differs from what processes have cached
+        cache.add(_version_key(pk), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(pk))
+    return version
+
+def bump_user_version(pk):
+    caches[get_config()["CACHE_ALIAS"]].set(_version_key(pk), uuid.uuid4().hex, None)
+
+class UserCache:
+    """Thread-safe LRU of user field values keyed by primary key, with hit-rate counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # pk -> (expires_at, shared version, field values)
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._generation = 0 # Bumped by invalidate() so loads that raced a save are not cached
+
+    def get(self, pk, version):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pk)
+            if entry is None or entry[0] <= now or entry[1] != version:
+                if entry is not None:
+                    del self._entries[pk]
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(pk)
+            self._counters["hits"] += 1
+            return entry[2]
+
+    def generation(self):
+        return self._generation
+
+    def set(self, pk, values, generation, version):
+        config = get_config()
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[pk] = (time.monotonic() + config["TTL"], version, values)
+            self._entries.move_to_end(pk)
+            while len(self._entries) > config["MAX_SIZE"]:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, pk):
+        """Drop the user here, and in every process through the shared version (now and on commit)."""
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(pk, None) is not None:
+                self._counters["invalidations"] += 1
+        bump_user_version(pk)
+        transaction.on_commit(lambda: bump_user_version(pk))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters["size"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else None
+        return counters
+
+user_cache = UserCache()
+
+def _field_values(user):
+    return tuple(getattr(user, field.attname) for field in user._meta.concrete_fields)
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        view = request.parser_context.get("view") if request.parser_context else None
+        self.token_user_only = getattr(view, "token_user_authentication", False)
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if getattr(self, "token_user_only", False):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        user = self._cached_user(user_id)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
+
+    def _cached_user(self, user_id):
+        fields = self.user_model._meta.concrete_fields
+        lookup_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+        try:
+            key = lookup_field.to_python(user_id)
+        except ValidationError:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if lookup_field.primary_key:
+            version = user_version(key)
+            values = user_cache.get(key, version)
+            if values is not None:
+                return self.user_model.from_db(DEFAULT_DB_ALIAS, [field.attname for field in fields], values)
+        generation = user_cache.generation()
+        try:
+            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: key})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if lookup_field.primary_key:
+            user_cache.set(key, _field_values(user), generation, version)
+        return user
@@ -0,0 +1,110 @@
+"""
+Sections of the /api/users/me/bootstrap/ response, fetched on app launch.
+
+Each section is a plain function of the user that returns JSON-ready data
+with a fixed, small number of queries (profiles come from profile_cache).
+The view runs them concurrently in worker threads; each section then gets
+an ETag so clients can send back what they already have and receive only
+the sections that changed.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.core.serializers.json import DjangoJSONEncoder
+
+from chat_app.models import Message
+from chat_app.serializers import ChatRoomSerializer, MessageSerializer
+from minara_backend.prefetch import plan_queryset
+from personal_app.models import Community, CommunityMembership, Follow
+from personal_app.serializers import CommunitySerializer
+from professional_app.models import BusinessProfile, ProfessionalProfile as DetailedProfessionalProfile
+from professional_app.serializers import BusinessProfileSerializer, ProfessionalProfileSerializer
+from . import profile_cache
+from .models import PersonalProfile
+from .serializers import UserPersonalProfileSerializer
+
+DEFAULT_CONFIG = {
+    "CONCURRENT": True, # Run sections in parallel threads, each with its own database connection
+    "INBOX_SIZE": 20, # Most recently active chat rooms
+    "COMMUNITIES_SIZE": 50,
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "ME_BOOTSTRAP", {}))
+    return config
+
+def personal_profile(user):
+    def render():
+        profile = PersonalProfile.objects.filter(user=user).first()
+        return UserPersonalProfileSerializer(profile).data if profile else None
+    return profile_cache.get_representation(PersonalProfile, user.pk, render)
+
+def professional_profile(user):
+    def render():
+        serializer = ProfessionalProfileSerializer()
+        profile = plan_queryset(DetailedProfessionalProfile.objects.filter(user=user), serializer).first()
+        return ProfessionalProfileSerializer(profile).data if profile else None
+    return profile_cache.get_representation(DetailedProfessionalProfile, user.pk, render)
+
+def business_profiles(user):
+    queryset = plan_queryset(BusinessProfile.objects.filter(user_manager=user).order_by("-created_at"), BusinessProfileSerializer())
+    return BusinessProfileSerializer(queryset, many=True).data
+
+def follow_counts(user):
+    return Follow.objects.filter(Q(followed=user) | Q(follower=user)).aggregate(
+        followers=Count("pk", filter=Q(followed=user)),
+        following=Count("pk", filter=Q(follower=user)),
+    )
+
+def communities(user):
+    memberships = CommunityMembership.objects.filter(user=user)
+    queryset = (
+        Community.objects.filter(pk__in=memberships.values("community_id"))
+        .annotate(
+            num_members=Count("members"), # Read by CommunitySerializer.get_members_count
+            membership_approved=Subquery(memberships.filter(community=OuterRef("pk")).values("is_approved")[:1]),
+        )
+        .order_by("name")
+    )
+    joined = list(plan_queryset(queryset, CommunitySerializer())[:get_config()["COMMUNITIES_SIZE"]])
+    results = []
+    for community, data in zip(joined, CommunitySerializer(joined, many=True).data):
+        data["membership_approved"] = community.membership_approved
+        results.append(data)
+    return results
+
+def chat_inbox(user):
+    latest = Message.objects.filter(room=OuterRef("pk")).order_by("-timestamp", "-pk").values("pk")[:1]
+    rooms = list(
+        plan_queryset(user.chat_rooms.all(), ChatRoomSerializer())
+        .annotate(last_message_id=Subquery(latest))
+        .order_by("-updated_at")[:get_config()["INBOX_SIZE"]]
+    )
+    last_messages = Message.objects.select_related("sender").in_bulk(
+        [room.last_message_id for room in rooms if room.last_message_id]
+    )
+    results = []
+    for room, data in zip(rooms, ChatRoomSerializer(rooms, many=True).data):
+        message = last_messages.get(room.last_message_id)
+        data["last_message"] = MessageSerializer(message).data if message else None
+        results.append(data)
+    return results
+
+SECTIONS = {
+    "personal_profile": personal_profile,
+    "professional_profile": professional_profile,
+    "business_profiles": business_profiles,
+    "follow_counts": follow_counts,
+    "communities": communities,
+    "chat_inbox": chat_inbox,
+}
+
+def section_etag(name, data):
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+    return f'"{name}-{hashlib.sha256(encoded.encode()).hexdigest()[:20]}"'
+
+def parse_if_none_match(header):
+    return {tag.strip().removeprefix("W/") for tag in (header or "").split(",") if tag.strip()}
@@ -0,0 +1,98 @@
+"""
+User cards: the small {"id", "email", "phone_number"} object nested wherever
+an API response mentions a user (authors, senders, applicants, followers...).
+
+UserCardField is the only user serializer nested in responses. It reads the foreign
+key column instead of the related object, and the first time it renders in a
+list it collects the user ids of every row and loads the missing cards with
+one query. Cards are memoized per request (or per top-level serializer when
+there is no request), so a user who appears many times in a response, or in
+several serializers of the same response, is loaded and built once.
+Relations that are already loaded (select_related, prefetched many=True
+relations) are used as they are.
+"""
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+from rest_framework.relations import ManyRelatedField, PKOnlyObject
+
+User = get_user_model()
+
+CARD_FIELDS = ("id", "email", "phone_number")
+
+def user_card(user):
+    return {name: getattr(user, name) for name in CARD_FIELDS}
+
+def _identity_map(field):
+    # The identity map lives on the request so every serializer of a response shares it
+    request = field.context.get("request")
+    holder = request if request is not None else field.root
+    cards = getattr(holder, "_user_cards", None)
+    if cards is None:
+        cards = holder._user_cards = {}
+    return cards
+
+class UserCardField(serializers.PrimaryKeyRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("read_only", True)
+        super().__init__(**kwargs)
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def get_attribute(self, instance):
+        # A user already loaded on the instance is rendered without a query
+        owner = get_attribute(instance, self.source_attrs[:-1])
+        if owner is not None:
+            descriptor = getattr(type(owner), self.source_attrs[-1], None)
+            related = getattr(descriptor, "field", None)
+            if related is not None and related.is_cached(owner):
+                return getattr(owner, self.source_attrs[-1])
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        cards = _identity_map(self)
+        if value.pk not in cards:
+            if isinstance(value, PKOnlyObject):
+                self._load_cards(cards, value.pk)
+            else:
+                cards[value.pk] = user_card(value)
+        card = cards.get(value.pk)
+        return dict(card) if card is not None else None
+
+    def _list_items(self):
+        """(objects of the nearest list being rendered, attribute paths from them to this field's owner)."""
+        node, paths = self, []
+        while node.parent is not None:
+            parent = node.parent
+            if isinstance(parent, ManyRelatedField):
+                return None, None
+            if isinstance(parent, serializers.ListSerializer):
+                # Nested many=True serializers render a related manager we cannot re-read for free
+                items = parent.instance
+                return (items, paths) if isinstance(items, (list, tuple, QuerySet)) else (None, None)
+            if node is not self:
+                paths.insert(0, node.source_attrs)
+            node = parent
+        return None, None
+
+    def _load_cards(self, cards, pk):
+        wanted = {pk}
+        items, paths = self._list_items()
+        # A list serializer reuses one child, and so this field, for every row: collect once per list
+        if items is not None and getattr(self, "_primed_items", None) is not items:
+            self._primed_items = items
+            for item in items:
+                try:
+                    for attrs in paths:
+                        item = get_attribute(item, attrs)
+                    owner = get_attribute(item, self.source_attrs[:-1])
+                except (AttributeError, KeyError, ObjectDoesNotExist):
+                    continue
+                if owner is not None:
+                    wanted.add(owner.serializable_value(self.source_attrs[-1]))
+        wanted = {user_id for user_id in wanted if user_id is not None and user_id not in cards}
+        for user in User.objects.filter(pk__in=wanted).only(*CARD_FIELDS):
+            cards[user.pk] = user_card(user)
@@ -0,0 +1,198 @@
+"""
+Password hashing and verification in a bounded process pool.
+
+Each PBKDF2 hash is a few hundred milliseconds of pure CPU. hashlib releases
+the GIL while it runs, so other threads keep going, but a burst of logins
+still occupies one request thread and one core per hash, and the burst
+competes with every other request on the host for CPU. User.set_password and
+User.check_password send the work here instead: a pool of MAX_WORKERS
+spawned processes, each initialised with django.setup() so they use the
+project's PASSWORD_HASHERS, which caps the cores hashing can take. At most
+MAX_PENDING jobs may be queued or running; beyond that callers get
+HashingPoolSaturated at once rather than queueing behind the burst. The
+login and registration views answer it with 503 and Retry-After, and
+HashingPoolSaturatedMiddleware does the same for other views (admin login).
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.http import HttpResponse
+
+DEFAULT_CONFIG = {
+    "ENABLED": True, # False hashes inline on the calling thread
+    "MAX_WORKERS": 2,
+    "MAX_PENDING": 32, # Jobs queued or running before new ones are rejected
+    "TIMEOUT": 10, # Seconds to wait for a result
+    "RETRY_AFTER": 1, # Seconds, sent with the 503 when saturated
+}
+
+class HashingPoolSaturated(Exception):
+    """Too many hashes queued or running; retry after retry_after seconds."""
+    detail = "The server is busy processing logins. Please try again shortly."
+
+    def __init__(self):
+        super().__init__(self.detail)
+        self.retry_after = get_config()["RETRY_AFTER"]
+
+class HashingPoolSaturatedMiddleware:
+    """Answer HashingPoolSaturated from any view (admin login, auth forms) with 503 and Retry-After."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingPoolSaturated):
+            response = HttpResponse(exception.detail, status=503, content_type="text/plain")
+            response["Retry-After"] = str(exception.retry_after)
+            return response
+        return None
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "PASSWORD_HASHING", {}))
+    return config
+
+def _initialize_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+def _make_password(raw_password):
+    return hashers.make_password(raw_password)
+
+def _verify_password(raw_password, encoded):
+    return hashers.verify_password(raw_password, encoded)
+
+def _new_executor(max_workers):
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "minara_backend.settings"),),
+    )
+
+class HashingPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._max_pending = None
+
+    def _get_executor(self, config):
+        with self._lock:
+            if self._executor is None:
+                self._executor = _new_executor(config["MAX_WORKERS"])
+            if self._max_pending != config["MAX_PENDING"]:
+                self._slots = threading.BoundedSemaphore(config["MAX_PENDING"])
+                self._max_pending = config["MAX_PENDING"]
+            return self._executor, self._slots
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def run(self, function, *args):
+        config = get_config()
+        executor, slots = self._get_executor(config)
+        if not slots.acquire(blocking=False):
+            raise HashingPoolSaturated()
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._reset(executor) # A worker died; the next call starts a fresh pool
+            return function(*args)
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=config["TIMEOUT"])
+        except FutureTimeoutError:
+            # A job still queued is dropped. One already running cannot be interrupted:
+            # it keeps its worker and its slot until the hash finishes, and the result is discarded
+            future.cancel()
+            raise HashingPoolSaturated()
+        except BrokenProcessPool:
+            self._reset(executor)
+            return function(*args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+pool = HashingPool()
+
+def _use_pool(raw_password):
+    # Unusable passwords involve no hashing work
+    return raw_password is not None and get_config()["ENABLED"]
+
+def make_password(raw_password):
+    """Hash raw_password with the configured hasher, in the pool when enabled."""
+    if not _use_pool(raw_password):
+        return hashers.make_password(raw_password)
+    return pool.run(_make_password, raw_password)
+
+def verify_password(raw_password, encoded):
+    """Return (is_correct, must_update) like django.contrib.auth.hashers.verify_password."""
+    if not _use_pool(raw_password) or not hashers.is_password_usable(encoded):
+        return hashers.verify_password(raw_password, encoded)
+    return pool.run(_verify_password, raw_password, encoded)
+
+class BulkHashingPool:
+    """
+    A second long-lived pool, for hashing many passwords at once (bulk provisioning),
+    so a large job never competes with logins for slots in `pool`. Its size is fixed
+    when it starts; a different max_workers replaces it once running jobs finish.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._max_workers = None
+
+    def _get_executor(self, max_workers):
+        with self._lock:
+            if self._executor is not None and self._max_workers != max_workers:
+                self._executor.shutdown(wait=False) # Jobs already submitted still complete
+                self._executor = None
+            if self._executor is None:
+                self._executor = _new_executor(max_workers)
+                self._max_workers = max_workers
+            return self._executor
+
+    def map(self, function, items, max_workers):
+        executor = self._get_executor(max_workers)
+        try:
+            return list(executor.map(function, items, chunksize=max(1, len(items) // (4 * max_workers))))
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            return [function(item) for item in items]
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+bulk_pool = BulkHashingPool()
+
+def default_bulk_workers():
+    # Half the CPUs, leaving the rest to requests and the login pool
+    return max(1, (os.cpu_count() or 2) // 2)
+
+def make_passwords(raw_passwords, max_workers=None):
+    """Hash a batch of passwords, spread over the bulk pool's processes when hashing is enabled."""
+    raw_passwords = list(raw_passwords)
+    if not raw_passwords or not get_config()["ENABLED"]:
+        return [hashers.make_password(raw_password) for raw_password in raw_passwords]
+    return bulk_pool.map(_make_password, raw_passwords, max_workers or default_bulk_workers())
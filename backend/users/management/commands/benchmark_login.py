@@ -0,0 +1,79 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model, hashers
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from users import hashing
+
+User = get_user_model()
+
+PASSWORD = "benchmark-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login password verification throughput with hashing inline on the request threads "
+        "versus in the PASSWORD_HASHING process pool. No database access is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=40, help="Password checks per mode.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Threads issuing checks, like ASGI/threaded workers.")
+        parser.add_argument("--mode", choices=["inline", "pooled", "both"], default="both")
+
+    def handle(self, *args, **options):
+        encoded = hashers.make_password(PASSWORD)
+        modes = ["inline", "pooled"] if options["mode"] == "both" else [options["mode"]]
+        config = hashing.get_config()
+        # Queue every check so the benchmark measures throughput rather than rejections
+        config["MAX_PENDING"] = max(config["MAX_PENDING"], options["logins"])
+        self.stdout.write(
+            f"{options['logins']} logins, {options['concurrency']} threads, "
+            f"{config['MAX_WORKERS']} hashing processes"
+        )
+        try:
+            for mode in modes:
+                with override_settings(PASSWORD_HASHING={**config, "ENABLED": mode == "pooled"}):
+                    if mode == "pooled":
+                        hashing.verify_password(PASSWORD, encoded) # Start the workers outside the timing
+                    self._run(mode, encoded, options["logins"], options["concurrency"])
+        finally:
+            hashing.pool.shutdown()
+
+    def _run(self, mode, encoded, logins, concurrency):
+        stop = threading.Event()
+        stalls = []
+
+        def bystander():
+            # Stands in for other requests on the same worker: how late do 5ms sleeps wake up?
+            while not stop.is_set():
+                started = time.perf_counter()
+                time.sleep(0.005)
+                stalls.append(time.perf_counter() - started - 0.005)
+
+        def login(_):
+            user = User(email="benchmark@example.com", password=encoded)
+            started = time.perf_counter()
+            if not user.check_password(PASSWORD):
+                raise RuntimeError("Password check failed.")
+            return time.perf_counter() - started
+
+        watcher = threading.Thread(target=bystander, daemon=True)
+        watcher.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = sorted(executor.map(login, range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        watcher.join()
+
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"{mode:>7}: {logins / elapsed:7.1f} logins/s, "
+            f"p50 {statistics.median(latencies) * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms, "
+            f"bystander delay mean {statistics.mean(stalls or [0]) * 1000:.1f}ms max {max(stalls or [0]) * 1000:.1f}ms"
+        )
@@ -0,0 +1,95 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from users import provisioning, search
+from users.models import PersonalProfile, ProfessionalProfile, UserSearchTerm
+
+User = get_user_model()
+
+SEED_DOMAIN = "search-benchmark.example.com"
+FIRST_NAMES = ["ana", "ben", "chloé", "david", "elif", "farah", "george", "hana", "ivan", "jade", "kofi", "lena", "marek", "nadia", "omar", "priya", "quinn", "rosa", "sven", "tariq"]
+LAST_NAMES = ["abara", "brown", "castillo", "dubois", "evans", "fischer", "garcia", "huang", "ivanova", "jensen", "kowalski", "lopez", "müller", "nakamura", "okafor", "petrov", "rossi", "silva", "tanaka", "weber"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure typeahead user search latency against the current database, optionally after "
+        f"seeding synthetic users (emails @{SEED_DOMAIN}, removed again with --cleanup)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Synthetic users to create and index first.")
+        parser.add_argument("--queries", type=int, default=2000)
+        parser.add_argument("--limit", type=int, default=None, help="Results per query (capped by USER_SEARCH MAX_RESULTS).")
+        parser.add_argument("--cleanup", action="store_true", help="Delete previously seeded users and exit.")
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            deleted, _ = User.objects.filter(email__endswith=f"@{SEED_DOMAIN}").delete()
+            self.stdout.write(f"Deleted {deleted} rows.")
+            return
+        if options["seed"]:
+            self._seed(options["seed"])
+
+        bounds = UserSearchTerm.objects.aggregate(low=Min("pk"), high=Max("pk"))
+        if bounds["low"] is None:
+            self.stderr.write("The search index is empty; seed users with --seed.")
+            return
+        queries = self._sample_queries(bounds["low"], bounds["high"], options["queries"])
+        search.search_user_ids(queries[0], limit=options["limit"]) # Warm the connection and caches
+
+        latencies, counts = [], []
+        for query in queries:
+            started = time.perf_counter()
+            counts.append(len(search.search_user_ids(query, limit=options["limit"])))
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+        self.stdout.write(
+            f"{User.objects.count()} users, {len(queries)} queries: "
+            f"p50 {percentile(0.5):.2f}ms, p95 {percentile(0.95):.2f}ms, p99 {percentile(0.99):.2f}ms, "
+            f"max {latencies[-1] * 1000:.2f}ms, mean results {statistics.mean(counts):.1f}"
+        )
+
+    def _sample_queries(self, low, high, count):
+        # Prefixes (2-6 characters) of random indexed name terms, like a user part-way through typing
+        queries = []
+        while len(queries) < count:
+            term = (
+                UserSearchTerm.objects.filter(pk__gte=random.randint(low, high))
+                .order_by("pk").values_list("term", flat=True).first()
+            )
+            if term and not term.startswith(search.EXACT_MARKER):
+                queries.append(term[:random.randint(2, 6)])
+        return queries
+
+    def _seed(self, total, batch_size=5000):
+        start = User.objects.filter(email__endswith=f"@{SEED_DOMAIN}").count()
+        password = make_password(None) # Unusable; seeded users never log in
+        created = 0
+        while created < total:
+            numbers = range(start + created, start + min(created + batch_size, total))
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(email=f"user{number}@{SEED_DOMAIN}", phone_number=f"+1999{number:08d}", password=password)
+                    for number in numbers
+                ])
+                PersonalProfile.objects.bulk_create([
+                    PersonalProfile(user_id=user.pk, full_name=f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}".title())
+                    for user in users
+                ])
+                ProfessionalProfile.objects.bulk_create([ProfessionalProfile(user_id=user.pk) for user in users])
+                # Indexes the users and creates their detailed professional profiles, as provisioning does
+                provisioning.users_provisioned.send(sender=User, user_ids=[user.pk for user in users])
+            created += len(numbers)
+            self.stdout.write(f"Seeded {created}/{total} users")
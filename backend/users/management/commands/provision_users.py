@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from minara_backend import row_streams
+from users import provisioning
+
+
+class Command(BaseCommand):
+    help = "Create users from an NDJSON or CSV file (use - for stdin), in chunks, hashing passwords in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=row_streams.FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--chunk-size", type=int, default=None)
+        parser.add_argument("--workers", type=int, default=None, help="Password hashing processes (default: HASH_WORKERS).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or row_streams.detect_format(filename=path)
+        if input_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format.")
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            result = provisioning.provision_users(
+                stream, input_format,
+                chunk_size=options["chunk_size"],
+                hash_workers=options["workers"],
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {result.created} users; {result.failed} rows failed."))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from users.token_blacklist import prune_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired outstanding and blacklisted refresh tokens in bounded batches. "
+        "Safe to run from cron while the site is serving refreshes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Tokens deleted per batch (default: PRUNE_BATCH_SIZE).")
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+
+    def handle(self, *args, **options):
+        deleted = prune_expired(batch_size=options["batch_size"], max_batches=options["max_batches"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens."))
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    # Profile GETs no longer create profiles, so every existing user needs one
+    User = apps.get_model("users", "User")
+    for model_name in ("PersonalProfile", "ProfessionalProfile"):
+        Profile = apps.get_model("users", model_name)
+        missing = User.objects.exclude(pk__in=Profile.objects.values("user_id")).values_list("pk", flat=True)
+        Profile.objects.bulk_create([Profile(user_id=user_id) for user_id in missing.iterator()], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_businessprofile_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.1 on 2026-10-19 02:55
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+import users.models
+from django.conf import settings
+from django.db import migrations, models
+
+# Copy of users.search.terms_for as of this migration, so later changes to it do not change this backfill
+MAX_TERM_LENGTH = 100
+EXACT_MARKER = "="
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def terms_for(email, phone_number, names):
+    terms = set()
+    email = normalize(email).strip()
+    if email:
+        terms.add(EXACT_MARKER + email)
+    digits = "".join(char for char in phone_number or "" if char.isdigit())
+    if digits:
+        terms.add(EXACT_MARKER + digits)
+    for name in names:
+        words = _WORD.findall(normalize(name))
+        terms |= {" ".join(words[index:]) for index in range(len(words))}
+    return {term[:MAX_TERM_LENGTH] for term in terms if term}
+
+
+def index_existing_users(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    UserSearchTerm = apps.get_model("users", "UserSearchTerm")
+    rows = User.objects.filter(is_active=True).values_list(
+        "pk", "email", "phone_number", "personal_profile__full_name", "user_core_professional_profile__full_name",
+    )
+    batch = []
+    for user_id, email, phone_number, *names in rows.iterator(chunk_size=1000):
+        batch.extend(
+            UserSearchTerm(user_id=user_id, term=term)
+            for term in terms_for(email, phone_number, [name for name in names if name])
+        )
+        if len(batch) >= 5000:
+            UserSearchTerm.objects.bulk_create(batch)
+            batch = []
+    UserSearchTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_backfill_profiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', users.models.BytewiseCharField(help_text='Accent-stripped, casefolded term', max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('term', 'user')},
+            },
+        ),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
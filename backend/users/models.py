@@ -1,7 +1,10 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from . import hashing
+
 class UserManager(BaseUserManager):
     def create_user(self, email, phone_number, password=None, **extra_fields):
         if not email:
@@ -37,9 +40,27 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["phone_number"]
 
+    class Meta:
+        # Bulk email matching compares Lower("email") (users/provisioning.py, import_linkedin_exports)
+        indexes = [models.Index(Lower("email"), name="users_user_email_lower_idx")]
+
     def __str__(self):
         return self.email
 
+    # Hashing runs in the bounded process pool from users/hashing.py (create_user, login, password changes)
+    def set_password(self, raw_password):
+        self.password = hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        is_correct, must_update = hashing.verify_password(raw_password, self.password)
+        if is_correct and must_update:
+            # Upgrade hashes made with an old hasher or iteration count
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return is_correct
+
 class PersonalProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="personal_profile")
     full_name = models.CharField(max_length=255, blank=True)
@@ -88,3 +109,28 @@ class BusinessProfile(models.Model):
     def __str__(self):
         return self.company_name
 
+
+class BytewiseCharField(models.CharField):
+    """CharField ordered byte by byte: the "C" collation on PostgreSQL; SQLite's default BINARY already is."""
+
+    def db_parameters(self, connection):
+        params = super().db_parameters(connection)
+        if connection.vendor == "postgresql":
+            params["collation"] = "C"
+        return params
+
+class UserSearchTerm(models.Model):
+    """
+    One normalized term per row (name word suffixes, email, phone digits) for the
+    typeahead search in users/search.py; maintained on save by users/signals.py.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="search_terms")
+    # Prefix searches are range scans, which only equal prefix matches under byte-wise ordering
+    term = BytewiseCharField(max_length=100, help_text="Accent-stripped, casefolded term")
+
+    class Meta:
+        # The (term, user) index serves prefix searches as range scans
+        unique_together = ("term", "user")
+
+    def __str__(self):
+        return f"{self.user_id}: {self.term}"
@@ -0,0 +1,44 @@
+"""
+Cached representations of a user's own profiles for the "my profile" GETs.
+
+Profiles are created once, when the user is created (users/signals.py and
+professional_app/signals.py) or by the data migrations that backfilled older
+users, so the GET endpoints only read. The serialized profile is kept in the
+default cache, which every worker shares (see CACHES in settings), per
+(model, user) until a signal invalidates it or TIMEOUT passes. Invalidation
+deletes the entry at once and again when the transaction commits, so a GET
+served from another worker in between cannot cache the pre-update profile
+for long. Requests using ?fields= or ?expand= bypass the cache.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULT_CONFIG = {
+    "TIMEOUT": 300, # Seconds; a backstop for changes made without signals
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "PROFILE_CACHE", {}))
+    return config
+
+def cache_key(model, user_id):
+    return f"profile:{model._meta.label_lower}:{user_id}"
+
+def cacheable(request):
+    return not ({"fields", "expand"} & set(request.query_params))
+
+def get_representation(model, user_id, render):
+    """Return the cached representation of user_id's model profile, calling render() on a miss."""
+    key = cache_key(model, user_id)
+    data = cache.get(key)
+    if data is None:
+        data = render()
+        cache.set(key, data, get_config()["TIMEOUT"])
+    return data
+
+def invalidate(model, user_ids):
+    keys = [cache_key(model, user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
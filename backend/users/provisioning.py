@@ -0,0 +1,153 @@
+"""
+Bulk user provisioning from NDJSON or CSV uploads.
+
+Rows (email, phone_number, optional password and full_name) are read as a
+stream and handled CHUNK_SIZE at a time. Per chunk, every row is validated on
+its own, duplicates against existing users are found with one query over the
+chunk's emails and phone numbers, passwords are hashed in parallel by the
+long-lived bulk pool in hashing.py, and users and their profiles are written
+with bulk_create. If a user registers between the duplicate check and the
+insert, the chunk is checked again and retried without the conflicting rows.
+
+bulk_create sends no post_save, so the profiles that signals create for a
+registered user are created here, and users_provisioned is sent with the new
+ids for other apps to do the same (professional_app creates the detailed
+professional profile).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.dispatch import Signal
+
+from minara_backend.row_streams import ImportResult, iter_chunks
+
+from . import hashing
+from .models import PersonalProfile, ProfessionalProfile
+from .serializers import UserProvisionRowSerializer
+
+User = get_user_model()
+
+DEFAULT_CONFIG = {
+    "CHUNK_SIZE": 1000,
+    "MAX_ERRORS": 100, # Errors listed in the result; later ones are only counted
+    "HASH_WORKERS": None, # Bulk hashing processes; None uses half the CPUs
+}
+
+# Sent after each chunk is written, with user_ids=[...], inside its transaction
+users_provisioned = Signal()
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "USER_PROVISIONING", {}))
+    return config
+
+def _validate_chunk(chunk, result):
+    valid, emails, phones = [], set(), set()
+    for line, row, error in chunk:
+        if error:
+            result.add_error(line, {"non_field_errors": [error]})
+            continue
+        serializer = UserProvisionRowSerializer(data=row)
+        if not serializer.is_valid():
+            result.add_error(line, serializer.errors)
+            continue
+        data = serializer.validated_data
+        # Repeats within the chunk; earlier chunks are already in the database
+        duplicates = {}
+        if data["email"].lower() in emails:
+            duplicates["email"] = ["Repeats an earlier row."]
+        if data["phone_number"] in phones:
+            duplicates["phone_number"] = ["Repeats an earlier row."]
+        if duplicates:
+            result.add_error(line, duplicates)
+            continue
+        emails.add(data["email"].lower())
+        phones.add(data["phone_number"])
+        valid.append((line, data))
+    return valid
+
+def _existing(emails, phones):
+    # One query per chunk; emails compare case-insensitively like logins do, through
+    # the Lower("email") index on User
+    taken_emails, taken_phones = set(), set()
+    rows = (
+        User.objects.annotate(lower_email=Lower("email"))
+        .filter(Q(lower_email__in=emails) | Q(phone_number__in=phones))
+        .values_list("lower_email", "phone_number")
+    )
+    for email, phone in rows:
+        taken_emails.add(email)
+        taken_phones.add(phone)
+    return taken_emails, taken_phones
+
+def _without_taken(rows, result):
+    """Report rows whose email or phone number already belongs to a user; return the others."""
+    taken_emails, taken_phones = _existing(
+        {data["email"].lower() for _, data in rows}, {data["phone_number"] for _, data in rows}
+    )
+    available = []
+    for line, data in rows:
+        duplicates = {}
+        if data["email"].lower() in taken_emails:
+            duplicates["email"] = ["A user with this email already exists."]
+        if data["phone_number"] in taken_phones:
+            duplicates["phone_number"] = ["A user with this phone number already exists."]
+        if duplicates:
+            result.add_error(line, duplicates)
+        else:
+            available.append((line, data))
+    return available
+
+def _write_users(users, rows):
+    with transaction.atomic():
+        users = User.objects.bulk_create(users)
+        user_ids = [user.pk for user in users]
+        PersonalProfile.objects.bulk_create([
+            PersonalProfile(user_id=user.pk, full_name=data.get("full_name", ""))
+            for user, (_, data) in zip(users, rows)
+        ])
+        ProfessionalProfile.objects.bulk_create([ProfessionalProfile(user_id=pk) for pk in user_ids])
+        users_provisioned.send(sender=User, user_ids=user_ids)
+    return user_ids
+
+def _provision_chunk(chunk, hash_workers, result):
+    valid = _validate_chunk(chunk, result)
+    rows = _without_taken(valid, result) if valid else []
+    if not rows:
+        return
+
+    with_password = [index for index, (_, data) in enumerate(rows) if data.get("password")]
+    hashed = dict(zip(with_password, hashing.make_passwords([rows[index][1]["password"] for index in with_password], hash_workers)))
+    users = {}
+    for index, (line, data) in enumerate(rows):
+        user = User(email=data["email"], phone_number=data["phone_number"])
+        if index in hashed:
+            user.password = hashed[index]
+        else:
+            user.set_unusable_password()
+        users[line] = user
+
+    try:
+        try:
+            user_ids = _write_users([users[line] for line, _ in rows], rows)
+        except IntegrityError:
+            # A user registered between the duplicate check and the insert: check again
+            # and retry once without the rows that now conflict
+            rows = _without_taken(rows, result)
+            user_ids = _write_users([users[line] for line, _ in rows], rows) if rows else []
+    except DatabaseError as exc:
+        for line, _ in rows:
+            result.add_error(line, {"non_field_errors": [f"Could not create user: {exc}"]})
+        return
+    result.created += len(user_ids)
+    result.ids.extend(user_ids)
+
+def provision_users(stream, input_format, chunk_size=None, max_errors=None, hash_workers=None):
+    """Create users from an NDJSON or CSV stream and return an ImportResult."""
+    config = get_config()
+    result = ImportResult(max_errors=max_errors)
+    for chunk in iter_chunks(stream, input_format, chunk_size or config["CHUNK_SIZE"]):
+        _provision_chunk(chunk, hash_workers or config["HASH_WORKERS"], result)
+    return result
@@ -0,0 +1,158 @@
+"""
+Typeahead search for users by name, and lookup by exact email or phone number.
+
+Every user is reduced to a handful of normalized terms stored in
+UserSearchTerm: each word suffix of their personal and professional full
+names ("mary jane smith", "jane smith", "smith"), plus their full email and
+the digits of their phone number, each behind EXACT_MARKER. A name query is
+normalized the same way and answered by one range scan over the (term, user)
+index: term >= query and term < query with its last character bumped. That
+costs the same at a million users as at a thousand, and the result cap bounds
+how many index entries are read. The range only equals a prefix match under
+byte-wise ordering, which the term column has (BytewiseCharField).
+
+Emails and phone numbers only match in full, and results carry just the id
+and display name, so typing a few characters never reveals anyone's contact
+details. EXACT_MARKER cannot start a name term, so name prefixes never reach
+them.
+
+Terms are rewritten by the receivers in users/signals.py whenever a user or
+one of their profile names changes; inactive users have no terms.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import UserSearchTerm
+
+User = get_user_model()
+
+DEFAULT_CONFIG = {
+    "MAX_RESULTS": 10, # Cap on users returned per query, whatever limit the client asks for
+    "MIN_QUERY_LENGTH": 2, # Shorter (normalized) queries return nothing
+}
+
+MAX_TERM_LENGTH = UserSearchTerm._meta.get_field("term").max_length
+
+# Rows read per result: a user can match through several name terms
+CANDIDATES_PER_RESULT = 4
+
+# Starts the email and phone terms; name terms start with a letter or digit
+EXACT_MARKER = "="
+
+_WORD = re.compile(r"[^\W_]+", re.UNICODE)
+_PHONE = re.compile(r"[\d\s+().-]+")
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "USER_SEARCH", {}))
+    return config
+
+def normalize(text):
+    """Strip accents and casefold, so "José" and "jose" index alike."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def _word_suffixes(text):
+    words = _WORD.findall(normalize(text))
+    return {" ".join(words[index:]) for index in range(len(words))}
+
+def _digits(text):
+    return "".join(char for char in text or "" if char.isdigit())
+
+def terms_for(email, phone_number, names):
+    terms = set()
+    email = normalize(email).strip()
+    if email:
+        terms.add(EXACT_MARKER + email)
+    digits = _digits(phone_number)
+    if digits:
+        terms.add(EXACT_MARKER + digits)
+    for name in names:
+        terms |= _word_suffixes(name)
+    return {term[:MAX_TERM_LENGTH] for term in terms if term}
+
+def query_term(query):
+    """Normalize a typed query the way terms_for normalizes what it matches; emails and phone numbers get EXACT_MARKER."""
+    query = normalize(query).strip()
+    if "@" in query:
+        return EXACT_MARKER + "".join(query.split())
+    if _PHONE.fullmatch(query) and any(char.isdigit() for char in query):
+        return EXACT_MARKER + _digits(query)
+    return " ".join(_WORD.findall(query))
+
+def _prefix_range(prefix):
+    # Every string starting with prefix sorts in [prefix, upper)
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def search_user_ids(query, limit=None, exclude_user_id=None):
+    """
+    Ids of up to `limit` (at most MAX_RESULTS) users with a name term starting with the
+    query, closest terms first, or with exactly the queried email or phone number.
+    """
+    config = get_config()
+    term = query_term(query)[:MAX_TERM_LENGTH]
+    if len(term.removeprefix(EXACT_MARKER)) < config["MIN_QUERY_LENGTH"]:
+        return []
+    limit = min(limit or config["MAX_RESULTS"], config["MAX_RESULTS"])
+    if term.startswith(EXACT_MARKER):
+        terms = UserSearchTerm.objects.filter(term=term)
+    else:
+        lower, upper = _prefix_range(term)
+        terms = UserSearchTerm.objects.filter(term__gte=lower, term__lt=upper)
+    rows = terms.order_by("term", "user_id").values_list("user_id", flat=True)[:(limit + 1) * CANDIDATES_PER_RESULT]
+    user_ids = [user_id for user_id in dict.fromkeys(rows) if user_id != exclude_user_id]
+    return user_ids[:limit]
+
+def search_results(user_ids):
+    """Id and display name of the given users, in the same order, with one query."""
+    rows = User.objects.filter(pk__in=user_ids).values_list(
+        "pk", "personal_profile__full_name", "user_core_professional_profile__full_name",
+    )
+    names = {user_id: personal_name or professional_name or "" for user_id, personal_name, professional_name in rows}
+    return [{"id": user_id, "full_name": names[user_id]} for user_id in user_ids if user_id in names]
+
+def index_users(user_ids):
+    """Bring the search terms of the given users up to date, writing only what changed."""
+    user_ids = set(user_ids)
+    wanted = defaultdict(set)
+    rows = User.objects.filter(pk__in=user_ids, is_active=True).values_list(
+        "pk", "email", "phone_number", "personal_profile__full_name", "user_core_professional_profile__full_name",
+    )
+    for user_id, email, phone_number, *names in rows:
+        wanted[user_id] = terms_for(email, phone_number, [name for name in names if name])
+
+    stale = []
+    for pk, user_id, term in UserSearchTerm.objects.filter(user_id__in=user_ids).values_list("pk", "user_id", "term"):
+        if term in wanted[user_id]:
+            wanted[user_id].discard(term)
+        else:
+            stale.append(pk)
+    with transaction.atomic():
+        if stale:
+            UserSearchTerm.objects.filter(pk__in=stale).delete()
+        UserSearchTerm.objects.bulk_create(
+            [UserSearchTerm(user_id=user_id, term=term) for user_id, terms in wanted.items() for term in terms],
+            batch_size=1000,
+            ignore_conflicts=True, # A concurrent save of the same user may have written them first
+        )
+
+def rebuild_index(batch_size=1000):
+    """Re-index every user in batches; returns the number of users processed."""
+    processed = 0
+    user_ids = User.objects.order_by("pk").values_list("pk", flat=True)
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=batch_size):
+        batch.append(user_id)
+        if len(batch) == batch_size:
+            index_users(batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        index_users(batch)
+        processed += len(batch)
+    return processed
@@ -1,17 +1,15 @@
 from rest_framework import serializers
 from .models import User, PersonalProfile, ProfessionalProfile, BusinessProfile
 from django.contrib.auth import authenticate, get_user_model
+from minara_backend.fieldsets import SparseFieldsetsMixin
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .token_blacklist import BloomRefreshToken, blacklist_filter, rotation_confirms_blacklist
 
 # Get the User model class
 UserModel = get_user_model()
 
-# LightUserSerializer for basic user info, to be used in other apps
-class LightUserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = UserModel
-        fields = ["id", "email", "phone_number"] # Adjust as needed
-        read_only_fields = fields
-
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={"input_type": "password"})
     password2 = serializers.CharField(write_only=True, required=True, label="Confirm password", style={"input_type": "password"})
@@ -31,11 +29,20 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop("password2")
         user = UserModel.objects.create_user(**validated_data)
-        PersonalProfile.objects.create(user=user)
-        # ProfessionalProfile is created via its own endpoint or signal if needed
+        # Personal and professional profiles are created by post_save signals
         # BusinessProfile is created via its own endpoint
         return user
 
+class UserProvisionRowSerializer(serializers.Serializer):
+    """Validates one row of a bulk user provisioning upload (see users/provisioning.py)."""
+    email = serializers.EmailField()
+    phone_number = serializers.CharField(max_length=20)
+    password = serializers.CharField(required=False, trim_whitespace=False) # Omitted: the user gets an unusable password
+    full_name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    def validate_email(self, value):
+        return UserModel.objects.normalize_email(value)
+
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField(label="Email Address")
     password = serializers.CharField(
@@ -60,14 +67,40 @@ class UserLoginSerializer(serializers.Serializer):
         attrs["user"] = user
         return attrs
 
+class BlacklistFilteredTokenRefreshSerializer(TokenRefreshSerializer):
+    """TokenRefreshSerializer whose blacklist check goes through the Bloom filter in token_blacklist.py."""
+    token_class = BloomRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = UserModel.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first() if user_id else None
+        if user_id and not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if rotation_confirms_blacklist():
+                _, created = refresh.blacklist()
+                if not created:
+                    # Already blacklisted: the filter skipped the read, the write caught the reuse
+                    raise InvalidToken("Token is blacklisted")
+                blacklist_filter.add(refresh.payload[api_settings.JTI_CLAIM])
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
 # Detailed Profile Serializers (used within the users app for profile management if needed)
-class UserPersonalProfileSerializer(serializers.ModelSerializer):
+class UserPersonalProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = PersonalProfile
         fields = "__all__"
         read_only_fields = ["user"]
 
-class UserProfessionalProfileSerializer(serializers.ModelSerializer):
+class UserProfessionalProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     # This serializer is for the ProfessionalProfile model within the users app (if it exists there)
     # The main ProfessionalProfileSerializer is in professional_app/serializers.py
     class Meta:
@@ -75,7 +108,7 @@ class UserProfessionalProfileSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ["user"]
 
-class UserBusinessProfileSerializer(serializers.ModelSerializer):
+class UserBusinessProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     # This serializer is for the BusinessProfile model within the users app (if it exists there)
     # The main BusinessProfileSerializer is in professional_app/serializers.py
     class Meta:
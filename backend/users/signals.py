@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from minara_backend import response_cache
+from . import profile_cache, search
+from .authentication import user_cache
+from .cards import CARD_FIELDS
+from .models import PersonalProfile, ProfessionalProfile
+from .provisioning import users_provisioned
+
+# Authenticated-user cache (users/authentication.py)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, created=False, update_fields=None, **kwargs):
+    # update_last_login saves only last_login, which authentication does not depend on
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    user_cache.invalidate(instance.pk)
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_deleted_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+# Profiles exist from registration on, so profile reads never have to create them
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_profiles(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        PersonalProfile.objects.create(user=instance)
+        ProfessionalProfile.objects.create(user=instance)
+
+# Cached "my profile" representations (users/profile_cache.py)
+@receiver(post_save, sender=PersonalProfile)
+@receiver(post_save, sender=ProfessionalProfile)
+@receiver(post_delete, sender=PersonalProfile)
+@receiver(post_delete, sender=ProfessionalProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    profile_cache.invalidate(sender, [instance.user_id])
+
+# Typeahead search terms (users/search.py)
+SEARCHED_USER_FIELDS = {"email", "phone_number", "is_active"}
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def index_user_search_terms(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SEARCHED_USER_FIELDS & set(update_fields)):
+        return
+    search.index_users([instance.pk])
+
+@receiver(post_save, sender=PersonalProfile)
+@receiver(post_save, sender=ProfessionalProfile)
+def index_profile_name(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Profiles created blank at registration add no terms
+    if raw or (created and not instance.full_name):
+        return
+    if update_fields is not None and "full_name" not in update_fields:
+        return
+    search.index_users([instance.user_id])
+
+@receiver(users_provisioned)
+def index_provisioned_users(sender, user_ids, **kwargs):
+    search.index_users(user_ids)
+
+# Cached responses nesting user cards (minara_backend/response_cache.py)
+# Only the card fields appear in responses; logins, rehashes and other saves leave them alone
+RENDERED_USER_FIELDS = [name for name in CARD_FIELDS if name != "id"]
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_user_card(sender, instance, **kwargs):
+    # Read __dict__ so deferred fields are not loaded; they stay missing and count as changed
+    instance._card_original = {name: instance.__dict__[name] for name in RENDERED_USER_FIELDS if name in instance.__dict__}
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_user_response_cache_version(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not set(RENDERED_USER_FIELDS) & set(update_fields)):
+        return
+    original = getattr(instance, "_card_original", {})
+    instance._card_original = {name: getattr(instance, name) for name in RENDERED_USER_FIELDS}
+    # A new user is in no cached response yet
+    if not created and instance._card_original != original:
+        response_cache.bump_versions(sender)
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_deleted_user_response_cache_version(sender, **kwargs):
+    response_cache.bump_versions(sender)
@@ -1,3 +1,577 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from professional_app.models import BusinessProfile, JobListing, ProfessionalFeedPost, ProfessionalProfile as DetailedProfessionalProfile
+from professional_app.serializers import JobListingSerializer, ProfessionalFeedPostSerializer
+
+from . import authentication, hashing, profile_cache, provisioning, search, token_blacklist
+from .models import PersonalProfile, ProfessionalProfile
+
+User = get_user_model()
+
+INLINE = {"ENABLED": False}
+SATURATED = {"MAX_PENDING": 0} # Every job is rejected before it is queued
+
+
+class PooledPasswordHashingTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        hashing.pool.shutdown()
+        super().tearDownClass()
+
+    def test_hash_and_check_in_worker_processes(self):
+        user = User.objects.create_user(email="pooled@example.com", phone_number="1100", password="correct horse")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(user.check_password("correct horse"))
+        self.assertFalse(user.check_password("wrong horse"))
+        self.assertIsNotNone(hashing.pool._executor)
+
+    @override_settings(PASSWORD_HASHING=SATURATED)
+    def test_saturation_is_a_plain_exception(self):
+        user = User(email="busy@example.com", phone_number="1101")
+        with self.assertRaises(hashing.HashingPoolSaturated):
+            user.set_password("correct horse")
+        user.set_password(None) # Unusable passwords skip the pool
+        self.assertFalse(user.has_usable_password())
+
+
+class HashingSaturationResponseTests(APITestCase):
+    def setUp(self):
+        with override_settings(PASSWORD_HASHING=INLINE):
+            self.user = User.objects.create_user(
+                email="staff@example.com", phone_number="1102", password="correct horse", is_staff=True,
+            )
+
+    def assertRetryLater(self, response):
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], str(hashing.get_config()["RETRY_AFTER"]))
+
+    @override_settings(PASSWORD_HASHING=SATURATED)
+    def test_login(self):
+        response = self.client.post("/api/users/login/", {"email": "staff@example.com", "password": "correct horse"})
+        self.assertRetryLater(response)
+        self.assertEqual(response.data["detail"], hashing.HashingPoolSaturated.detail)
+
+    @override_settings(PASSWORD_HASHING=SATURATED)
+    def test_registration(self):
+        response = self.client.post("/api/users/register/", {
+            "email": "new@example.com", "phone_number": "1103", "password": "correct horse", "password2": "correct horse",
+        })
+        self.assertRetryLater(response)
+        self.assertFalse(User.objects.filter(email="new@example.com").exists())
+
+    @override_settings(PASSWORD_HASHING=SATURATED)
+    def test_admin_login_through_middleware(self):
+        response = self.client.post("/admin/login/", {"username": "staff@example.com", "password": "correct horse"})
+        self.assertRetryLater(response)
+
+
+class ProfileCacheTests(APITestCase):
+    urls = {
+        PersonalProfile: "/api/users/personal-profile/",
+        DetailedProfessionalProfile: "/api/professional/profiles/professional/me/",
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="owner@example.com", phone_number="1200", password=None)
+        self.client.force_authenticate(self.user)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, [query["sql"] for query in context.captured_queries]
+
+    def test_reads_never_write_and_repeat_reads_are_cached(self):
+        for model, url in self.urls.items():
+            with self.subTest(model=model.__name__):
+                first, queries = self.get(url)
+                self.assertFalse([sql for sql in queries if sql.startswith(("INSERT", "UPDATE"))])
+                second, queries = self.get(url)
+                self.assertEqual(queries, [])
+                self.assertEqual(second.data, first.data)
+
+    def test_update_invalidates(self):
+        url = self.urls[PersonalProfile]
+        self.get(url)
+        response = self.client.patch(url, {"bio": "Hello"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get(url)[0].data["bio"], "Hello")
+
+        self.get(self.urls[DetailedProfessionalProfile])
+        profile = DetailedProfessionalProfile.objects.get(user=self.user)
+        profile.headline = "Engineer"
+        profile.save()
+        self.assertEqual(self.get(self.urls[DetailedProfessionalProfile])[0].data["headline"], "Engineer")
+
+    def test_invalidated_again_on_commit(self):
+        key = profile_cache.cache_key(PersonalProfile, self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile_cache.invalidate(PersonalProfile, [self.user.pk])
+            cache.set(key, {"bio": "stale"}) # Another worker rendering before the write commits
+        self.assertIsNone(cache.get(key))
+
+
+# Sections run on the test's own connection: worker threads could not see its uncommitted rows
+@override_settings(ME_BOOTSTRAP={"CONCURRENT": False})
+class MeBootstrapTests(APITestCase):
+    url = "/api/users/me/bootstrap/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="launch@example.com", phone_number="1300", password=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+
+    def test_all_sections(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        sections = response.json()["sections"]
+        self.assertEqual(set(sections), {
+            "personal_profile", "professional_profile", "business_profiles", "follow_counts", "communities", "chat_inbox",
+        })
+        self.assertEqual(sections["follow_counts"]["data"], {"followers": 0, "following": 0})
+        self.assertEqual(response["Vary"], "Authorization")
+
+    def test_sections_parameter(self):
+        response = self.client.get(self.url, {"sections": "follow_counts, personal_profile"})
+        self.assertEqual(list(response.json()["sections"]), ["follow_counts", "personal_profile"])
+        response = self.client.get(self.url, {"sections": "follow_counts,inbox"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Unknown sections: inbox."})
+
+    def test_etag_round_trip(self):
+        first = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        profile_etag = first.json()["sections"]["personal_profile"]["etag"]
+        PersonalProfile.objects.filter(user=self.user).update(bio="Changed")
+        profile_cache.invalidate(PersonalProfile, [self.user.pk])
+        follow_etag = first.json()["sections"]["follow_counts"]["etag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'{first["ETag"]}, W/{follow_etag}, {profile_etag}')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        sections = response.json()["sections"]
+        self.assertEqual(sections["follow_counts"], {"etag": follow_etag, "not_modified": True})
+        self.assertEqual(sections["personal_profile"]["data"]["bio"], "Changed")
+
+    def test_authentication_errors_match_drf(self):
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Authentication credentials were not provided."})
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+        self.assertIsInstance(response.json()["messages"], list)
+        self.assertIn("WWW-Authenticate", response)
+
+
+class BulkProvisioningTests(APITestCase):
+    url = "/api/users/bulk-provision/"
+
+    @classmethod
+    def tearDownClass(cls):
+        hashing.bulk_pool.shutdown()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.admin = User.objects.create_user(email="admin@example.com", phone_number="1400", password=None, is_staff=True)
+        self.client.force_authenticate(self.admin)
+
+    def post(self, body, content_type):
+        return self.client.generic("POST", self.url, body, content_type=content_type)
+
+    def test_ndjson_with_duplicates_reported_by_line(self):
+        body = "\n".join([
+            '{"email": "ada@example.com", "phone_number": "1401", "full_name": "Ada Lovelace"}',
+            '{"email": "ADA@example.com", "phone_number": "1402"}', # Repeats line 1, ignoring case
+            '{"email": "Admin@Example.com", "phone_number": "1403"}', # Existing user
+            '{"email": "grace@example.com", "phone_number": "1400"}', # Existing phone number
+            '{"email": "bad", "phone_number": "1404"}',
+            '{"email": "alan@example.com", "phone_number": "1405", "password": "correct horse"}',
+        ])
+        response = self.post(body, "application/x-ndjson")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5])
+        self.assertEqual(errors[2], {"email": ["Repeats an earlier row."]})
+        self.assertEqual(errors[3], {"email": ["A user with this email already exists."]})
+        self.assertEqual(errors[4], {"phone_number": ["A user with this phone number already exists."]})
+        self.assertIn("email", errors[5])
+
+        ada, alan = User.objects.get(email="ada@example.com"), User.objects.get(email="alan@example.com")
+        self.assertFalse(ada.has_usable_password())
+        self.assertTrue(alan.check_password("correct horse"))
+
+    def test_csv_creates_profiles_for_every_user(self):
+        body = "email,phone_number,full_name\r\nmary@example.com,1410,Mary Jackson\r\nkatherine@example.com,1411,\r\n"
+        response = self.post(body, "text/csv")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        user_ids = User.objects.filter(email__in=["mary@example.com", "katherine@example.com"]).values_list("pk", flat=True)
+        self.assertEqual(PersonalProfile.objects.get(user__email="mary@example.com").full_name, "Mary Jackson")
+        self.assertEqual(PersonalProfile.objects.filter(user__in=user_ids).count(), 2)
+        self.assertEqual(ProfessionalProfile.objects.filter(user__in=user_ids).count(), 2)
+        self.assertEqual(DetailedProfessionalProfile.objects.filter(user__in=user_ids).count(), 2)
+
+    def test_unknown_format_and_permissions(self):
+        self.assertEqual(self.post("x", "text/plain").status_code, 400)
+        self.client.force_authenticate(User.objects.create_user(email="user@example.com", phone_number="1420", password=None))
+        self.assertEqual(self.post('{"email": "x@example.com", "phone_number": "1"}', "application/x-ndjson").status_code, 403)
+
+    @skipUnless(connection.vendor == "sqlite", "Reads the SQLite query plan")
+    def test_duplicate_check_uses_the_lower_email_index(self):
+        with CaptureQueriesContext(connection) as context:
+            provisioning._existing({"admin@example.com"}, {"1499"})
+        sql = context.captured_queries[0]["sql"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("users_user_email_lower_idx", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_multipart_upload_needs_a_file(self):
+        response = self.client.post(self.url, {"other": "x"}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"detail": "Upload the users file in the \"file\" field."})
+
+    def test_chunk_is_retried_without_rows_registered_meanwhile(self):
+        existing = provisioning._existing
+        checks = []
+
+        def racing_existing(emails, phones):
+            checks.append(emails)
+            if len(checks) == 1:
+                # Someone registers after the duplicate check, before the insert
+                User.objects.create_user(email="late@example.com", phone_number="1431", password=None)
+                return set(), set()
+            return existing(emails, phones)
+
+        body = '{"email": "late@example.com", "phone_number": "1430"}\n{"email": "early@example.com", "phone_number": "1432"}'
+        with mock.patch.object(provisioning, "_existing", racing_existing):
+            result = provisioning.provision_users(body.encode().splitlines(keepends=True), "ndjson")
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.errors, [{"line": 1, "errors": {"email": ["A user with this email already exists."]}}])
+        self.assertTrue(User.objects.filter(email="early@example.com").exists())
+
+
+class UserCardTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(email="alice@example.com", phone_number="1500", password=None)
+        self.bob = User.objects.create_user(email="bob@example.com", phone_number="1501", password=None)
+        for author in [self.alice, self.bob, self.alice, self.alice, self.bob]:
+            ProfessionalFeedPost.objects.create(author=author, content="Hello")
+        for name, manager in [("Acme", self.alice), ("Globex", self.alice), ("Initech", self.bob)]:
+            business = BusinessProfile.objects.create(user_manager=manager, company_name=name)
+            JobListing.objects.create(posted_by_business=business, title="Engineer", description="Build")
+
+    def user_queries(self, render):
+        with CaptureQueriesContext(connection) as context:
+            data = render()
+        return data, [query for query in context.captured_queries if 'FROM "users_user"' in query["sql"]]
+
+    def test_list_loads_repeated_users_with_one_query(self):
+        posts = list(ProfessionalFeedPost.objects.order_by("pk"))
+        data, queries = self.user_queries(lambda: ProfessionalFeedPostSerializer(posts, many=True).data)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([post["author"]["email"] for post in data], [
+            "alice@example.com", "bob@example.com", "alice@example.com", "alice@example.com", "bob@example.com",
+        ])
+        self.assertEqual(data[0]["author"], {"id": self.alice.pk, "email": "alice@example.com", "phone_number": "1500"})
+
+    def test_nested_users_are_collected_through_the_parent_serializer(self):
+        listings = list(JobListing.objects.select_related("posted_by_business").prefetch_related("required_skills").order_by("pk"))
+        data, queries = self.user_queries(lambda: JobListingSerializer(listings, many=True).data)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([listing["posted_by_business"]["user_manager"]["id"] for listing in data], [self.alice.pk, self.alice.pk, self.bob.pk])
+
+    def test_cards_are_shared_by_the_serializers_of_one_request(self):
+        context = {"request": APIRequestFactory().get("/")}
+        posts = list(ProfessionalFeedPost.objects.order_by("pk"))
+        listings = list(JobListing.objects.select_related("posted_by_business").prefetch_related("required_skills"))
+        ProfessionalFeedPostSerializer(posts, many=True, context=context).data
+        _, queries = self.user_queries(lambda: JobListingSerializer(listings, many=True, context=context).data)
+        self.assertEqual(queries, [])
+
+    def test_already_loaded_users_need_no_query(self):
+        posts = list(ProfessionalFeedPost.objects.select_related("author").order_by("pk"))
+        data, queries = self.user_queries(lambda: ProfessionalFeedPostSerializer(posts, many=True).data)
+        self.assertEqual(queries, [])
+        self.assertEqual(data[1]["author"]["email"], "bob@example.com")
+        post = ProfessionalFeedPost.objects.select_related("author").first()
+        self.assertEqual(self.user_queries(lambda: ProfessionalFeedPostSerializer(post).data)[1], [])
+
+
+class UserSearchTests(APITestCase):
+    def setUp(self):
+        self.mary = self.user("mary@example.com", "+1 (555) 010-2000", "María José Núñez")
+        self.marek = self.user("marek@example.com", "555 0103", "Marek Kowalski")
+        self.admin = self.user("admin@example.com", "5550104", "Ada Lovelace")
+
+    def user(self, email, phone_number, full_name):
+        user = User.objects.create_user(email=email, phone_number=phone_number, password=None)
+        profile = user.personal_profile
+        profile.full_name = full_name
+        profile.save()
+        return user
+
+    def test_queries_are_normalized_like_terms(self):
+        self.assertEqual(search.normalize("José ÑÚÑEZ"), "jose nunez")
+        self.assertEqual(search.query_term("  María   José "), "maria jose")
+        self.assertEqual(search.query_term("+1 (555) 010-2000"), "=15550102000")
+        self.assertEqual(search.query_term("Mary@Example.com"), "=mary@example.com")
+        self.assertEqual(
+            search.terms_for("Mary@Example.com", "+1 555", ["María Núñez"]),
+            {"=mary@example.com", "=1555", "maria nunez", "nunez"},
+        )
+
+    def test_prefix_range_covers_exactly_the_prefix(self):
+        lower, upper = search._prefix_range("mar")
+        self.assertEqual(lower, "mar")
+        for term in ["mar", "mar ", "maria", "marz"]:
+            self.assertTrue(lower <= term < upper, term)
+        for term in ["ma", "mas", "masa"]:
+            self.assertFalse(lower <= term < upper, term)
+
+    def test_name_prefixes_match_any_word(self):
+        self.assertEqual(search.search_user_ids("mar"), [self.marek.pk, self.mary.pk])
+        self.assertEqual(search.search_user_ids("nun"), [self.mary.pk])
+        self.assertEqual(search.search_user_ids("Jose N"), [self.mary.pk])
+        self.assertEqual(search.search_user_ids("m"), []) # Shorter than MIN_QUERY_LENGTH
+
+    def test_emails_and_phone_numbers_only_match_in_full(self):
+        self.assertEqual(search.search_user_ids("ad"), [self.admin.pk]) # Through "Ada", not the email
+        self.assertEqual(search.search_user_ids("admin@"), [])
+        self.assertEqual(search.search_user_ids("admin@example.co"), [])
+        self.assertEqual(search.search_user_ids("Admin@Example.com"), [self.admin.pk])
+        self.assertEqual(search.search_user_ids("555"), [])
+        self.assertEqual(search.search_user_ids("555-0103"), [self.marek.pk])
+
+    def test_inactive_users_and_the_requester_are_excluded(self):
+        self.marek.is_active = False
+        self.marek.save()
+        self.assertEqual(search.search_user_ids("mar"), [self.mary.pk])
+        self.assertEqual(search.search_user_ids("mar", exclude_user_id=self.mary.pk), [])
+        self.marek.is_active = True
+        self.marek.save()
+        self.assertEqual(search.search_user_ids("mar"), [self.marek.pk, self.mary.pk])
+
+    def test_endpoint_returns_only_ids_and_names(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.admin).access_token}")
+        response = self.client.get("/api/users/search/", {"q": "mar"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [
+            {"id": self.marek.pk, "full_name": "Marek Kowalski"},
+            {"id": self.mary.pk, "full_name": "María José Núñez"},
+        ])
+        self.assertEqual(self.client.get("/api/users/search/", {"q": "ada"}).data, []) # The requester
+        self.assertEqual(self.client.get("/api/users/search/", {"q": "mar", "limit": "x"}).status_code, 400)
+
+
+class TokenBlacklistFilterTests(APITestCase):
+    URL = "/api/users/token/refresh/"
+
+    def setUp(self):
+        token_blacklist.blacklist_filter.reset()
+        self.user = User.objects.create_user(email="refresher@example.com", phone_number="1900", password=None)
+
+    def tearDown(self):
+        token_blacklist.blacklist_filter.reset()
+
+    def blacklist_reads(self, use):
+        with CaptureQueriesContext(connection) as context:
+            use()
+        return [query for query in context.captured_queries if 'FROM "token_blacklist_blacklistedtoken"' in query["sql"]]
+
+    def expired_token(self, jti):
+        return OutstandingToken.objects.create(user=self.user, jti=jti, token=jti, expires_at=timezone.now() - timedelta(days=1))
+
+    def test_filter_skips_the_blacklist_read_for_unknown_tokens(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        token_blacklist.blacklist_filter.might_contain("warm-up") # Builds the filter
+        self.assertEqual(self.blacklist_reads(lambda: token_blacklist.BloomRefreshToken(refresh)), [])
+
+        token_blacklist.BloomRefreshToken(refresh).blacklist()
+        token_blacklist.blacklist_filter.add(RefreshToken(refresh, verify=False)["jti"])
+        with self.assertRaises(TokenError):
+            token_blacklist.BloomRefreshToken(refresh)
+
+    def test_reused_refresh_token_is_refused_by_the_blacklist_write(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        token_blacklist.blacklist_filter.might_contain("warm-up")
+        # The filter never learns about the rotation, as in another process before its next sync
+        with mock.patch.object(token_blacklist.blacklist_filter, "add"):
+            first = self.client.post(self.URL, {"refresh": refresh})
+            self.assertEqual(first.status_code, 200)
+            self.assertIn("refresh", first.data)
+            reused = self.client.post(self.URL, {"refresh": refresh})
+        self.assertEqual(reused.status_code, 401)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        self.assertEqual(self.client.post(self.URL, {"refresh": first.data["refresh"]}).status_code, 200)
+
+    def test_blacklist_is_always_read_when_rotation_does_not_blacklist(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        token_blacklist.blacklist_filter.might_contain("warm-up")
+        RefreshToken(refresh).blacklist() # Not in the built filter
+        self.assertTrue(token_blacklist.rotation_confirms_blacklist())
+        token_blacklist.BloomRefreshToken(refresh) # Skipped: rotation would catch the reuse
+
+        # simplejwt rebinds its api_settings on setting_changed, which modules that imported it never see
+        with mock.patch.object(token_blacklist.api_settings, "BLACKLIST_AFTER_ROTATION", False):
+            self.assertFalse(token_blacklist.rotation_confirms_blacklist())
+            with self.assertRaises(TokenError):
+                token_blacklist.BloomRefreshToken(refresh)
+            fresh = str(RefreshToken.for_user(self.user))
+            self.assertEqual(len(self.blacklist_reads(lambda: token_blacklist.BloomRefreshToken(fresh))), 1)
+            self.assertEqual(self.client.post(self.URL, {"refresh": fresh}).status_code, 200)
+        self.assertEqual(BlacklistedToken.objects.count(), 1) # The refresh did not blacklist
+
+    @override_settings(TOKEN_BLACKLIST_FILTER={"SYNC_INTERVAL": 0})
+    def test_filter_syncs_new_rows_and_rebuilds_without_expired_ones(self):
+        first, second = RefreshToken.for_user(self.user), RefreshToken.for_user(self.user)
+        first.blacklist()
+        blacklist_filter = token_blacklist.blacklist_filter
+        self.assertTrue(blacklist_filter.might_contain(first["jti"]))
+        self.assertFalse(blacklist_filter.might_contain(second["jti"]))
+        built = blacklist_filter._bloom
+        second.blacklist()
+        self.assertTrue(blacklist_filter.might_contain(second["jti"])) # Incremental load
+        self.assertIs(blacklist_filter._bloom, built)
+
+        OutstandingToken.objects.filter(jti=first["jti"]).update(expires_at=timezone.now() - timedelta(seconds=1))
+        with override_settings(TOKEN_BLACKLIST_FILTER={"SYNC_INTERVAL": 0, "REBUILD_INTERVAL": 0}):
+            self.assertFalse(blacklist_filter.might_contain(first["jti"]))
+        self.assertIsNot(blacklist_filter._bloom, built)
+        self.assertTrue(blacklist_filter.might_contain(second["jti"]))
+
+    @override_settings(TOKEN_BLACKLIST_FILTER={"SYNC_INTERVAL": 0, "CAPACITY": 1})
+    def test_filter_is_rebuilt_larger_past_its_capacity(self):
+        tokens = [RefreshToken.for_user(self.user) for _ in range(3)]
+        for token in tokens:
+            token.blacklist()
+        blacklist_filter = token_blacklist.blacklist_filter
+        blacklist_filter.might_contain("warm-up")
+        self.assertEqual(blacklist_filter._bloom.capacity, 1)
+        blacklist_filter.might_contain("warm-up")
+        self.assertEqual(blacklist_filter._bloom.capacity, 6)
+        self.assertTrue(all(blacklist_filter.might_contain(token["jti"]) for token in tokens))
+
+    def test_prune_deletes_expired_tokens_in_batches(self):
+        expired = [self.expired_token(f"expired-{index}") for index in range(5)]
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in expired[:2]])
+        current = RefreshToken.for_user(self.user)
+        current.blacklist()
+        self.assertEqual(token_blacklist.prune_expired(batch_size=2, max_batches=2), 4)
+        self.assertEqual(list(OutstandingToken.objects.filter(jti__startswith="expired").values_list("jti", flat=True)), ["expired-4"])
+        self.assertEqual(BlacklistedToken.objects.filter(token__jti__startswith="expired").count(), 0)
+
+        out = StringIO()
+        call_command("prune_token_blacklist", batch_size=2, stdout=out)
+        self.assertIn("Deleted 1 expired tokens.", out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), [current["jti"]])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+
+@override_settings(PASSWORD_HASHING=INLINE)
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        authentication.user_cache.clear()
+        self.user = User.objects.create_user(email="cached@example.com", phone_number="2000", password="first secret")
+        self.authenticator = authentication.CachedJWTAuthentication()
+
+    def authenticate(self, token=None):
+        token = token or RefreshToken.for_user(self.user).access_token
+        return self.authenticator.get_user(self.authenticator.get_validated_token(str(token)))
+
+    def user_queries(self, use):
+        with CaptureQueriesContext(connection) as context:
+            result = use()
+        return result, [query for query in context.captured_queries if 'FROM "users_user"' in query["sql"]]
+
+    def test_repeated_requests_hit_the_cache(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.assertEqual(len(self.user_queries(lambda: self.authenticate(token))[1]), 1)
+        user, queries = self.user_queries(lambda: self.authenticate(token))
+        self.assertEqual(queries, [])
+        self.assertEqual((user.pk, user.email), (self.user.pk, "cached@example.com"))
+        self.assertIsNot(user, self.authenticate(token)) # A fresh instance per request
+
+    def test_saves_invalidate_the_cached_user(self):
+        self.authenticate()
+        self.user.phone_number = "2002"
+        self.user.save()
+        user, queries = self.user_queries(self.authenticate)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(user.phone_number, "2002")
+
+    def test_deactivated_users_are_refused(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_password_change_revokes_tokens(self):
+        with mock.patch.object(authentication.api_settings, "CHECK_REVOKE_TOKEN", True):
+            token = RefreshToken.for_user(self.user).access_token
+            self.authenticate(token)
+            self.user.set_password("second secret")
+            self.user.save()
+            with self.assertRaises(AuthenticationFailed) as raised:
+                self.authenticate(token)
+        self.assertEqual(raised.exception.detail["code"], "password_changed")
+
+    def test_changes_in_another_process_invalidate_through_the_shared_version(self):
+        self.authenticate()
+        # Another process deactivates the user: its receivers only bump the shared version here
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        authentication.bump_user_version(self.user.pk)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_user_is_invalidated_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.save()
+            self.authenticate() # Cached between the save and its commit
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.user_queries(self.authenticate)[1]), 1)
+
+    def test_id_only_views_get_a_token_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(self.user).access_token}")
+        self.client.get("/api/professional/skills/autocomplete/") # Loads the vocabulary
+        response, queries = self.user_queries(lambda: self.client.get("/api/professional/skills/autocomplete/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertEqual(self.client.post("/api/professional/skills/", {"name": "Go"}).status_code, 403)
+
+    def test_stats_endpoint_is_admin_only(self):
+        admin = User.objects.create_user(email="root@example.com", phone_number="2001", password=None, is_staff=True)
+        before = authentication.user_cache.stats()
+        self.authenticate()
+        self.authenticate()
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/users/auth-cache/stats/").status_code, 403)
+        self.client.force_authenticate(admin)
+        stats = self.client.get("/api/users/auth-cache/stats/").data
+        self.assertEqual((stats["hits"] - before["hits"], stats["misses"] - before["misses"], stats["size"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], round(stats["hits"] / (stats["hits"] + stats["misses"]), 4))
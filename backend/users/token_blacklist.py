@@ -0,0 +1,147 @@
+"""
+Refresh-token blacklist checks fronted by an in-process Bloom filter.
+
+With ROTATE_REFRESH_TOKENS and BLACKLIST_AFTER_ROTATION every refresh both
+checks the blacklist and blacklists the token it was given. BloomRefreshToken
+skips the read when the filter says the JTI was never blacklisted, and the
+refresh serializer then relies on the blacklist write: if the token's
+BlacklistedToken row already existed, the token was reused and the refresh is
+refused. A negative from a stale filter can therefore never let a token
+through twice. Positives (real or false) fall back to the usual query.
+
+The filter holds the JTIs of unexpired blacklisted tokens. It is topped up
+incrementally (rows with a higher id than the last one seen) every
+SYNC_INTERVAL seconds and rebuilt from scratch every REBUILD_INTERVAL, or as
+soon as it holds more than CAPACITY entries, so pruned tokens drop out.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+DEFAULT_CONFIG = {
+    "ENABLED": True,
+    "CAPACITY": 100000, # Expected blacklisted, unexpired tokens; the filter grows past this
+    "ERROR_RATE": 0.01, # False-positive rate at capacity; each false positive costs one query
+    "SYNC_INTERVAL": 30, # Seconds between incremental loads of newly blacklisted tokens
+    "REBUILD_INTERVAL": 3600, # Seconds between full rebuilds, which drop expired and pruned tokens
+    "PRUNE_BATCH_SIZE": 1000,
+}
+
+def get_config():
+    config = dict(DEFAULT_CONFIG)
+    config.update(getattr(settings, "TOKEN_BLACKLIST_FILTER", {}))
+    return config
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8 + 1)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + index * second) % self.size for index in range(self.hash_count))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+class BlacklistFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_id = 0
+        self._synced_at = self._built_at = 0.0
+
+    def _load(self, bloom, after_id):
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=after_id, token__expires_at__gt=timezone.now())
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+        last_id = after_id
+        for last_id, jti in rows.iterator(chunk_size=5000):
+            bloom.add(jti)
+        return last_id
+
+    def _sync(self, config):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._synced_at < config["SYNC_INTERVAL"]:
+            return self._bloom
+        with self._lock:
+            if self._bloom is not None and now - self._synced_at < config["SYNC_INTERVAL"]:
+                return self._bloom
+            rebuild = (
+                self._bloom is None
+                or now - self._built_at >= config["REBUILD_INTERVAL"]
+                or self._bloom.count > self._bloom.capacity
+            )
+            if rebuild:
+                capacity = config["CAPACITY"]
+                if self._bloom is not None:
+                    capacity = max(capacity, self._bloom.count * 2)
+                bloom = BloomFilter(capacity, config["ERROR_RATE"])
+                self._last_id = self._load(bloom, 0)
+                self._bloom, self._built_at = bloom, now
+            else:
+                self._last_id = self._load(self._bloom, self._last_id)
+            self._synced_at = now
+            return self._bloom
+
+    def might_contain(self, jti):
+        return jti in self._sync(get_config())
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            self._last_id = 0
+
+blacklist_filter = BlacklistFilter()
+
+def rotation_confirms_blacklist():
+    # The refresh itself blacklists the token and detects reuse, see module docstring
+    return api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+
+class BloomRefreshToken(RefreshToken):
+    def check_blacklist(self):
+        if get_config()["ENABLED"] and rotation_confirms_blacklist():
+            if not blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+                return
+        super().check_blacklist()
+
+def prune_expired(batch_size=None, max_batches=None):
+    """Delete expired outstanding tokens (and their blacklist rows) in bounded batches; returns the count."""
+    batch_size = batch_size or get_config()["PRUNE_BATCH_SIZE"]
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        batches += 1
+    return deleted
@@ -1,10 +1,15 @@
 from django.urls import path, include
-from .views import UserRegistrationView, UserLoginView, PersonalProfileView # Correctly import PersonalProfileView
+from .views import UserRegistrationView, UserLoginView, PersonalProfileView, AuthUserCacheStatsView, UserTokenRefreshView, UserBulkProvisionView, UserSearchView, me_bootstrap # Correctly import PersonalProfileView
 
 urlpatterns = [
     path("register/", UserRegistrationView.as_view(), name="user_register"),
     path("login/", UserLoginView.as_view(), name="user_login"),
+    path("token/refresh/", UserTokenRefreshView.as_view(), name="user_token_refresh"),
     # Correctly map to PersonalProfileView for retrieve/update
     path("personal-profile/", PersonalProfileView.as_view(), name="user_personal_profile_manage"),
+    path("bulk-provision/", UserBulkProvisionView.as_view(), name="user_bulk_provision"),
+    path("search/", UserSearchView.as_view(), name="user_search"),
+    path("me/bootstrap/", me_bootstrap, name="user_me_bootstrap"),
+    path("auth-cache/stats/", AuthUserCacheStatsView.as_view(), name="user_auth_cache_stats"),
 ]
 
@@ -1,15 +1,39 @@
+import asyncio
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from minara_backend import row_streams
+
+from . import bootstrap, profile_cache, provisioning, search
+from .authentication import CachedJWTAuthentication, user_cache
+from .hashing import HashingPoolSaturated
 from .models import User, PersonalProfile, ProfessionalProfile, BusinessProfile
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer,
     UserPersonalProfileSerializer, # Renamed from PersonalProfileSerializer
     UserProfessionalProfileSerializer, # Renamed from ProfessionalProfileSerializer
-    UserBusinessProfileSerializer # Renamed from BusinessProfileSerializer
+    UserBusinessProfileSerializer, # Renamed from BusinessProfileSerializer
+    BlacklistFilteredTokenRefreshSerializer,
 )
 
+def hashing_saturated_response(exc):
+    return Response(
+        {"detail": exc.detail}, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={"Retry-After": str(exc.retry_after)}
+    )
+
 class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny] # Anyone can register
@@ -17,7 +41,10 @@ class UserRegistrationView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        try:
+            user = serializer.save()
+        except HashingPoolSaturated as exc:
+            return hashing_saturated_response(exc)
         refresh = RefreshToken.for_user(user)
         return Response({
             "user": UserRegistrationSerializer(user).data, # Use UserRegistrationSerializer for user data
@@ -31,7 +58,10 @@ class UserLoginView(generics.GenericAPIView):
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except HashingPoolSaturated as exc:
+            return hashing_saturated_response(exc)
         user = serializer.validated_data["user"]
         refresh = RefreshToken.for_user(user)
         return Response({
@@ -41,24 +71,41 @@ class UserLoginView(generics.GenericAPIView):
             "message": "Login successful."
         }, status=status.HTTP_200_OK)
 
-class PersonalProfileView(generics.RetrieveUpdateAPIView):
-    serializer_class = UserPersonalProfileSerializer # Renamed
-    permission_classes = [permissions.IsAuthenticated]
+class UserTokenRefreshView(TokenRefreshView):
+    serializer_class = BlacklistFilteredTokenRefreshSerializer
+
+class OwnProfileMixin:
+    """
+    Retrieve/update of the requesting user's profile_model row. Profiles are created with
+    the user, so reads never write; GETs are served through profile_cache.
+    """
+    profile_model = None
 
     def get_object(self):
-        profile, created = PersonalProfile.objects.get_or_create(user=self.request.user)
+        if self.request.method in permissions.SAFE_METHODS:
+            return get_object_or_404(self.profile_model, user=self.request.user)
+        profile, created = self.profile_model.objects.get_or_create(user=self.request.user)
         return profile
 
-class ProfessionalProfileView(generics.RetrieveUpdateAPIView):
-    serializer_class = UserProfessionalProfileSerializer # Renamed
+    def retrieve(self, request, *args, **kwargs):
+        if not profile_cache.cacheable(request):
+            return super().retrieve(request, *args, **kwargs)
+        return Response(profile_cache.get_representation(
+            self.profile_model, request.user.pk, lambda: self.get_serializer(self.get_object()).data
+        ))
+
+class PersonalProfileView(OwnProfileMixin, generics.RetrieveUpdateAPIView):
+    serializer_class = UserPersonalProfileSerializer # Renamed
     permission_classes = [permissions.IsAuthenticated]
+    profile_model = PersonalProfile
 
-    def get_object(self):
-        # ProfessionalProfile in users.models is the one linked to the User model directly.
-        # The one in professional_app.models is more detailed and managed by professional_app.
-        # This view should manage the users.models.ProfessionalProfile.
-        profile, created = ProfessionalProfile.objects.get_or_create(user=self.request.user)
-        return profile
+class ProfessionalProfileView(OwnProfileMixin, generics.RetrieveUpdateAPIView):
+    # ProfessionalProfile in users.models is the one linked to the User model directly.
+    # The one in professional_app.models is more detailed and managed by professional_app.
+    # This view manages the users.models.ProfessionalProfile.
+    serializer_class = UserProfessionalProfileSerializer # Renamed
+    permission_classes = [permissions.IsAuthenticated]
+    profile_model = ProfessionalProfile
 
 class BusinessProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserBusinessProfileSerializer # Renamed
@@ -78,3 +125,99 @@ class BusinessProfileView(generics.RetrieveUpdateAPIView):
             # If it's expected that a user might not have one, and it's not created by default.
             raise Http404("Business profile not found for this user. Create one via the professional app.")
 
+
+class UserBulkProvisionView(generics.GenericAPIView):
+    """
+    Create many users from NDJSON or CSV: the raw body (Content-Type application/x-ndjson
+    or text/csv) or a multipart upload in "file". Rows are read as a stream.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        stream, input_format = row_streams.request_stream(request, "users")
+        result = provisioning.provision_users(stream, input_format, max_errors=provisioning.get_config()["MAX_ERRORS"])
+        response_status = status.HTTP_201_CREATED if result.created else status.HTTP_400_BAD_REQUEST
+        return Response(result.as_dict(), status=response_status)
+
+class UserSearchView(generics.GenericAPIView):
+    """Typeahead over names (?q=<prefix>) or lookup by full email or phone number; returns ids and names, up to ?limit= / USER_SEARCH MAX_RESULTS."""
+    permission_classes = [permissions.IsAuthenticated]
+    token_user_authentication = True # Only request.user.pk is used, see users/authentication.py
+
+    def get(self, request, *args, **kwargs):
+        limit = request.query_params.get("limit")
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            if limit < 1:
+                return Response({"detail": "limit must be at least 1."}, status=status.HTTP_400_BAD_REQUEST)
+        user_ids = search.search_user_ids(request.query_params.get("q", ""), limit=limit, exclude_user_id=request.user.pk)
+        return Response(search.search_results(user_ids))
+
+class AuthUserCacheStatsView(generics.GenericAPIView):
+    """Hit-rate counters of this process's authenticated-user cache."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(user_cache.stats())
+
+def _run_bootstrap_section(name, user):
+    try:
+        return bootstrap.SECTIONS[name](user)
+    finally:
+        close_old_connections() # Runs in a pool thread that no request_finished signal will clean up
+
+def _api_exception_response(exc, authenticator, request):
+    # What DRF's exception handler would send: list and dict details as they are, WWW-Authenticate on 401
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = JsonResponse(data, status=exc.status_code, safe=False)
+    if isinstance(exc, (AuthenticationFailed, NotAuthenticated)):
+        response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+    return response
+
+@require_GET
+async def me_bootstrap(request):
+    """
+    Everything the app needs on launch in one response. Sections run concurrently; send their
+    ETags back in If-None-Match to get {"not_modified": true} instead of unchanged data.
+    """
+    # A plain async view, since DRF views are synchronous; authenticate the same way they do
+    authenticator = CachedJWTAuthentication()
+    drf_request = Request(request)
+    try:
+        authenticated = await sync_to_async(authenticator.authenticate)(drf_request)
+    except APIException as exc:
+        return _api_exception_response(exc, authenticator, drf_request)
+    if authenticated is None:
+        return _api_exception_response(NotAuthenticated(), authenticator, drf_request)
+    user = authenticated[0]
+
+    requested = request.GET.get("sections")
+    names = [name.strip() for name in requested.split(",") if name.strip()] if requested else list(bootstrap.SECTIONS)
+    unknown = [name for name in names if name not in bootstrap.SECTIONS]
+    if unknown:
+        return JsonResponse({"detail": f"Unknown sections: {', '.join(unknown)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if bootstrap.get_config()["CONCURRENT"]:
+        results = await asyncio.gather(*(
+            sync_to_async(_run_bootstrap_section, thread_sensitive=False)(name, user) for name in names
+        ))
+    else:
+        results = await sync_to_async(lambda: [bootstrap.SECTIONS[name](user) for name in names])()
+
+    known = bootstrap.parse_if_none_match(request.headers.get("If-None-Match"))
+    sections = {}
+    for name, data in zip(names, results):
+        etag = bootstrap.section_etag(name, data)
+        sections[name] = {"etag": etag, "not_modified": True} if etag in known else {"etag": etag, "data": data}
+    etag = '"%s"' % hashlib.sha256("".join(section["etag"] for section in sections.values()).encode()).hexdigest()[:20]
+    if etag in known or all(section.get("not_modified") for section in sections.values()):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = JsonResponse({"sections": sections}, encoder=DjangoJSONEncoder)
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    response["Vary"] = "Authorization"
+    return response